@@ -0,0 +1,83 @@
+"""
+Benchmark do formato dos orçamentos editáveis: JSON antigo (indentado, valores
+float, totais recalculados) contra o formato versionado de eurocar.arquivo,
+em .json e .json.gz.
+
+Uso: python benchmarks/bench_arquivo.py [repeticoes]
+"""
+import json
+import os
+import random
+import sys
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from eurocar.arquivo import gravar_orcamento, ler_orcamento, ler_resumo  # noqa: E402
+from eurocar.orcamento import Item, Orcamento  # noqa: E402
+
+CLIENTE = {"nome": "Cliente Teste", "telefone": "(11) 99999-0000", "veiculo": "Gol 1.6", "placa": "ABC1D23"}
+
+
+# ---------- Formato anterior (como salvar_orcamento_editavel gravava) ----------
+def gravar_antigo(caminho, orcamento):
+    dados = dict(CLIENTE, mao_obra=float(orcamento.mao_obra.para_decimal()), itens=[
+        {"descricao": i.descricao, "quantidade": int(i.quantidade.para_decimal()),
+         "valor": float(i.valor.para_decimal())} for i in orcamento])
+    with open(caminho, "w", encoding="utf-8") as f:
+        json.dump(dados, f, ensure_ascii=False, indent=4)
+
+
+def ler_antigo(caminho):
+    with open(caminho, "r", encoding="utf-8") as f:
+        return Orcamento.de_dados(json.load(f))
+
+
+def _orcamento(n: int) -> Orcamento:
+    rnd = random.Random(42)
+    return Orcamento([Item(f"Peça {i} - {rnd.choice(['filtro', 'pastilha', 'correia', 'vela'])}",
+                        rnd.randint(1, 10), f"{rnd.randint(100, 500_000) / 100:.2f}") for i in range(n)],
+                    mao_obra="350.00")
+
+
+def _ms(func, repeticoes) -> float:
+    return min(timeit.repeat(func, number=1, repeat=repeticoes)) * 1000
+
+
+def main():
+    repeticoes = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    with tempfile.TemporaryDirectory() as pasta:
+        for n in (100, 1_000, 10_000):
+            orcamento = _orcamento(n)
+            antigo = os.path.join(pasta, f"antigo_{n}.json")
+            novo = os.path.join(pasta, f"novo_{n}.json")
+            compacto = os.path.join(pasta, f"novo_{n}.json.gz")
+
+            gravar_antigo(antigo, orcamento)
+            gravar_orcamento(novo, CLIENTE, orcamento)
+            gravar_orcamento(compacto, CLIENTE, orcamento)
+            for caminho in (novo, compacto):
+                assert ler_orcamento(caminho)[1].total_geral == orcamento.total_geral
+                assert ler_resumo(caminho)["total_geral"] == orcamento.total_geral.centavos
+            assert ler_antigo(antigo).total_geral == orcamento.total_geral
+
+            print(f"{n:,} itens")
+            print(f"  {'':<20} {'tamanho (KiB)':>14} {'gravar (ms)':>12} {'carregar (ms)':>14} {'resumo (ms)':>12}")
+            linhas = [
+                ("JSON antigo", antigo, lambda: gravar_antigo(antigo, orcamento),
+                    lambda: ler_antigo(antigo), lambda: ler_antigo(antigo)),
+                ("versão 2 (.json)", novo, lambda: gravar_orcamento(novo, CLIENTE, orcamento),
+                    lambda: ler_orcamento(novo), lambda: ler_resumo(novo)),
+                ("versão 2 (.json.gz)", compacto, lambda: gravar_orcamento(compacto, CLIENTE, orcamento),
+                    lambda: ler_orcamento(compacto), lambda: ler_resumo(compacto)),
+            ]
+            for nome, caminho, gravar, carregar, resumo in linhas:
+                print(f"  {nome:<20} {os.path.getsize(caminho) / 1024:>14.1f} {_ms(gravar, repeticoes):>12.2f} "
+                    f"{_ms(carregar, repeticoes):>14.2f} {_ms(resumo, repeticoes):>12.3f}")
+            print()
+
+
+if __name__ == "__main__":
+    main()
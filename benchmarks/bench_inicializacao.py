@@ -0,0 +1,86 @@
+"""
+Mede o tempo de abertura a frio e falha se passar do orçamento definido.
+
+Cada medição roda em um processo novo do Python:
+  - importar main.py (sem criar janelas) descontado o tempo do interpretador;
+  - importar só o núcleo (eurocar.nucleo), usado por scripts e pelo serviço;
+  - confere que os módulos pesados continuam fora do caminho de abertura e
+    que o núcleo não carrega a interface gráfica.
+
+Uso: python benchmarks/bench_inicializacao.py [--rodadas N]
+Para ver a divisão por etapa com a janela real: python main.py --profile-startup
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+RAIZ = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+# Orçamento de abertura: tempo extra de "import main" sobre um Python vazio
+ORCAMENTO_IMPORT_MS = 200
+ORCAMENTO_NUCLEO_MS = 60
+
+# Não devem ser carregados só por abrir o programa
+MODULOS_ADIADOS = ("fpdf", "requests", "sqlite3", "concurrent.futures.process")
+MODULOS_INTERFACE = ("FreeSimpleGUI", "tkinter")
+
+
+def _medir(codigo: str, rodadas: int) -> float:
+    tempos = []
+    for _ in range(rodadas):
+        inicio = time.perf_counter()
+        subprocess.run([sys.executable, "-c", codigo], cwd=RAIZ, check=True)
+        tempos.append(time.perf_counter() - inicio)
+    return statistics.median(tempos) * 1000
+
+
+def _carregados(codigo: str, modulos) -> str:
+    verificacao = f"import sys; {codigo}; print(','.join(m for m in {modulos!r} if m in sys.modules))"
+    return subprocess.run([sys.executable, "-c", verificacao], cwd=RAIZ, check=True,
+                        capture_output=True, text=True).stdout.strip()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rodadas", type=int, default=7)
+    args = parser.parse_args()
+
+    # Aquece o cache de bytecode para medir a abertura normal, não a primeira compilação
+    subprocess.run([sys.executable, "-c", "import main"], cwd=RAIZ, check=True)
+
+    base = _medir("pass", args.rodadas)
+    com_main = _medir("import main", args.rodadas)
+    com_nucleo = _medir("import eurocar.nucleo", args.rodadas)
+    extra = com_main - base
+    extra_nucleo = com_nucleo - base
+    print(f"Python vazio:        {base:7.1f} ms")
+    print(f"import main:         {com_main:7.1f} ms")
+    print(f"custo da abertura:   {extra:7.1f} ms (orçamento: {ORCAMENTO_IMPORT_MS} ms)")
+    print(f"custo do núcleo:     {extra_nucleo:7.1f} ms (orçamento: {ORCAMENTO_NUCLEO_MS} ms)")
+
+    carregados = _carregados("import main", MODULOS_ADIADOS)
+    carregados_nucleo = _carregados("import eurocar.nucleo", MODULOS_ADIADOS + MODULOS_INTERFACE)
+
+    falhou = False
+    if extra > ORCAMENTO_IMPORT_MS:
+        print(f"FALHA: abertura {extra:.0f} ms acima do orçamento de {ORCAMENTO_IMPORT_MS} ms")
+        falhou = True
+    if extra_nucleo > ORCAMENTO_NUCLEO_MS:
+        print(f"FALHA: núcleo {extra_nucleo:.0f} ms acima do orçamento de {ORCAMENTO_NUCLEO_MS} ms")
+        falhou = True
+    if carregados:
+        print(f"FALHA: módulos pesados carregados na abertura: {carregados}")
+        falhou = True
+    if carregados_nucleo:
+        print(f"FALHA: núcleo carrega módulos pesados ou da interface: {carregados_nucleo}")
+        falhou = True
+    if not falhou:
+        print("OK")
+    return 1 if falhou else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+"""
+Benchmark da representação dos itens: dicionário + total recalculado a cada
+leitura (como a tabela, a pré-visualização e o PDF faziam) contra
+eurocar.orcamento.Item, com __slots__ e total guardado no próprio item.
+
+Uso: python benchmarks/bench_itens.py [repeticoes]
+"""
+import os
+import random
+import sys
+import timeit
+import tracemalloc
+from decimal import Decimal
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from eurocar.fixo import ZERO  # noqa: E402
+from eurocar.orcamento import Item, Orcamento  # noqa: E402
+
+
+# ---------- Representação anterior ----------
+def montar_dicts(entradas):
+    return [{"descricao": d, "quantidade": int(q), "valor": Decimal(str(v))} for d, q, v in entradas]
+
+
+def totais_dicts(itens):
+    # Cada consumidor (tabela, prévia, PDF) refazia quantidade * valor por linha
+    total = Decimal("0.00")
+    for item in itens:
+        total += Decimal(str(item["quantidade"])) * Decimal(str(item["valor"]))
+    return total
+
+
+def ler_dicts(itens):
+    for item in itens:
+        (item["descricao"], item["quantidade"], item["valor"],
+            Decimal(str(item["quantidade"])) * Decimal(str(item["valor"])))
+
+
+# ---------- Representação nova ----------
+def montar_itens(entradas):
+    return [Item(d, q, v) for d, q, v in entradas]
+
+
+def totais_itens(itens):
+    total = ZERO
+    for item in itens:
+        total += item.total
+    return total
+
+
+def ler_itens(itens):
+    for item in itens:
+        (item.descricao, item.quantidade, item.valor, item.total)
+
+
+def _entradas(n: int):
+    rnd = random.Random(42)
+    return [(f"Peça {i} - {rnd.choice(['filtro', 'pastilha', 'correia', 'vela'])}",
+            rnd.randint(1, 10), f"{rnd.randint(100, 500_000) / 100:.2f}") for i in range(n)]
+
+
+def _memoria(montar, entradas) -> int:
+    tracemalloc.start()
+    itens = montar(entradas)
+    atual, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del itens
+    return atual
+
+
+def _tempo(func, repeticoes) -> float:
+    return min(timeit.repeat(func, number=1, repeat=repeticoes))
+
+
+def main():
+    repeticoes = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    for n in (1_000, 10_000):
+        entradas = _entradas(n)
+        dicts, itens = montar_dicts(entradas), montar_itens(entradas)
+        assert totais_dicts(dicts) == totais_itens(itens).para_decimal() == Orcamento(itens).total_pecas.para_decimal()
+
+        print(f"{n:,} itens")
+        linhas = [
+            ("memória (KiB)", _memoria(montar_dicts, entradas) / 1024, _memoria(montar_itens, entradas) / 1024),
+            ("montar (ms)", _tempo(lambda: montar_dicts(entradas), repeticoes) * 1000,
+                _tempo(lambda: montar_itens(entradas), repeticoes) * 1000),
+            ("percorrer + total da linha (ms)", _tempo(lambda: ler_dicts(dicts), repeticoes) * 1000,
+                _tempo(lambda: ler_itens(itens), repeticoes) * 1000),
+            ("somar totais (ms)", _tempo(lambda: totais_dicts(dicts), repeticoes) * 1000,
+                _tempo(lambda: totais_itens(itens), repeticoes) * 1000),
+        ]
+        print(f"  {'':<34} {'dict':>10} {'Item':>10} {'razão':>8}")
+        for nome, antigo, novo in linhas:
+            print(f"  {nome:<34} {antigo:>10.2f} {novo:>10.2f} {antigo / novo:>7.2f}x")
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Benchmark da formatação/leitura de moeda: implementação antiga (locale +
+triplo replace) contra eurocar.moeda.
+
+Uso: python benchmarks/bench_moeda.py [repeticoes]
+"""
+import os
+import random
+import sys
+import timeit
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal, ROUND_HALF_UP
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from eurocar import moeda  # noqa: E402
+from eurocar.moeda import converter_brl, formatar_brl  # noqa: E402
+
+
+# ---------- Implementações anteriores (copiadas de main.py) ----------
+def formatar_moeda_antigo(valor) -> str:
+    try:
+        valor = Decimal(valor)
+        valor = valor.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+        return f"R$ {valor:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+    except:
+        return "R$ 0,00"
+
+
+def converter_moeda_input_antigo(valor_str: str) -> Decimal:
+    try:
+        if not valor_str:
+            return Decimal("0.00")
+        limpo = valor_str.replace('.', '').replace(',', '.')
+        return Decimal(limpo)
+    except Exception:
+        raise ValueError("Formato de valor inválido")
+
+
+def _amostras(n: int, distintos: int):
+    """Gera n valores sorteados entre `distintos` preços diferentes"""
+    rnd = random.Random(42)
+    base = [Decimal(rnd.randint(1, 10_000_000)) / 100 for _ in range(distintos)]
+    valores = [rnd.choice(base) for _ in range(n)] if distintos < n else base
+    textos = [formatar_moeda_antigo(v).replace("R$ ", "") for v in valores]
+    return valores, textos
+
+
+def _limpar_caches():
+    moeda._formatar_brl_cacheado.cache_clear()
+    moeda._formatar_valor_cacheado.cache_clear()
+    moeda._converter_texto.cache_clear()
+
+
+def _medir(nome, func, dados, repeticoes):
+    def rodada():
+        _limpar_caches()  # cada rodada começa com o cache frio
+        for x in dados:
+            func(x)
+    tempo = min(timeit.repeat(rodada, number=1, repeat=repeticoes))
+    print(f"  {nome:<32} {len(dados) / tempo:>14,.0f} ops/s")
+    return tempo
+
+
+def _comparar(titulo, pares, dados, repeticoes):
+    print(titulo)
+    (nome_antigo, antigo), (nome_novo, novo) = pares
+    t_antigo = _medir(nome_antigo, antigo, dados, repeticoes)
+    t_novo = _medir(nome_novo, novo, dados, repeticoes)
+    print(f"  {'razão (antigo/novo)':<32} {t_antigo / t_novo:>14.2f}x\n")
+
+
+def main():
+    repeticoes = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    n = 100_000
+
+    # Cenários: todos os valores distintos (pior caso para o cache) e o caso
+    # típico de orçamento, em que poucos preços se repetem em linhas, totais e PDF
+    cenarios = [("valores distintos", _amostras(n, n)),
+                ("500 preços repetidos", _amostras(n, 500))]
+
+    for descricao, (valores, textos) in cenarios:
+        # Garante que a nova implementação produz exatamente o mesmo resultado
+        divergentes = [v for v in valores if formatar_brl(v) != formatar_moeda_antigo(v)]
+        assert not divergentes, f"Formatação divergente: {divergentes[:5]}"
+        assert all(converter_brl(t) == converter_moeda_input_antigo(t) for t in textos)
+
+        _comparar(f"Formatação - {descricao} ({n:,})",
+                [("formatar_moeda (antigo)", formatar_moeda_antigo), ("formatar_brl", formatar_brl)],
+                valores, repeticoes)
+        _comparar(f"Leitura '1.250,50' - {descricao} ({n:,})",
+                [("converter_moeda_input (antigo)", converter_moeda_input_antigo),
+                ("converter_brl", converter_brl)],
+                textos, repeticoes)
+
+    # Formatação concorrente: o resultado não pode depender da thread
+    valores, _ = _amostras(20_000, 2_000)
+    esperado = [formatar_moeda_antigo(v) for v in valores]
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        resultados = list(pool.map(lambda _: [formatar_brl(v) for v in valores], range(8)))
+    assert all(r == esperado for r in resultados)
+    print("Formatação em 8 threads simultâneas: resultados idênticos")
+
+
+if __name__ == "__main__":
+    main()
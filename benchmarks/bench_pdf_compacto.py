@@ -0,0 +1,78 @@
+"""
+Tamanho dos PDFs no modo normal e no compacto, num conjunto de orçamentos
+sintéticos (de 1 a 500 itens, com descrições longas e acentuadas), além do
+tempo de renderização de cada modo.
+
+Sai com código 1 se algum PDF compacto não ficar menor que o normal.
+
+Uso: python benchmarks/bench_pdf_compacto.py [--tamanhos 1 5 20 ...] [--salvar PASTA]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from eurocar.orcamento import Item, Orcamento  # noqa: E402
+from eurocar.pdf import renderizar_pdf  # noqa: E402
+
+TAMANHOS = (1, 5, 20, 100, 500)
+CLIENTE = {"nome": "José da Conceição", "telefone": "(62) 9 9999-0000", "veiculo": "Onix 1.0 – 2019",
+        "placa": "ABC1D23"}
+PECAS = ["Pastilha de freio dianteira", "Filtro de óleo", "Correia dentada “original”", "Vela de ignição",
+        "Amortecedor traseiro (par) – instalação inclusa", "Óleo 5W30 sintético", "Bomba d'água",
+        "Kit embreagem completo com platô, disco e rolamento, peça original do fabricante"]
+
+
+def _orcamento(n: int) -> Orcamento:
+    rnd = random.Random(n)
+    return Orcamento([Item(rnd.choice(PECAS), rnd.randint(1, 4), f"{rnd.randint(1_000, 90_000) / 100:.2f}")
+                    for _ in range(n)], mao_obra="350,00")
+
+
+def _renderizar(orcamento: Orcamento, compacto: bool):
+    dados = dict(CLIENTE, mao_obra=orcamento.mao_obra, itens=orcamento.itens)
+    renderizar_pdf(dados, orcamento, compacto)  # descarta a primeira: fontes e logo entram no cache
+    inicio = time.perf_counter()
+    conteudo = renderizar_pdf(dados, orcamento, compacto)
+    return conteudo, time.perf_counter() - inicio
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=list(TAMANHOS))
+    parser.add_argument("--salvar", help="Grava os PDFs gerados nesta pasta, para conferir")
+    args = parser.parse_args()
+
+    print(f"  {'itens':>6} {'normal (KiB)':>13} {'compacto (KiB)':>15} {'redução':>8} "
+        f"{'normal (ms)':>12} {'compacto (ms)':>14}")
+    total_normal = total_compacto = 0
+    maiores = []
+    for n in args.tamanhos:
+        orcamento = _orcamento(n)
+        normal, t_normal = _renderizar(orcamento, False)
+        compacto, t_compacto = _renderizar(orcamento, True)
+        total_normal += len(normal)
+        total_compacto += len(compacto)
+        if len(compacto) >= len(normal):
+            maiores.append(n)
+        print(f"  {n:>6} {len(normal) / 1024:13.1f} {len(compacto) / 1024:15.1f} "
+            f"{1 - len(compacto) / len(normal):8.1%} {t_normal * 1000:12.1f} {t_compacto * 1000:14.1f}")
+        if args.salvar:
+            os.makedirs(args.salvar, exist_ok=True)
+            for sufixo, conteudo in (("normal", normal), ("compacto", compacto)):
+                with open(os.path.join(args.salvar, f"orcamento_{n}_{sufixo}.pdf"), "wb") as f:
+                    f.write(conteudo)
+
+    print(f"  {'total':>6} {total_normal / 1024:13.1f} {total_compacto / 1024:15.1f} "
+        f"{1 - total_compacto / total_normal:8.1%}")
+    if maiores:
+        print(f"\nPDF compacto não ficou menor com {maiores} itens")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+"""
+Benchmark dos relatórios (eurocar.relatorios) sobre um arquivo histórico
+sintético de orçamentos salvos (padrão: 50 mil arquivos).
+
+Mede, com um catálogo novo a cada cenário de primeira leitura:
+  - primeira sincronização lendo tudo num só processo;
+  - primeira sincronização com o pool de processos;
+  - sincronização sem nenhuma alteração (só stat dos arquivos);
+  - sincronização depois de alterar 1% dos arquivos;
+  - consulta agregada do relatório e exportação para CSV.
+
+Os arquivos ficam numa pasta temporária, apagada no final.
+
+Uso: python benchmarks/bench_relatorio.py [--arquivos N] [--processos N]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from eurocar.arquivo import gravar_orcamento  # noqa: E402
+from eurocar.catalogo import CatalogoOrcamentos  # noqa: E402
+from eurocar.orcamento import Item, Orcamento  # noqa: E402
+from eurocar.relatorios import exportar_csv, gerar_relatorio  # noqa: E402
+
+PECAS = ["Pastilha de freio", "Disco de freio", "Filtro de óleo", "Filtro de ar", "Óleo 5W30",
+        "Correia dentada", "Vela de ignição", "Amortecedor", "Bomba d'água", "Embreagem", "Bateria"]
+VEICULOS = ["Gol 1.6", "Onix", "HB20", "Uno", "Palio", "Corolla", "Civic", "Fiesta", "Ka", "Sandero"]
+
+
+def _gerar_arquivos(pasta: str, quantidade: int, rnd: random.Random):
+    for n in range(quantidade):
+        orcamento = Orcamento([Item(rnd.choice(PECAS), rnd.randint(1, 4), rnd.randint(2_000, 80_000) / 100)
+                            for _ in range(rnd.randint(1, 12))], mao_obra=rnd.randint(0, 60) * 10)
+        dados = {"nome": f"Cliente {n}", "telefone": "", "veiculo": rnd.choice(VEICULOS), "placa": ""}
+        data = f"20{rnd.randint(20, 24)}{rnd.randint(1, 12):02d}{rnd.randint(1, 28):02d}_100000"
+        gravar_orcamento(os.path.join(pasta, f"Orcamento_Cliente_{n}_{data}.json"), dados, orcamento)
+
+
+def _cronometrar(descricao: str, func):
+    inicio = time.perf_counter()
+    resultado = func()
+    print(f"  {descricao:<44} {time.perf_counter() - inicio:8.2f} s")
+    return resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--arquivos", type=int, default=50_000)
+    parser.add_argument("--processos", type=int, default=None, help="Tamanho do pool (padrão: núcleos)")
+    args = parser.parse_args()
+    rnd = random.Random(42)
+
+    with tempfile.TemporaryDirectory() as raiz:
+        pasta = os.path.join(raiz, "editaveis")
+        os.makedirs(pasta)
+        print(f"{args.arquivos:,} orçamentos sintéticos ({os.cpu_count()} núcleos)")
+        _cronometrar("gerar os arquivos", lambda: _gerar_arquivos(pasta, args.arquivos, rnd))
+
+        sequencial = CatalogoOrcamentos(pasta, os.path.join(raiz, "sequencial.sqlite3"))
+        _cronometrar("1ª sincronização, 1 processo", lambda: sequencial.sincronizar(processos=1))
+        sequencial.fechar()
+
+        catalogo = CatalogoOrcamentos(pasta, os.path.join(raiz, "catalogo.sqlite3"))
+        _cronometrar("1ª sincronização, pool de processos", lambda: catalogo.sincronizar(args.processos))
+        stats = _cronometrar("sincronização sem alterações", lambda: catalogo.sincronizar(args.processos))
+        assert stats["inalterados"] == args.arquivos, stats
+
+        alterados = rnd.sample(sorted(os.listdir(pasta)), max(1, args.arquivos // 100))
+        for nome in alterados:
+            caminho = os.path.join(pasta, nome)
+            gravar_orcamento(caminho, {"nome": "Alterado", "veiculo": "Gol 1.6"},
+                            Orcamento([Item("Filtro de óleo", 1, "45,00")]))
+        stats = _cronometrar(f"sincronização com {len(alterados):,} alterados",
+                            lambda: catalogo.sincronizar(args.processos))
+        assert stats["atualizados"] == len(alterados), stats
+
+        relatorio = _cronometrar("consulta do relatório", lambda: gerar_relatorio(catalogo))
+        assert relatorio.orcamentos == args.arquivos
+        _cronometrar("exportar CSV", lambda: exportar_csv(relatorio, os.path.join(raiz, "relatorio.csv")))
+        catalogo.fechar()
+
+        print(f"\n  {len(relatorio.meses)} meses, total orçado {relatorio.total}, "
+            f"ticket médio {relatorio.ticket_medio}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Mede as sugestões de descrição (eurocar.sugestoes) sobre um histórico
+sintético e falha se alguma busca passar do orçamento definido.
+
+  - carga de N linhas de itens (padrão: 100 mil) no índice;
+  - busca de todos os prefixos de 1 a 3 letras que aparecem no histórico
+    (os mais amplos, que casam com mais descrições) e de prefixos digitados
+    letra a letra a partir de descrições sorteadas.
+
+Uso: python benchmarks/bench_sugestoes.py [--linhas N]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from eurocar.sugestoes import IndiceDescricoes, normalizar  # noqa: E402
+
+# Orçamento de uma busca (uma tecla na janela de item)
+ORCAMENTO_BUSCA_MS = 10
+
+PECAS = ["Pastilha de freio", "Disco de freio", "Filtro de óleo", "Filtro de ar", "Filtro de combustível",
+        "Óleo 5W30", "Correia dentada", "Vela de ignição", "Amortecedor", "Bomba d'água", "Embreagem",
+        "Rolamento", "Junta homocinética", "Bateria", "Lâmpada", "Palheta", "Radiador", "Sensor"]
+LADOS = ["", " dianteiro", " traseiro", " esquerdo", " direito"]
+MARCAS = ["Bosch", "Cofap", "Fras-le", "Mann", "NGK", "Gates", "Valeo", "Monroe", "Nakata", "SKF"]
+MODELOS = ["Gol", "Onix", "HB20", "Uno", "Palio", "Corolla", "Civic", "Fiesta", "Ka", "Sandero"]
+
+
+def _historico(linhas: int):
+    rnd = random.Random(42)
+    for i in range(linhas):
+        descricao = (f"{rnd.choice(PECAS)}{rnd.choice(LADOS)} {rnd.choice(MARCAS)} "
+                    f"{rnd.choice(MODELOS)} {rnd.randint(1, 40)}")
+        yield (f"orcamento_{i // 10}.json", descricao, rnd.randint(1_000, 200_000),
+            f"2024-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d} 10:00:00")
+
+
+def _ms(func) -> float:
+    inicio = time.perf_counter()
+    func()
+    return (time.perf_counter() - inicio) * 1000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--linhas", type=int, default=100_000)
+    args = parser.parse_args()
+
+    indice = IndiceDescricoes()
+    carga = _ms(lambda: indice.carregar(_historico(args.linhas)))
+    # A primeira busca ordena o vetor de chaves; entra na conta da carga
+    carga += _ms(lambda: indice.sugerir("a"))
+    print(f"{args.linhas:,} linhas, {len(indice):,} descrições distintas: carga {carga:.0f} ms")
+
+    descricoes = [descricao for _, descricao, _, _ in _historico(2_000)]
+    amplos = sorted({normalizar(d)[:n] for d in descricoes for n in (1, 2, 3)})
+    digitados = [normalizar(d)[:n] for d in random.Random(7).sample(descricoes, 200)
+                for n in range(1, len(d) + 1)]
+
+    falhou = False
+    for nome, prefixos in (("prefixos de 1 a 3 letras", amplos), ("digitação letra a letra", digitados)):
+        tempos = [_ms(lambda: indice.sugerir(p)) for p in prefixos]
+        pior = max(tempos)
+        print(f"  {nome:<26} {len(tempos):>6} buscas   mediana {statistics.median(tempos):6.3f} ms"
+            f"   pior {pior:6.3f} ms")
+        if pior > ORCAMENTO_BUSCA_MS:
+            print(f"FALHA: busca de {pior:.1f} ms acima do orçamento de {ORCAMENTO_BUSCA_MS} ms")
+            falhou = True
+
+    if falhou:
+        return 1
+    print("OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,281 @@
+"""
+Suíte de benchmarks dos caminhos quentes com orçamentos sintéticos de
+10, 100, 1.000 e 10.000 itens:
+
+  - criar_pdf:          renderização completa do PDF em memória (renderizar_pdf);
+  - formatar_moeda:     formatação de valor e total de cada linha (cache frio);
+  - converter_moeda:    leitura dos valores digitados ("1.250,50");
+  - atualizar_totais:   inclusão item a item com atualização dos totais na tela;
+  - salvar_json / salvar_json_gz / carregar_json: formato dos editáveis.
+
+Para cada caso mede o tempo (melhor rodada), o pico de memória (tracemalloc,
+numa rodada separada) e o tamanho da saída, quando há uma.
+
+Roda sem interface: nenhuma janela é criada, e atualizar_totais recebe uma
+janela de mentira que só guarda os textos. formatar_moeda e
+converter_moeda_input de main.py apenas repassam para eurocar.moeda, que é o
+que se mede.
+
+Resultados podem ser gravados como linha de base e comparados depois:
+
+    python benchmarks/bench_suite.py --salvar benchmarks/baseline_suite.json
+    python benchmarks/bench_suite.py --comparar benchmarks/baseline_suite.json
+
+Na comparação, a saída é 1 se algum caso ficar além da tolerância. Tempos
+abaixo de PISO_TEMPO_MS (na base e agora) não são comparados: nessa faixa a
+variação entre rodadas na mesma máquina passa de 2x.
+
+Uso: python benchmarks/bench_suite.py [--tamanhos 10 100 ...] [--repeticoes N]
+                                      [--salvar ARQ] [--comparar ARQ] [--tolerancia 1.3]
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from eurocar import moeda  # noqa: E402
+from eurocar.arquivo import gravar_orcamento, ler_orcamento  # noqa: E402
+from eurocar.moeda import converter_brl, formatar_brl  # noqa: E402
+from eurocar.orcamento import Item, Orcamento  # noqa: E402
+
+TAMANHOS = (10, 100, 1_000, 10_000)
+
+# Casos rápidos repetem até somar TEMPO_MINIMO_CASO, para a melhor rodada ser estável;
+# as rodadas param quando a soma passa de LIMITE_TEMPO_CASO (10k itens no PDF é lento)
+TEMPO_MINIMO_CASO = 1.0
+LIMITE_TEMPO_CASO = 3.0
+
+# Abaixo disso (em ms) o tempo é só informativo na comparação
+PISO_TEMPO_MS = 5.0
+
+# Memória e tamanho variam pouco entre máquinas; tempo, bastante
+TOLERANCIA_MEMORIA = 1.2
+TOLERANCIA_TAMANHO = 1.05
+
+CLIENTE = {"nome": "Cliente Teste", "telefone": "(11) 99999-0000", "veiculo": "Gol 1.6", "placa": "ABC1D23"}
+PECAS = ["Pastilha de freio dianteira", "Filtro de óleo", "Correia dentada", "Vela de ignição",
+        "Amortecedor traseiro", "Óleo 5W30 sintético", "Bomba d'água", "Junta do cabeçote"]
+
+
+class _ElementoFalso:
+    __slots__ = ("valor",)
+
+    def __init__(self):
+        self.valor = None
+
+    def update(self, valor=None, **_):
+        self.valor = valor
+
+
+class JanelaFalsa(dict):
+    """Substitui a janela do FreeSimpleGUI: window[chave].update(...) só guarda o valor"""
+
+    def __missing__(self, chave):
+        elemento = self[chave] = _ElementoFalso()
+        return elemento
+
+
+def _entradas(n: int):
+    rnd = random.Random(n)
+    return [(f"{rnd.choice(PECAS)} {i}", rnd.randint(1, 10), f"{rnd.randint(100, 500_000) / 100:.2f}")
+            for i in range(n)]
+
+
+def _limpar_caches():
+    moeda._formatar_brl_cacheado.cache_clear()
+    moeda._formatar_valor_cacheado.cache_clear()
+    moeda._converter_texto.cache_clear()
+
+
+# ---------- Casos: cada um prepara os dados e devolve a função medida (que devolve o tamanho da saída ou None) ----------
+def caso_criar_pdf(entradas, pasta):
+    from eurocar.pdf import renderizar_pdf
+
+    orcamento = Orcamento([Item(*e) for e in entradas], mao_obra="350.00")
+    dados = dict(CLIENTE, mao_obra=orcamento.mao_obra, itens=orcamento.itens)
+    return lambda: len(renderizar_pdf(dados, orcamento))
+
+
+def caso_formatar_moeda(entradas, pasta):
+    itens = [Item(*e) for e in entradas]
+
+    def executar():
+        _limpar_caches()
+        for item in itens:
+            formatar_brl(item.valor)
+            formatar_brl(item.total)
+    return executar
+
+
+def caso_converter_moeda(entradas, pasta):
+    textos = [formatar_brl(converter_brl(v)).replace("R$ ", "") for _, _, v in entradas]
+
+    def executar():
+        _limpar_caches()
+        for texto in textos:
+            converter_brl(texto)
+    return executar
+
+
+def caso_atualizar_totais(entradas, pasta):
+    try:
+        # Importa main sem criar janela nenhuma; só a função é usada
+        from main import atualizar_totais
+    except ImportError as e:
+        print(f"  (atualizar_totais indisponível: {e})")
+        return None
+    itens = [Item(*e) for e in entradas]
+
+    def executar():
+        _limpar_caches()
+        janela, orcamento = JanelaFalsa(), Orcamento()
+        for item in itens:
+            orcamento.adicionar(item)
+            atualizar_totais(janela, orcamento)
+    return executar
+
+
+def _caso_salvar(extensao):
+    def caso(entradas, pasta):
+        orcamento = Orcamento([Item(*e) for e in entradas], mao_obra="350.00")
+        caminho = os.path.join(pasta, f"orcamento_{len(entradas)}{extensao}")
+
+        def executar():
+            gravar_orcamento(caminho, CLIENTE, orcamento)
+            return os.path.getsize(caminho)
+        return executar
+    return caso
+
+
+def caso_carregar_json(entradas, pasta):
+    caminho = os.path.join(pasta, f"carregar_{len(entradas)}.json")
+    gravar_orcamento(caminho, CLIENTE, Orcamento([Item(*e) for e in entradas], mao_obra="350.00"))
+
+    def executar():
+        ler_orcamento(caminho)
+    return executar
+
+
+CASOS = {
+    "criar_pdf": caso_criar_pdf,
+    "formatar_moeda": caso_formatar_moeda,
+    "converter_moeda": caso_converter_moeda,
+    "atualizar_totais": caso_atualizar_totais,
+    "salvar_json": _caso_salvar(".json"),
+    "salvar_json_gz": _caso_salvar(".json.gz"),
+    "carregar_json": caso_carregar_json,
+}
+
+
+def _medir(executar, repeticoes: int):
+    tempos, saida = [], None
+    while len(tempos) < repeticoes or sum(tempos) < TEMPO_MINIMO_CASO:
+        inicio = time.perf_counter()
+        saida = executar()
+        tempos.append(time.perf_counter() - inicio)
+        if sum(tempos) > LIMITE_TEMPO_CASO:
+            break
+
+    tracemalloc.start()
+    executar()
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"tempo_ms": round(min(tempos) * 1000, 4), "pico_kib": round(pico / 1024, 1),
+            "saida_bytes": saida if isinstance(saida, int) else None}
+
+
+def executar_suite(tamanhos, repeticoes: int):
+    resultados = {}
+    with tempfile.TemporaryDirectory() as pasta:
+        print(f"  {'caso':<18} {'itens':>7} {'tempo (ms)':>12} {'pico (KiB)':>12} {'saída (KiB)':>12}")
+        for nome, caso in CASOS.items():
+            for n in tamanhos:
+                executar = caso(_entradas(n), pasta)
+                if executar is None:
+                    break
+                medida = _medir(executar, repeticoes)
+                resultados[f"{nome}/{n}"] = medida
+                saida = f"{medida['saida_bytes'] / 1024:12.1f}" if medida["saida_bytes"] else f"{'-':>12}"
+                print(f"  {nome:<18} {n:>7,} {medida['tempo_ms']:12.3f} {medida['pico_kib']:12.1f} {saida}",
+                    flush=True)
+    return resultados
+
+
+def _ambiente():
+    return {"python": platform.python_version(), "plataforma": platform.platform(),
+            "processador": platform.processor() or platform.machine(), "data": datetime.now().isoformat(timespec="seconds")}
+
+
+def comparar(resultados, caminho_base: str, tolerancia: float) -> bool:
+    with open(caminho_base, "r", encoding="utf-8") as f:
+        base = json.load(f)
+    ambiente = _ambiente()
+    for chave in ("python", "plataforma"):
+        if base["ambiente"].get(chave) != ambiente[chave]:
+            print(f"Aviso: linha de base medida com {chave} {base['ambiente'].get(chave)!r}, "
+                f"agora {ambiente[chave]!r}; tempos podem não ser comparáveis")
+
+    limites = {"tempo_ms": tolerancia, "pico_kib": TOLERANCIA_MEMORIA, "saida_bytes": TOLERANCIA_TAMANHO}
+    regressoes = []
+    print(f"\nComparação com {caminho_base} ({base['ambiente'].get('data', '?')}): razão atual / base"
+        f" (~: abaixo de {PISO_TEMPO_MS:g} ms, não comparado)")
+    print(f"  {'caso':<26} {'tempo':>8} {'pico':>8} {'saída':>8}")
+    for chave, atual in resultados.items():
+        anterior = base["resultados"].get(chave)
+        if anterior is None:
+            continue
+        colunas = []
+        for metrica, limite in limites.items():
+            if not atual[metrica] or not anterior[metrica]:
+                colunas.append(f"{'-':>8}")
+                continue
+            razao = atual[metrica] / anterior[metrica]
+            if metrica == "tempo_ms" and max(atual[metrica], anterior[metrica]) < PISO_TEMPO_MS:
+                colunas.append(f"{razao:7.2f}~")
+                continue
+            marca = "!" if razao > limite else " "
+            colunas.append(f"{razao:7.2f}{marca}")
+            if razao > limite:
+                regressoes.append(f"{chave} {metrica}: {anterior[metrica]:.1f} -> {atual[metrica]:.1f} ({razao:.2f}x)")
+        print(f"  {chave:<26} {' '.join(colunas)}")
+
+    if regressoes:
+        print("\nREGRESSÕES (além da tolerância):")
+        for linha in regressoes:
+            print(f"  {linha}")
+        return False
+    print("\nSem regressões além da tolerância")
+    return True
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=list(TAMANHOS))
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument("--salvar", help="Grava os resultados (JSON) como linha de base")
+    parser.add_argument("--comparar", help="Compara com uma linha de base gravada antes")
+    parser.add_argument("--tolerancia", type=float, default=1.3,
+                        help="Razão de tempo atual/base aceita antes de acusar regressão (padrão: 1.3)")
+    args = parser.parse_args()
+
+    resultados = executar_suite(args.tamanhos, args.repeticoes)
+
+    if args.salvar:
+        with open(args.salvar, "w", encoding="utf-8") as f:
+            json.dump({"ambiente": _ambiente(), "resultados": resultados}, f, ensure_ascii=False, indent=2)
+        print(f"\nLinha de base gravada em {args.salvar}")
+    if args.comparar and not comparar(resultados, args.comparar, args.tolerancia):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
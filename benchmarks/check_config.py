@@ -0,0 +1,177 @@
+"""
+Verifica a gravação do config.json pelo ConfigManager:
+  - mata o processo gravador (SIGKILL / TerminateProcess) em momentos
+    aleatórios e confere que o arquivo continua sendo um JSON válido;
+  - confere que uma alteração gravada por outro processo aparece no get()
+    desta instância depois do intervalo de verificação do mtime;
+  - confere que a gravação de uma instância não apaga a alteração que outra
+    gravou depois da última leitura dela (sem passar por get());
+  - mede quantas gravações saem de uma rajada de set().
+
+Cada cenário usa um HOME temporário, então a configuração real não é tocada.
+
+Uso: python benchmarks/check_config.py [--mortes N]
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+# Grava sem parar seções grandes, forçando a escrita a cada volta
+GRAVADOR = """
+from eurocar.config import ConfigManager
+config = ConfigManager()
+print("pronto", flush=True)
+n = 0
+while True:
+    n += 1
+    config.update_section("historico", {"n": n, "lista": ["x" * 200] * 500})
+    config.flush()
+"""
+
+ESCRITOR_EXTERNO = """
+from eurocar.config import ConfigManager
+config = ConfigManager()
+config.set("paths", "orcamentos_pdf", "/outra/instancia")
+config.flush()
+"""
+
+# Instância A: altera sem gravar, espera a instância B gravar e só então grava
+INSTANCIA_A = """
+import sys
+from eurocar.config import ConfigManager
+config = ConfigManager()
+config.set("telemetria", "ativa", True, save=False)
+print("pronto", flush=True)
+sys.stdin.readline()
+config.flush()
+"""
+
+INSTANCIA_B = """
+from eurocar.config import ConfigManager
+config = ConfigManager()
+config.set("arquivos", "compactar", True)
+config.flush()
+"""
+
+RAJADA = """
+import os
+from eurocar.config import ConfigManager
+config = ConfigManager()
+gravacoes = 0
+original = os.replace
+def contar(*args):
+    global gravacoes
+    gravacoes += 1
+    return original(*args)
+os.replace = contar
+for i in range(1000):
+    config.set("paths", "orcamentos_pdf", f"/pasta/{i}")
+config.flush()
+print(gravacoes)
+"""
+
+
+def _ambiente(home: str):
+    env = dict(os.environ, HOME=home, USERPROFILE=home, XDG_CONFIG_HOME=os.path.join(home, ".config"))
+    env["PYTHONPATH"] = RAIZ + os.pathsep + env.get("PYTHONPATH", "")
+    return env
+
+
+def _arquivo_config(home: str) -> str:
+    codigo = "from eurocar.config import ConfigManager; print(ConfigManager._config_file)"
+    return subprocess.run([sys.executable, "-c", codigo], cwd=RAIZ, env=_ambiente(home), check=True,
+                        capture_output=True, text=True).stdout.strip()
+
+
+def verificar_morte_no_meio(mortes: int) -> bool:
+    rnd = random.Random(7)
+    with tempfile.TemporaryDirectory() as home:
+        caminho = _arquivo_config(home)
+        for rodada in range(1, mortes + 1):
+            processo = subprocess.Popen([sys.executable, "-c", GRAVADOR], cwd=RAIZ, env=_ambiente(home),
+                                        stdout=subprocess.PIPE, text=True)
+            processo.stdout.readline()  # espera o import terminar
+            time.sleep(rnd.uniform(0.0, 0.2))
+            processo.kill()
+            processo.wait()
+            processo.stdout.close()
+            try:
+                with open(caminho, "r", encoding="utf-8") as f:
+                    config = json.load(f)
+                assert "paths" in config
+            except Exception as e:
+                print(f"FALHA: config.json corrompido na rodada {rodada}: {type(e).__name__}: {e}")
+                return False
+    print(f"Processo morto {mortes}x durante a gravação: config.json sempre válido")
+    return True
+
+
+def verificar_recarga() -> bool:
+    with tempfile.TemporaryDirectory() as home:
+        os.environ.update(_ambiente(home))
+        sys.path.insert(0, RAIZ)
+        from eurocar.config import ConfigManager
+
+        config = ConfigManager()
+        subprocess.run([sys.executable, "-c", ESCRITOR_EXTERNO], cwd=RAIZ, env=_ambiente(home), check=True)
+        time.sleep(config.INTERVALO_VERIFICACAO + 0.1)
+        valor = config.get("paths", "orcamentos_pdf")
+        config.flush()
+    if valor != "/outra/instancia":
+        print(f"FALHA: alteração de outra instância não foi vista (valor: {valor!r})")
+        return False
+    print("Alteração feita por outra instância vista pelo get() após a verificação do mtime")
+    return True
+
+
+def verificar_duas_instancias() -> bool:
+    with tempfile.TemporaryDirectory() as home:
+        caminho = _arquivo_config(home)
+        a = subprocess.Popen([sys.executable, "-c", INSTANCIA_A], cwd=RAIZ, env=_ambiente(home),
+                            stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+        a.stdout.readline()
+        subprocess.run([sys.executable, "-c", INSTANCIA_B], cwd=RAIZ, env=_ambiente(home), check=True)
+        a.communicate("\n")
+        with open(caminho, "r", encoding="utf-8") as f:
+            config = json.load(f)
+    ativa = config["telemetria"]["ativa"]
+    compactar = config["arquivos"]["compactar"]
+    if not (ativa and compactar):
+        print(f"FALHA: gravação concorrente perdeu alteração (telemetria.ativa={ativa}, "
+              f"arquivos.compactar={compactar})")
+        return False
+    print("Duas instâncias gravando em sequência: as alterações das duas ficam no config.json")
+    return True
+
+
+def verificar_rajada() -> bool:
+    with tempfile.TemporaryDirectory() as home:
+        saida = subprocess.run([sys.executable, "-c", RAJADA], cwd=RAIZ, env=_ambiente(home), check=True,
+                            capture_output=True, text=True).stdout.strip()
+    gravacoes = int(saida.splitlines()[-1])
+    print(f"1000 set() seguidos: {gravacoes} gravação(ões) do config.json")
+    return gravacoes <= 2
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mortes", type=int, default=30)
+    args = parser.parse_args()
+
+    resultados = [verificar_morte_no_meio(args.mortes), verificar_rajada(), verificar_duas_instancias(),
+                verificar_recarga()]
+    if not all(resultados):
+        return 1
+    print("OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1 @@
+"""Módulos de apoio do sistema de orçamentos Eurocar"""
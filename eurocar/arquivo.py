@@ -0,0 +1,207 @@
+"""
+Formato em disco dos orçamentos editáveis.
+
+Versão 2 (atual): JSON com esquema versionado, dinheiro em centavos e
+quantidade em milésimos (inteiros exatos) e os totais já calculados no
+cabeçalho. O arquivo é gravado em duas linhas:
+
+    {"formato": "eurocar-orcamento", "versao": 2, "resumo": {...},
+    "itens": [["Filtro de óleo", 1000, 3500], ...]}
+
+O conjunto continua sendo um único objeto JSON válido, mas a primeira linha
+sozinha já traz o resumo: o catálogo e a confirmação de carregamento leem só
+ela, sem decodificar os itens. Com a extensão .json.gz o mesmo conteúdo vai
+em gzip, e a leitura do resumo descompacta apenas o começo do arquivo.
+
+Arquivos da versão 1 (JSON antigo, com valores float) continuam sendo lidos.
+"""
+import gzip
+import json
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+from eurocar.fixo import Dinheiro, Quantidade
+from eurocar.orcamento import Item, Orcamento
+from eurocar.telemetria import medir
+
+FORMATO = "eurocar-orcamento"
+VERSAO = 2
+
+EXTENSAO = ".json"
+EXTENSAO_COMPACTA = ".json.gz"
+# Nível 6: quase o mesmo tamanho do 9, gravando bem mais rápido
+NIVEL_GZIP = 6
+
+CAMPOS_CLIENTE = ("nome", "telefone", "veiculo", "placa")
+
+_INICIO_CABECALHO = '{"formato"'
+
+
+def e_arquivo_orcamento(caminho: str) -> bool:
+    nome = caminho.lower()
+    return nome.endswith(EXTENSAO) or nome.endswith(EXTENSAO_COMPACTA)
+
+
+def nome_base(caminho: str) -> str:
+    """Nome do arquivo sem .json / .json.gz"""
+    nome = os.path.basename(caminho)
+    for extensao in (EXTENSAO_COMPACTA, EXTENSAO):
+        if nome.lower().endswith(extensao):
+            return nome[:-len(extensao)]
+    return os.path.splitext(nome)[0]
+
+
+def _compactado(caminho: str) -> bool:
+    return caminho.lower().endswith(EXTENSAO_COMPACTA)
+
+
+def _abrir(caminho: str, modo: str, compactado: Optional[bool] = None):
+    if compactado is None:
+        compactado = _compactado(caminho)
+    if compactado:
+        return gzip.open(caminho, modo + "t", encoding="utf-8", compresslevel=NIVEL_GZIP)
+    return open(caminho, modo, encoding="utf-8")
+
+
+def item_para_linha(item: Item) -> List[Any]:
+    """Forma compacta de um item: [descricao, milesimos, centavos]"""
+    return [item.descricao, item.quantidade.milesimos, item.valor.centavos]
+
+
+def item_de_linha(linha: List[Any]) -> Item:
+    descricao, milesimos, centavos = linha
+    return Item(descricao, Quantidade(milesimos), Dinheiro(centavos))
+
+
+# ---------- Escrita ----------
+def resumir(dados: Dict[str, Any], orcamento: Orcamento) -> Dict[str, Any]:
+    """Cabeçalho do arquivo: dados do cliente e totais em centavos"""
+    resumo = {campo: str(dados.get(campo, "") or "") for campo in CAMPOS_CLIENTE}
+    resumo.update({
+        "qtd_itens": len(orcamento),
+        "total_pecas": orcamento.total_pecas.centavos,
+        "mao_obra": orcamento.mao_obra.centavos,
+        "total_geral": orcamento.total_geral.centavos,
+    })
+    return resumo
+
+
+def serializar(dados: Dict[str, Any], orcamento: Orcamento) -> str:
+    cabecalho = json.dumps({"formato": FORMATO, "versao": VERSAO, "resumo": resumir(dados, orcamento)},
+                        ensure_ascii=False, separators=(",", ":"))
+    itens = json.dumps([item_para_linha(i) for i in orcamento],
+                    ensure_ascii=False, separators=(",", ":"))
+    # json.dumps escapa quebras de linha dentro dos textos, então a 1ª linha é sempre o cabeçalho
+    return f'{cabecalho[:-1]},\n"itens":{itens}}}\n'
+
+
+def gravar_orcamento(caminho: str, dados: Dict[str, Any], orcamento: Orcamento) -> str:
+    """Grava no formato atual; a extensão (.json ou .json.gz) define a compactação"""
+    compactado = _compactado(caminho)
+    temporario = caminho + ".tmp"
+    with medir("arquivo.gravar", itens=len(orcamento), compactado=compactado):
+        conteudo = serializar(dados, orcamento).encode("utf-8")
+        if compactado:
+            conteudo = gzip.compress(conteudo, compresslevel=NIVEL_GZIP)
+        try:
+            with open(temporario, "wb") as f:
+                f.write(conteudo)
+                # Sem o fsync, uma queda de energia logo após o replace pode deixar o
+                # arquivo com tamanho zero (NTFS grava os metadados antes dos dados)
+                f.flush()
+                os.fsync(f.fileno())
+            # Troca atômica: um arquivo pela metade nunca substitui o anterior
+            os.replace(temporario, caminho)
+        except BaseException:
+            try:
+                os.remove(temporario)
+            except OSError:
+                pass
+            raise
+    return caminho
+
+
+# ---------- Leitura ----------
+def _dados_cliente(origem: Dict[str, Any]) -> Dict[str, Any]:
+    return {campo: str(origem.get(campo, "") or "") for campo in CAMPOS_CLIENTE}
+
+
+def _verificar_versao(conteudo: Dict[str, Any]):
+    if conteudo.get("formato") != FORMATO:
+        raise ValueError("Arquivo não é um orçamento Eurocar")
+    if not isinstance(conteudo.get("versao"), int) or conteudo["versao"] > VERSAO:
+        raise ValueError(f"Versão de arquivo não suportada: {conteudo.get('versao')}")
+
+
+def _orcamento_v2(conteudo: Dict[str, Any]) -> Orcamento:
+    resumo = conteudo.get("resumo") or {}
+    orcamento = Orcamento(mao_obra=Dinheiro(resumo.get("mao_obra", 0)))
+    for linha in conteudo.get("itens") or []:
+        try:
+            orcamento.adicionar(item_de_linha(linha))
+        except (ValueError, TypeError):
+            continue
+    return orcamento
+
+
+def ler_conteudo(caminho: str) -> Dict[str, Any]:
+    with _abrir(caminho, "r") as f:
+        conteudo = json.load(f)
+    if not isinstance(conteudo, dict):
+        raise ValueError("Arquivo sem um objeto de orçamento")
+    return conteudo
+
+
+def ler_orcamento(caminho: str) -> Tuple[Dict[str, Any], Orcamento]:
+    """
+    Carrega um orçamento salvo (versão atual ou JSON antigo).
+    Devolve os dados do cliente (com mao_obra e itens do modelo) e o modelo.
+    """
+    return orcamento_de_conteudo(ler_conteudo(caminho))
+
+
+def orcamento_de_conteudo(conteudo: Dict[str, Any]) -> Tuple[Dict[str, Any], Orcamento]:
+    """Como ler_orcamento, a partir do objeto JSON já decodificado (ex: recebido pela rede)"""
+    if not isinstance(conteudo, dict):
+        raise ValueError("Conteúdo sem um objeto de orçamento")
+    if "formato" in conteudo:
+        _verificar_versao(conteudo)
+        dados = _dados_cliente(conteudo.get("resumo") or {})
+        orcamento = _orcamento_v2(conteudo)
+    else:
+        if not isinstance(conteudo.get("itens"), list):
+            raise ValueError("Arquivo sem lista de itens")
+        dados = _dados_cliente(conteudo)
+        orcamento = Orcamento.de_dados(conteudo)
+    dados["mao_obra"] = orcamento.mao_obra
+    dados["itens"] = orcamento.itens
+    return dados, orcamento
+
+
+def _resumo_v1(conteudo: Dict[str, Any]) -> Dict[str, Any]:
+    return resumir(_dados_cliente(conteudo), Orcamento.de_dados(conteudo))
+
+
+def resumo_vazio() -> Dict[str, Any]:
+    return resumir({}, Orcamento())
+
+
+def ler_resumo(caminho: str) -> Dict[str, Any]:
+    """
+    Dados do cliente, quantidade de itens e totais (em centavos) de um arquivo.
+    No formato atual lê só a primeira linha; arquivos antigos são lidos inteiros.
+    """
+    with _abrir(caminho, "r") as f:
+        linha = f.readline()
+        if linha.startswith(_INICIO_CABECALHO) and linha.rstrip().endswith(","):
+            cabecalho = json.loads(linha.rstrip()[:-1] + "}")
+            _verificar_versao(cabecalho)
+            return {**resumo_vazio(), **cabecalho["resumo"]}
+        conteudo = json.loads(linha + f.read())
+
+    if not isinstance(conteudo, dict):
+        raise ValueError("Arquivo sem um objeto de orçamento")
+    if "formato" in conteudo:
+        _verificar_versao(conteudo)
+        return resumir(_dados_cliente(conteudo.get("resumo") or {}), _orcamento_v2(conteudo))
+    return _resumo_v1(conteudo)
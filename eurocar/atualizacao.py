@@ -0,0 +1,85 @@
+"""
+Verificação de nova versão do executável.
+
+A consulta é feita fora da thread da interface e o resultado fica em cache
+em disco, de forma que a rede é acessada no máximo uma vez por intervalo
+configurado. A URL vem das configurações, o que permite apontar para um
+servidor local nos testes.
+"""
+import json
+import logging
+import os
+import time
+from typing import Any, Dict, Optional
+
+from eurocar.telemetria import medir
+
+VERSAO_ATUAL = "1.2"
+
+# Arquivos no Google Drive: version.txt e o executável
+ID_ARQUIVO_VERSAO = "1Vqrrv9H_y43cD6koq7uWF_3UbeCAvdJJ"
+ID_DO_APP = "10a9nUhJGASKGcFF05JxmbffPJN9igF-Z"
+
+URL_CHECK_VERSAO = f"https://drive.google.com/uc?export=download&id={ID_ARQUIVO_VERSAO}"
+LINK_DOWNLOAD_DIRETO = f"https://drive.google.com/uc?export=download&id={ID_DO_APP}"
+
+INTERVALO_PADRAO_HORAS = 24
+TIMEOUT_SEGUNDOS = 3
+
+
+def _ler_cache(caminho: str) -> Dict[str, Any]:
+    try:
+        with open(caminho, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _gravar_cache(caminho: str, dados: Dict[str, Any]):
+    try:
+        with open(caminho, "w", encoding="utf-8") as f:
+            json.dump(dados, f)
+    except OSError as e:
+        logging.error(f"Erro ao gravar cache de atualização: {e}")
+
+
+def buscar_versao_remota(url: str, timeout: float = TIMEOUT_SEGUNDOS) -> Optional[str]:
+    """Lê o arquivo de versão publicado; None se não houver resposta válida"""
+    # requests é pesado e só é necessário quando o cache expirou
+    import requests
+
+    with medir("atualizacao.consultar"):
+        resposta = requests.get(url, timeout=timeout)
+    if resposta.status_code != 200:
+        return None
+    versao = resposta.text.strip()
+    return versao or None
+
+
+def consultar_versao(caminho_cache: str, url: str = URL_CHECK_VERSAO,
+                    intervalo_horas: float = INTERVALO_PADRAO_HORAS,
+                    agora: Optional[float] = None) -> Optional[str]:
+    """
+    Retorna a versão publicada, usando o cache se a última consulta ainda
+    estiver dentro do intervalo. Pensada para rodar em uma thread de fundo.
+    """
+    agora = time.time() if agora is None else agora
+    cache = _ler_cache(caminho_cache)
+
+    recente = agora - cache.get("ultima_verificacao", 0) < intervalo_horas * 3600
+    if recente and cache.get("url") == url:
+        return cache.get("versao_remota")
+
+    try:
+        versao = buscar_versao_remota(url)
+    except Exception as e:
+        # Sem rede: tenta de novo na próxima abertura, sem travar nada
+        logging.warning(f"Não foi possível verificar atualizações: {e}")
+        return cache.get("versao_remota") if cache.get("url") == url else None
+
+    _gravar_cache(caminho_cache, {"ultima_verificacao": agora, "url": url, "versao_remota": versao})
+    return versao
+
+
+def ha_atualizacao(versao_remota: Optional[str], versao_atual: str = VERSAO_ATUAL) -> bool:
+    return bool(versao_remota) and versao_remota != versao_atual
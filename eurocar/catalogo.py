@@ -0,0 +1,243 @@
+"""
+Catálogo indexado dos orçamentos editáveis.
+
+Mantém um índice SQLite com o resumo de cada arquivo JSON da pasta de
+orçamentos editáveis (totais em centavos) e as linhas dos itens, usadas nas
+sugestões de eurocar.sugestoes e nos relatórios de eurocar.relatorios. A
+sincronização é incremental: só arquivos novos ou com mtime/tamanho
+diferentes são lidos novamente, e a busca consulta apenas o banco, sem abrir
+nenhum JSON.
+
+Quando há muitos arquivos a ler (primeira sincronização de um arquivo
+histórico grande), a leitura é dividida entre processos (exceto no executável
+congelado); a gravação no banco continua num único processo, à medida que os
+resultados chegam.
+"""
+import logging
+import os
+import re
+import sqlite3
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from eurocar.arquivo import e_arquivo_orcamento, ler_orcamento, resumir, resumo_vazio
+from eurocar.fixo import Dinheiro
+from eurocar.sugestoes import normalizar
+
+_RE_TIMESTAMP = re.compile(r"_(\d{8}_\d{6})\.json(\.gz)?$", re.IGNORECASE)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS orcamentos (
+    caminho     TEXT PRIMARY KEY,
+    arquivo     TEXT NOT NULL,
+    mtime       REAL NOT NULL,
+    tamanho     INTEGER NOT NULL,
+    nome        TEXT NOT NULL DEFAULT '',
+    telefone    TEXT NOT NULL DEFAULT '',
+    veiculo     TEXT NOT NULL DEFAULT '',
+    placa       TEXT NOT NULL DEFAULT '',
+    data        TEXT NOT NULL DEFAULT '',
+    qtd_itens   INTEGER NOT NULL DEFAULT 0,
+    total       TEXT NOT NULL DEFAULT '0.00',
+    total_pecas INTEGER NOT NULL DEFAULT 0,
+    mao_obra    INTEGER NOT NULL DEFAULT 0,
+    total_geral INTEGER NOT NULL DEFAULT 0,
+    busca       TEXT NOT NULL DEFAULT '',
+    erro        INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_orcamentos_data ON orcamentos (data DESC);
+CREATE TABLE IF NOT EXISTS itens (
+    caminho     TEXT NOT NULL,
+    descricao   TEXT NOT NULL,
+    chave       TEXT NOT NULL,
+    quantidade  INTEGER NOT NULL,
+    valor       INTEGER NOT NULL,
+    total       INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_itens_caminho ON itens (caminho);
+"""
+
+# 2: tabela de itens; 3: totais em centavos e quantidade/total dos itens.
+# Bancos de versões anteriores são recriados e preenchidos de novo
+_VERSAO_ESQUEMA = 3
+
+# A partir de quantos arquivos pendentes a leitura é dividida entre processos
+LIMITE_PARALELO = 64
+
+
+def _data_do_arquivo(caminho: str, mtime: float) -> str:
+    """Usa o timestamp do nome do arquivo; na falta dele, a data de modificação"""
+    encontrado = _RE_TIMESTAMP.search(caminho)
+    if encontrado:
+        try:
+            return datetime.strptime(encontrado.group(1), "%Y%m%d_%H%M%S").isoformat(sep=" ")
+        except ValueError:
+            pass
+    return datetime.fromtimestamp(mtime).isoformat(sep=" ", timespec="seconds")
+
+
+def ler_registro(caminho: str, mtime: float, tamanho: int) -> Tuple[Tuple, List[Tuple]]:
+    """
+    Lê um arquivo e devolve as linhas prontas para o banco: (orçamento, itens).
+    Função de módulo para poder rodar nos processos do pool.
+    """
+    erro = 0
+    itens = []
+    try:
+        # Lido inteiro uma única vez: o resumo e as linhas dos itens saem da mesma leitura
+        dados, orcamento = ler_orcamento(caminho)
+        resumo = resumir(dados, orcamento)
+        itens = [(caminho, item.descricao, normalizar(item.descricao), item.quantidade.milesimos,
+                item.valor.centavos, item.total.centavos) for item in orcamento]
+    except Exception as e:
+        # Arquivos ilegíveis continuam listados para o usuário saber que existem
+        logging.error(f"Erro ao indexar {caminho}: {e}")
+        resumo = resumo_vazio()
+        erro = 1
+
+    busca = " ".join([
+        resumo["nome"], resumo["telefone"], resumo["veiculo"],
+        resumo["placa"], os.path.basename(caminho),
+    ]).lower()
+    linha = (caminho, os.path.basename(caminho), mtime, tamanho,
+            resumo["nome"], resumo["telefone"], resumo["veiculo"], resumo["placa"],
+            _data_do_arquivo(caminho, mtime), resumo["qtd_itens"], str(Dinheiro(resumo["total_geral"])),
+            resumo["total_pecas"], resumo["mao_obra"], resumo["total_geral"], busca, erro)
+    return linha, itens
+
+
+def _ler_lote(pendentes: List[Tuple[str, float, int]]) -> List[Tuple[Tuple, List[Tuple]]]:
+    return [ler_registro(*pendente) for pendente in pendentes]
+
+
+def _ler_registros(pendentes: List[Tuple[str, float, int]],
+                processos: Optional[int] = None) -> Iterator[Tuple[Tuple, List[Tuple]]]:
+    """
+    Lê os arquivos pendentes, em processos separados quando são muitos.
+
+    No executável do PyInstaller os processos filhos dependem do
+    multiprocessing.freeze_support() no início de main.py.
+    """
+    processos = processos or os.cpu_count() or 1
+    if processos == 1 or len(pendentes) < LIMITE_PARALELO:
+        for pendente in pendentes:
+            yield ler_registro(*pendente)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    # Lotes grandes diluem o custo de enviar cada resultado de volta ao processo principal
+    tamanho = max(16, min(512, len(pendentes) // (processos * 4)))
+    lotes = [pendentes[i:i + tamanho] for i in range(0, len(pendentes), tamanho)]
+    with ProcessPoolExecutor(max_workers=processos) as pool:
+        for registros in pool.map(_ler_lote, lotes):
+            yield from registros
+
+
+class CatalogoOrcamentos:
+    """Índice persistente dos orçamentos de uma pasta"""
+
+    def __init__(self, pasta: str, caminho_db: str):
+        self.pasta = pasta
+        self.caminho_db = caminho_db
+        os.makedirs(os.path.dirname(caminho_db) or ".", exist_ok=True)
+        # A carga do histórico de sugestões sincroniza numa thread com a própria conexão
+        self._conn = sqlite3.connect(caminho_db, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        if self._conn.execute("PRAGMA user_version").fetchone()[0] < _VERSAO_ESQUEMA:
+            self._conn.executescript("DROP TABLE IF EXISTS orcamentos; DROP TABLE IF EXISTS itens;")
+            self._conn.execute(f"PRAGMA user_version = {_VERSAO_ESQUEMA}")
+        self._conn.executescript(_SCHEMA)
+
+    def fechar(self):
+        self._conn.close()
+
+    def sincronizar(self, processos: Optional[int] = None) -> Dict[str, int]:
+        """
+        Atualiza o índice lendo apenas arquivos novos ou alterados.
+        `processos` limita o pool de leitura (padrão: núcleos da máquina; 1 = sem pool).
+        """
+        stats = {"novos": 0, "atualizados": 0, "removidos": 0, "inalterados": 0}
+        conhecidos = {
+            row["caminho"]: (row["mtime"], row["tamanho"])
+            for row in self._conn.execute("SELECT caminho, mtime, tamanho FROM orcamentos")
+        }
+
+        vistos = set()
+        try:
+            entradas = list(os.scandir(self.pasta))
+        except OSError as e:
+            logging.error(f"Erro ao listar pasta de orçamentos: {e}")
+            entradas = []
+
+        pendentes = []
+        for entrada in entradas:
+            if not e_arquivo_orcamento(entrada.name) or not entrada.is_file():
+                continue
+            caminho = os.path.abspath(entrada.path)
+            vistos.add(caminho)
+            st = entrada.stat()
+            anterior = conhecidos.get(caminho)
+            if anterior == (st.st_mtime, st.st_size):
+                stats["inalterados"] += 1
+                continue
+            pendentes.append((caminho, st.st_mtime, st.st_size))
+            stats["atualizados" if anterior else "novos"] += 1
+
+        with self._conn:
+            for registro in _ler_registros(pendentes, processos):
+                self._gravar(registro)
+
+            removidos = [(c,) for c in conhecidos if c not in vistos]
+            if removidos:
+                self._conn.executemany("DELETE FROM orcamentos WHERE caminho = ?", removidos)
+                self._conn.executemany("DELETE FROM itens WHERE caminho = ?", removidos)
+            stats["removidos"] = len(removidos)
+
+        return stats
+
+    def registrar(self, caminho: str):
+        """Indexa (ou reindexa) um único arquivo, ex: logo após salvá-lo"""
+        caminho = os.path.abspath(caminho)
+        st = os.stat(caminho)
+        with self._conn:
+            self._gravar(ler_registro(caminho, st.st_mtime, st.st_size))
+
+    def _gravar(self, registro: Tuple[Tuple, List[Tuple]]):
+        linha, itens = registro
+        self._conn.execute(
+            """INSERT OR REPLACE INTO orcamentos
+               (caminho, arquivo, mtime, tamanho, nome, telefone, veiculo, placa, data, qtd_itens,
+                total, total_pecas, mao_obra, total_geral, busca, erro)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""", linha)
+        self._conn.execute("DELETE FROM itens WHERE caminho = ?", (linha[0],))
+        self._conn.executemany(
+            "INSERT INTO itens (caminho, descricao, chave, quantidade, valor, total) VALUES (?, ?, ?, ?, ?, ?)",
+            itens)
+
+    def consultar(self, sql: str, parametros: Tuple = ()) -> List[sqlite3.Row]:
+        """Consulta somente leitura no índice (usada pelos relatórios)"""
+        return self._conn.execute(sql, parametros).fetchall()
+
+    def historico_itens(self) -> Iterator[Tuple[str, str, int, str]]:
+        """Linhas (caminho, descricao, centavos, data) de todos os orçamentos, das mais antigas às mais novas"""
+        return self._conn.execute(
+            """SELECT i.caminho, i.descricao, i.valor, o.data
+               FROM itens i JOIN orcamentos o ON o.caminho = i.caminho
+               ORDER BY o.data""")
+
+    def buscar(self, termo: str = "", limite: Optional[int] = 500) -> List[Dict[str, Any]]:
+        """Busca por cliente, telefone, veículo, placa ou nome do arquivo (mais recentes primeiro)"""
+        sql = "SELECT * FROM orcamentos"
+        params: List[Any] = []
+        palavras = termo.lower().split()
+        if palavras:
+            sql += " WHERE " + " AND ".join("busca LIKE ? ESCAPE '\\'" for _ in palavras)
+            for palavra in palavras:
+                escapada = palavra.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+                params.append(f"%{escapada}%")
+        sql += " ORDER BY data DESC"
+        if limite:
+            sql += " LIMIT ?"
+            params.append(limite)
+        return [dict(row) for row in self._conn.execute(sql, params)]
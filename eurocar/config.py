@@ -0,0 +1,248 @@
+"""
+Configurações do usuário (config.json) e pastas do programa.
+
+Sem dependência da interface: usado pela janela (main.py), pela geração em
+lote e pelo serviço de PDF.
+"""
+import atexit
+import copy
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import appdirs
+
+from eurocar import telemetria
+from eurocar.atualizacao import INTERVALO_PADRAO_HORAS, LINK_DOWNLOAD_DIRETO, URL_CHECK_VERSAO
+
+
+def pasta_config() -> str:
+    """Pasta de configurações do usuário (config.json, catálogo, diário, logs)"""
+    return appdirs.user_config_dir("Eurocar")
+
+
+def pasta_logs() -> str:
+    return os.path.join(pasta_config(), "logs")
+
+
+def configurar_logging():
+    """Direciona o log de erros para a pasta de configurações do usuário"""
+    log_dir = pasta_logs()
+    os.makedirs(log_dir, exist_ok=True)
+
+    log_path = os.path.join(log_dir, "eurocar.log")
+    logging.basicConfig(filename=log_path, level=logging.ERROR)
+
+
+class ConfigManager:
+    """
+    Configurações em config.json, com gravação adiada e atômica.
+
+    Alterações seguidas viram uma única gravação (ATRASO_GRAVACAO segundos após
+    a última), feita em arquivo temporário + os.replace: uma queda no meio nunca
+    deixa o config.json pela metade. Se outra instância do programa gravar o
+    arquivo, a mudança é percebida pelo mtime (verificado no máximo a cada
+    INTERVALO_VERIFICACAO segundos) sem reler o arquivo a cada get; antes de
+    gravar o mtime é sempre conferido, para não sobrescrever a versão dela.
+    """
+    _instance = None
+    _config_dir = pasta_config()
+    _config_file = os.path.join(_config_dir, "config.json")
+
+    ATRASO_GRAVACAO = 0.5
+    INTERVALO_VERIFICACAO = 1.0
+    
+    _default_config = {
+        "paths": {
+            "orcamentos_pdf": str(Path.home()),
+            "orcamentos_editaveis": str(Path.home()),
+        },
+        "arquivos": {
+            # Grava os editáveis como .json.gz (menores; o catálogo lê os dois)
+            "compactar": False,
+            # PDFs menores para enviar por WhatsApp (logo reduzida, sem transparência)
+            "pdf_compacto": False,
+        },
+        "atualizacao": {
+            "url_versao": URL_CHECK_VERSAO,
+            "url_download": LINK_DOWNLOAD_DIRETO,
+            "intervalo_horas": INTERVALO_PADRAO_HORAS,
+        },
+        "telemetria": {
+            # Tempos das operações em logs/telemetria.jsonl (resumo: main.py --telemetria)
+            "ativa": False,
+        }
+    }
+
+    def __new__(cls):
+        if cls._instance is None:
+            instancia = super(ConfigManager, cls).__new__(cls)
+            instancia._lock = threading.RLock()
+            instancia._timer = None
+            # Alterações locais ainda não gravadas (reaplicadas se o arquivo mudar por fora)
+            instancia._pendentes = []
+            # (mtime_ns, tamanho) do config.json na última leitura/gravação
+            instancia._assinatura = None
+            instancia._ultima_verificacao = time.monotonic()
+            # Garante que o diretório de configuração existe
+            os.makedirs(cls._config_dir, exist_ok=True)
+            instancia._load_config()
+            # Grava o que estiver pendente ao sair (inclusive via sys.exit)
+            atexit.register(instancia.flush)
+            cls._instance = instancia
+        return cls._instance
+
+    def _load_config(self):
+        """Carrega configurações do arquivo ou cria um novo com padrões"""
+        try:
+            if os.path.exists(self._config_file):
+                self.config = self._ler_arquivo()
+                self._merge_defaults()
+            else:
+                self.config = copy.deepcopy(self._default_config)
+                self._save_config()
+                self._create_dirs()
+        except Exception as e:
+            logging.error(f"Erro ao carregar configurações: {e}")
+            self.config = copy.deepcopy(self._default_config)
+
+    def _ler_arquivo(self) -> Dict[str, Any]:
+        with open(self._config_file, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+            st = os.fstat(f.fileno())
+        if not isinstance(config, dict):
+            raise ValueError("config.json não contém um objeto")
+        self._assinatura = (st.st_mtime_ns, st.st_size)
+        return config
+
+    def _recarregar_se_mudou(self):
+        """Relê o config.json se outra instância o alterou desde a última leitura/gravação"""
+        agora = time.monotonic()
+        if agora - self._ultima_verificacao < self.INTERVALO_VERIFICACAO:
+            return
+        self._ultima_verificacao = agora
+        if not self._mudou_no_disco():
+            return
+        with self._lock:
+            self._reler()
+
+    def _reler(self):
+        """Relê o arquivo e reaplica por cima as alterações locais ainda não gravadas"""
+        try:
+            config = self._ler_arquivo()
+        except Exception as e:
+            logging.error(f"Erro ao recarregar configurações: {e}")
+            return
+        self.config = config
+        self._merge_defaults()
+        for section, key, value in self._pendentes:
+            self._aplicar(section, key, value)
+
+    def _mudou_no_disco(self) -> bool:
+        try:
+            st = os.stat(self._config_file)
+        except OSError:
+            return False
+        return (st.st_mtime_ns, st.st_size) != self._assinatura
+
+    def _merge_defaults(self):
+        """Mescla configurações padrão com as existentes"""
+        for section, values in self._default_config.items():
+            if not isinstance(self.config.get(section), dict):
+                self.config[section] = values.copy()
+            else:
+                for key, value in values.items():
+                    if key not in self.config[section]:
+                        self.config[section][key] = value
+
+    def _save_config(self):
+        """Salva configurações no arquivo (temporário + troca atômica)"""
+        with self._lock:
+            self._cancelar_gravacao()
+            # Outra instância gravou depois da nossa última leitura: parte da versão
+            # dela, senão a cópia antiga em memória apagaria a alteração
+            if self._mudou_no_disco():
+                self._reler()
+            temporario = f"{self._config_file}.{os.getpid()}.tmp"
+            try:
+                with telemetria.medir("config.gravar"):
+                    with open(temporario, 'w', encoding='utf-8') as f:
+                        json.dump(self.config, f, indent=4, ensure_ascii=False)
+                        f.flush()
+                        os.fsync(f.fileno())
+                    os.replace(temporario, self._config_file)
+                st = os.stat(self._config_file)
+                self._assinatura = (st.st_mtime_ns, st.st_size)
+                self._pendentes.clear()
+            except Exception as e:
+                logging.error(f"Erro ao salvar configurações: {e}")
+                try:
+                    os.remove(temporario)
+                except OSError:
+                    pass
+
+    def _cancelar_gravacao(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _agendar_gravacao(self):
+        """Adia a gravação: várias alterações seguidas resultam em uma só escrita"""
+        with self._lock:
+            self._cancelar_gravacao()
+            self._timer = threading.Timer(self.ATRASO_GRAVACAO, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self):
+        """Grava imediatamente as alterações pendentes"""
+        with self._lock:
+            if self._pendentes:
+                self._save_config()
+            else:
+                self._cancelar_gravacao()
+
+    def _create_dirs(self):
+        """Cria diretórios padrão se não existirem"""
+        for path in self.config["paths"].values():
+            os.makedirs(path, exist_ok=True)
+
+    def get(self, section: str, key: str) -> Any:
+        """Obtém um valor de configuração"""
+        self._recarregar_se_mudou()
+        return self.config.get(section, {}).get(key)
+
+    def _aplicar(self, section: str, key: Optional[str], value: Any):
+        if key is None:
+            self.config[section] = copy.deepcopy(value)
+        else:
+            if not isinstance(self.config.get(section), dict):
+                self.config[section] = {}
+            self.config[section][key] = value
+
+    def _alterar(self, section: str, key: Optional[str], value: Any, save: bool):
+        with self._lock:
+            self._aplicar(section, key, value)
+            self._pendentes.append((section, key, value))
+            if save:
+                self._agendar_gravacao()
+
+    def set(self, section: str, key: str, value: Any, save: bool = True):
+        """Define um valor de configuração (gravado em disco logo em seguida, de forma adiada)"""
+        self._alterar(section, key, value, save)
+
+    def update_section(self, section: str, values: Dict[str, Any], save: bool = True):
+        """Atualiza uma seção inteira de configurações"""
+        self._alterar(section, None, values, save)
+
+    def reset_to_defaults(self):
+        """Restaura configurações padrão"""
+        with self._lock:
+            self.config = copy.deepcopy(self._default_config)
+            self._pendentes = [(section, None, values) for section, values in self.config.items()]
+            self._save_config()
+        self._create_dirs()
@@ -0,0 +1,190 @@
+"""
+Diário de edição (write-ahead) do orçamento aberto na tela.
+
+Cada alteração (item incluído, editado, removido ou movido, campo do cliente,
+mão de obra) vira uma linha JSON pequena acrescentada ao fim do arquivo, sem
+regravar o orçamento. A primeira linha é sempre uma base com o estado completo;
+a cada `limite_compactacao` operações o diário é compactado, trocando tudo por
+uma nova base (gravação atômica).
+
+Operações de itens são sincronizadas no disco (fsync) na hora; as de campos,
+disparadas a cada tecla, só descarregam o buffer do processo, o que já basta
+para sobreviver a um travamento do programa.
+
+Se o programa fechar sem passar por `descartar()`, `restaurar()` refaz a sessão
+a partir do arquivo. Uma última linha incompleta (queda de energia no meio da
+escrita) é ignorada.
+"""
+import json
+import logging
+import os
+from typing import Any, Dict, Optional, Tuple
+
+from eurocar.arquivo import CAMPOS_CLIENTE, item_de_linha, item_para_linha
+from eurocar.fixo import Dinheiro
+from eurocar.orcamento import Item, Orcamento
+from eurocar.telemetria import medir
+
+LIMITE_COMPACTACAO = 500
+
+
+def _linha(registro: Dict[str, Any]) -> str:
+    return json.dumps(registro, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+
+class DiarioEdicao:
+    """Registra as alterações do orçamento em edição, uma linha por operação"""
+
+    def __init__(self, caminho: str, limite_compactacao: int = LIMITE_COMPACTACAO):
+        self.caminho = caminho
+        self.limite_compactacao = limite_compactacao
+        self.campos: Dict[str, str] = {campo: "" for campo in CAMPOS_CLIENTE}
+        self.orcamento: Optional[Orcamento] = None
+        self._arquivo = None
+        self._operacoes = 0
+        self._mao_obra = 0
+
+    def iniciar(self, campos: Dict[str, str], orcamento: Orcamento):
+        """Começa (ou recomeça, ex: ao carregar um arquivo) a partir do estado informado"""
+        self.campos = {campo: str(campos.get(campo, "") or "") for campo in CAMPOS_CLIENTE}
+        self.orcamento = orcamento
+        self.compactar()
+
+    # ---------- Operações ----------
+    def adicionar(self, item: Item):
+        self._anexar({"op": "add", "item": item_para_linha(item)}, sincronizar=True)
+
+    def editar(self, indice: int, item: Item):
+        self._anexar({"op": "edit", "i": indice, "item": item_para_linha(item)}, sincronizar=True)
+
+    def remover(self, indice: int):
+        self._anexar({"op": "del", "i": indice}, sincronizar=True)
+
+    def trocar(self, a: int, b: int):
+        self._anexar({"op": "mov", "a": a, "b": b}, sincronizar=True)
+
+    def definir_campo(self, campo: str, valor: str):
+        if self.campos.get(campo) == valor:
+            return
+        self.campos[campo] = valor
+        self._anexar({"op": "campo", "k": campo, "v": valor})
+
+    def definir_mao_obra(self, valor: Dinheiro):
+        if valor.centavos == self._mao_obra:
+            return
+        self._mao_obra = valor.centavos
+        self._anexar({"op": "mao_obra", "v": valor.centavos})
+
+    # ---------- Arquivo ----------
+    def _anexar(self, registro: Dict[str, Any], sincronizar: bool = False):
+        if self._arquivo is None:
+            return
+        try:
+            with medir("diario.anexar", fsync=sincronizar):
+                self._arquivo.write(_linha(registro))
+                self._arquivo.flush()
+                if sincronizar:
+                    os.fsync(self._arquivo.fileno())
+            self._operacoes += 1
+            if self._operacoes >= self.limite_compactacao:
+                self.compactar()
+        except OSError as e:
+            # O diário é uma proteção extra: uma falha aqui não pode travar a edição
+            logging.error(f"Erro ao gravar diário de edição: {e}")
+
+    def compactar(self):
+        """Substitui o diário por uma única base com o estado atual"""
+        orcamento = self.orcamento if self.orcamento is not None else Orcamento()
+        self._mao_obra = orcamento.mao_obra.centavos
+        base = {
+            "op": "base",
+            "campos": self.campos,
+            "mao_obra": orcamento.mao_obra.centavos,
+            "itens": [item_para_linha(item) for item in orcamento],
+        }
+        self.fechar()
+        try:
+            os.makedirs(os.path.dirname(self.caminho) or ".", exist_ok=True)
+            temporario = self.caminho + ".tmp"
+            with medir("diario.compactar", itens=len(orcamento)):
+                with open(temporario, "w", encoding="utf-8") as f:
+                    f.write(_linha(base))
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(temporario, self.caminho)
+            self._arquivo = open(self.caminho, "a", encoding="utf-8")
+            self._operacoes = 0
+        except OSError as e:
+            logging.error(f"Erro ao compactar diário de edição: {e}")
+
+    def fechar(self):
+        if self._arquivo is not None:
+            try:
+                self._arquivo.close()
+            except OSError:
+                pass
+            self._arquivo = None
+
+    def descartar(self):
+        """Encerra a sessão normalmente: o diário não é mais necessário"""
+        self.fechar()
+        try:
+            os.remove(self.caminho)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logging.error(f"Erro ao remover diário de edição: {e}")
+
+
+def _aplicar(registro: Dict[str, Any], campos: Dict[str, str], orcamento: Orcamento) -> Orcamento:
+    op = registro.get("op")
+    if op == "base":
+        campos.clear()
+        campos.update({campo: str(registro.get("campos", {}).get(campo, "") or "") for campo in CAMPOS_CLIENTE})
+        orcamento = Orcamento(mao_obra=Dinheiro(registro.get("mao_obra", 0)))
+        for linha in registro.get("itens", []):
+            orcamento.adicionar(item_de_linha(linha))
+    elif op == "add":
+        orcamento.adicionar(item_de_linha(registro["item"]))
+    elif op == "edit":
+        orcamento.editar(registro["i"], item_de_linha(registro["item"]))
+    elif op == "del":
+        orcamento.remover(registro["i"])
+    elif op == "mov":
+        orcamento.trocar(registro["a"], registro["b"])
+    elif op == "campo":
+        if registro["k"] in campos:
+            campos[registro["k"]] = str(registro["v"])
+    elif op == "mao_obra":
+        orcamento.definir_mao_obra(Dinheiro(registro["v"]))
+    return orcamento
+
+
+def restaurar(caminho: str) -> Optional[Tuple[Dict[str, str], Orcamento]]:
+    """
+    Refaz a sessão gravada no diário. Devolve None se não houver diário
+    ou se a sessão estava vazia (nada a recuperar).
+    """
+    campos: Dict[str, str] = {campo: "" for campo in CAMPOS_CLIENTE}
+    orcamento = Orcamento()
+    try:
+        with open(caminho, "r", encoding="utf-8") as f:
+            for numero, texto in enumerate(f):
+                try:
+                    registro = json.loads(texto)
+                    if numero == 0 and registro.get("op") != "base":
+                        raise ValueError("Diário sem base")
+                    orcamento = _aplicar(registro, campos, orcamento)
+                except (ValueError, KeyError, IndexError, TypeError) as e:
+                    # Linha cortada ou inconsistente: fica o estado até a anterior
+                    logging.error(f"Diário de edição interrompido na linha {numero + 1}: {e}")
+                    break
+    except FileNotFoundError:
+        return None
+    except OSError as e:
+        logging.error(f"Erro ao ler diário de edição: {e}")
+        return None
+
+    if not orcamento and not orcamento.mao_obra and not any(campos.values()):
+        return None
+    return campos, orcamento
@@ -0,0 +1,207 @@
+"""
+Tipos de ponto fixo para dinheiro e quantidade.
+
+`Dinheiro` guarda centavos e `Quantidade` guarda milésimos, ambos como `int`:
+somas e subtrações são exatas e não há conversões repetidas entre Decimal,
+float e str espalhadas pelo código.
+
+Regras de arredondamento (sempre ROUND_HALF_UP, meio centavo para longe do zero):
+- valores de entrada são arredondados para o centavo (`Dinheiro.de_valor`);
+- quantidades de entrada são arredondadas para o milésimo (`Quantidade.de_valor`);
+- o total da linha (valor x quantidade) é arredondado para o centavo uma única
+  vez, e os totais do orçamento são a soma exata dos totais das linhas.
+
+Em disco (eurocar.arquivo) vão os próprios inteiros; `de_valor` continua
+aceitando os textos e números float dos arquivos antigos.
+"""
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from functools import total_ordering
+from typing import Optional, Union
+
+_CENTAVO = Decimal("0.01")
+_MILESIMO = Decimal("0.001")
+
+
+def _para_decimal(valor) -> Decimal:
+    if isinstance(valor, Decimal):
+        resultado = valor
+    elif isinstance(valor, str):
+        resultado = Decimal(valor.strip().replace(",", "."))
+    elif isinstance(valor, (int, float)) and not isinstance(valor, bool):
+        # str() evita carregar a imprecisão binária do float (0.1 -> 0.1000000000000000055...)
+        resultado = Decimal(str(valor))
+    else:
+        raise TypeError(f"Tipo não suportado: {type(valor).__name__}")
+    if not resultado.is_finite():
+        raise ValueError("Valor não finito")
+    return resultado
+
+
+def _texto_escalado(texto: str, casas: int) -> Optional[int]:
+    """Caminho rápido para texto simples ("1250.5", "-3"): inteiro escalado sem passar por Decimal"""
+    inteiro, _, fracao = texto.strip().replace(",", ".").partition(".")
+    negativo = inteiro.startswith("-")
+    if negativo:
+        inteiro = inteiro[1:]
+    if not (inteiro.isdecimal() and len(fracao) <= casas and (not fracao or fracao.isdecimal())):
+        return None
+    escalado = int(inteiro) * 10 ** casas + (int(fracao.ljust(casas, "0")) if fracao else 0)
+    return -escalado if negativo else escalado
+
+
+def _dividir_arredondando(numerador: int, divisor: int) -> int:
+    """Divisão inteira com ROUND_HALF_UP (divisor positivo)"""
+    quociente, resto = divmod(abs(numerador), divisor)
+    if resto * 2 >= divisor:
+        quociente += 1
+    return -quociente if numerador < 0 else quociente
+
+
+@total_ordering
+class Quantidade:
+    """Quantidade em milésimos (4,5 L de óleo = 4500)"""
+    __slots__ = ("milesimos",)
+
+    ESCALA = 1000
+
+    def __init__(self, milesimos: int = 0):
+        self.milesimos = int(milesimos)
+
+    @classmethod
+    def de_valor(cls, valor: Union["Quantidade", Decimal, int, float, str]) -> "Quantidade":
+        """Converte 2, 4.5, "4,5" ou Decimal; levanta ValueError se inválido"""
+        if isinstance(valor, Quantidade):
+            return valor
+        if type(valor) is int:
+            return cls(valor * cls.ESCALA)
+        if type(valor) is str:
+            escalado = _texto_escalado(valor, 3)
+            if escalado is not None:
+                return cls(escalado)
+        try:
+            decimal = _para_decimal(valor)
+        except InvalidOperation:
+            raise ValueError(f"Quantidade inválida: {valor!r}")
+        return cls(int(decimal.quantize(_MILESIMO, rounding=ROUND_HALF_UP).scaleb(3)))
+
+    @property
+    def inteira(self) -> bool:
+        return self.milesimos % self.ESCALA == 0
+
+    def para_decimal(self) -> Decimal:
+        if self.inteira:
+            return Decimal(self.milesimos // self.ESCALA)
+        return Decimal(self.milesimos).scaleb(-3).normalize()
+
+    def __str__(self) -> str:
+        """Formato de exibição: 2 ou 4,5"""
+        return str(self.para_decimal()).replace(".", ",")
+
+    def __repr__(self) -> str:
+        return f"Quantidade({self.milesimos})"
+
+    def __eq__(self, outro) -> bool:
+        if isinstance(outro, Quantidade):
+            return self.milesimos == outro.milesimos
+        return NotImplemented
+
+    def __lt__(self, outro) -> bool:
+        if isinstance(outro, Quantidade):
+            return self.milesimos < outro.milesimos
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(("Quantidade", self.milesimos))
+
+    def __bool__(self) -> bool:
+        return self.milesimos != 0
+
+
+@total_ordering
+class Dinheiro:
+    """Valor em centavos (R$ 1.250,50 = 125050)"""
+    __slots__ = ("centavos",)
+
+    def __init__(self, centavos: int = 0):
+        self.centavos = int(centavos)
+
+    @classmethod
+    def de_valor(cls, valor: Union["Dinheiro", Decimal, int, float, str]) -> "Dinheiro":
+        """
+        Converte um valor em reais (Decimal, int, float ou texto "1250.50").
+        Texto no formato brasileiro deve passar antes por moeda.converter_brl.
+        """
+        if isinstance(valor, Dinheiro):
+            return valor
+        if type(valor) is int:
+            return cls(valor * 100)
+        if type(valor) is str:
+            escalado = _texto_escalado(valor, 2)
+            if escalado is not None:
+                return cls(escalado)
+        try:
+            decimal = _para_decimal(valor)
+        except InvalidOperation:
+            raise ValueError(f"Valor inválido: {valor!r}")
+        return cls(int(decimal.quantize(_CENTAVO, rounding=ROUND_HALF_UP).scaleb(2)))
+
+    def para_decimal(self) -> Decimal:
+        return Decimal(self.centavos).scaleb(-2)
+
+    # ---------- Aritmética ----------
+    def __add__(self, outro: "Dinheiro") -> "Dinheiro":
+        if isinstance(outro, Dinheiro):
+            return Dinheiro(self.centavos + outro.centavos)
+        return NotImplemented
+
+    def __radd__(self, outro) -> "Dinheiro":
+        # Permite sum() com o início padrão 0
+        if outro == 0 and type(outro) is int:
+            return self
+        return NotImplemented
+
+    def __sub__(self, outro: "Dinheiro") -> "Dinheiro":
+        if isinstance(outro, Dinheiro):
+            return Dinheiro(self.centavos - outro.centavos)
+        return NotImplemented
+
+    def __neg__(self) -> "Dinheiro":
+        return Dinheiro(-self.centavos)
+
+    def __mul__(self, fator: Union[Quantidade, int]) -> "Dinheiro":
+        if isinstance(fator, Quantidade):
+            return Dinheiro(_dividir_arredondando(self.centavos * fator.milesimos, Quantidade.ESCALA))
+        if type(fator) is int:
+            return Dinheiro(self.centavos * fator)
+        return NotImplemented
+
+    __rmul__ = __mul__
+
+    # ---------- Comparação ----------
+    def __eq__(self, outro) -> bool:
+        if isinstance(outro, Dinheiro):
+            return self.centavos == outro.centavos
+        return NotImplemented
+
+    def __lt__(self, outro) -> bool:
+        if isinstance(outro, Dinheiro):
+            return self.centavos < outro.centavos
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(("Dinheiro", self.centavos))
+
+    def __bool__(self) -> bool:
+        return self.centavos != 0
+
+    def __str__(self) -> str:
+        """Formato de máquina, com ponto decimal (ex: 1250.50)"""
+        reais, centavos = divmod(abs(self.centavos), 100)
+        return f"{'-' if self.centavos < 0 else ''}{reais}.{centavos:02d}"
+
+    def __repr__(self) -> str:
+        return f"Dinheiro({self.centavos})"
+
+
+ZERO = Dinheiro(0)
+UM = Quantidade(Quantidade.ESCALA)
@@ -0,0 +1,186 @@
+"""
+Importação de itens a partir de CSV (listas de peças enviadas por fornecedores
+ou exportadas de planilhas).
+
+O arquivo é lido linha a linha com o módulo csv, sem carregar tudo na memória.
+Aceita `;`, `,` e tabulação como separador (detectado pela primeira linha) e
+valores nos formatos brasileiro e internacional ("1.250,50", "1250.50").
+Se a primeira linha for um cabeçalho reconhecido, as colunas são localizadas
+pelo nome; senão vale a ordem descrição, quantidade, valor unitário (ou só
+descrição e valor, com quantidade 1).
+
+Linhas inválidas não interrompem a importação: cada uma vira um `ErroLinha`
+com o número da linha no arquivo. Isso inclui linhas com colunas a mais: com
+`,` como separador, um valor brasileiro sem aspas (Filtro,1,35,90) chegaria
+partido em dois e seria importado como 35,00.
+"""
+import csv
+import logging
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+from eurocar.fixo import Quantidade
+from eurocar.moeda import converter_brl
+from eurocar.orcamento import Item
+from eurocar.sugestoes import normalizar
+
+SEPARADORES = (";", "\t", ",")
+AVISO_PROGRESSO = 500
+
+# Nomes de coluna aceitos no cabeçalho, já normalizados (minúsculas, sem acento)
+_NOMES_COLUNAS = {
+    "descricao": {"descricao", "produto", "peca", "item", "servico", "nome", "material"},
+    "quantidade": {"quantidade", "qtd", "qtde", "quant", "qt"},
+    "valor": {"valor", "valor unitario", "vl unit", "vlr unit", "vlr unitario", "preco",
+            "preco unitario", "unitario"},
+}
+
+
+class ErroLinha(NamedTuple):
+    linha: int
+    mensagem: str
+
+
+class ResultadoImportacao(NamedTuple):
+    itens: List[Item]
+    erros: List[ErroLinha]
+    linhas: int
+
+
+def detectar_separador(primeira_linha: str) -> str:
+    """O separador que divide a primeira linha em mais colunas (empate: ; antes de tab e ,)"""
+    melhor, colunas = SEPARADORES[0], 0
+    for separador in SEPARADORES:
+        campos = len(next(csv.reader([primeira_linha], delimiter=separador), []))
+        if campos > colunas:
+            melhor, colunas = separador, campos
+    return melhor
+
+
+def _colunas_do_cabecalho(linha: List[str]) -> Optional[Dict[str, int]]:
+    colunas = {}
+    for indice, texto in enumerate(linha):
+        nome = normalizar(texto).rstrip(".:")
+        for campo, nomes in _NOMES_COLUNAS.items():
+            if nome in nomes and campo not in colunas:
+                colunas[campo] = indice
+    if "descricao" in colunas and "valor" in colunas:
+        return colunas
+    return None
+
+
+def _colunas_por_posicao(linha: List[str]) -> Dict[str, int]:
+    if len(linha) >= 3:
+        return {"descricao": 0, "quantidade": 1, "valor": 2}
+    return {"descricao": 0, "valor": 1}
+
+
+def _largura(linha: List[str], colunas: Dict[str, int], cabecalho: bool, separador: str) -> int:
+    """Quantas colunas uma linha pode ter; além disso é erro (não se descarta nada em silêncio)"""
+    if cabecalho:
+        return len(linha)
+    if separador == ",":
+        # Sem cabeçalho, uma coluna a mais quase sempre é a vírgula de um valor sem aspas
+        return len(colunas)
+    return len(linha)
+
+
+def _conferir_largura(linha: List[str], largura: int, separador: str):
+    excesso = linha[largura:]
+    if any(campo.strip() for campo in excesso):
+        if separador == ",":
+            raise ValueError("valor com vírgula precisa estar entre aspas (ex: \"35,90\")")
+        raise ValueError(f"{len(linha)} colunas; o arquivo tem {largura}")
+
+
+def _campo(linha: List[str], colunas: Dict[str, int], campo: str) -> str:
+    indice = colunas.get(campo)
+    if indice is None or indice >= len(linha):
+        return ""
+    return linha[indice].strip()
+
+
+def _item_da_linha(linha: List[str], colunas: Dict[str, int]) -> Item:
+    descricao = _campo(linha, colunas, "descricao")
+    if not descricao:
+        raise ValueError("descrição vazia")
+
+    texto_quantidade = _campo(linha, colunas, "quantidade")
+    try:
+        quantidade = Quantidade.de_valor(converter_brl(texto_quantidade) if texto_quantidade else 1)
+    except (ValueError, ArithmeticError):
+        raise ValueError(f"quantidade inválida: {texto_quantidade!r}") from None
+    if quantidade.milesimos <= 0:
+        raise ValueError(f"quantidade deve ser maior que zero: {texto_quantidade!r}")
+
+    texto_valor = _campo(linha, colunas, "valor")
+    if not texto_valor:
+        raise ValueError("valor unitário vazio")
+    try:
+        valor = converter_brl(texto_valor)
+    except (ValueError, ArithmeticError):
+        raise ValueError(f"valor inválido: {texto_valor!r}") from None
+    return Item(descricao, quantidade, valor)
+
+
+def iterar_itens_csv(linhas: Iterator[str]) -> Iterator[Tuple[int, Union[Item, ErroLinha]]]:
+    """Percorre as linhas de texto do CSV devolvendo (número da linha, Item ou ErroLinha)"""
+    linhas = iter(linhas)
+    primeira = next(linhas, None)
+    if primeira is None:
+        return
+    separador = detectar_separador(primeira)
+
+    def _todas():
+        yield primeira
+        yield from linhas
+
+    leitor = csv.reader(_todas(), delimiter=separador)
+    colunas = None
+    largura = 0
+    for linha in leitor:
+        numero = leitor.line_num
+        if not any(campo.strip() for campo in linha):
+            continue
+        if colunas is None:
+            colunas = _colunas_do_cabecalho(linha)
+            if colunas is not None:
+                largura = _largura(linha, colunas, True, separador)
+                continue
+            colunas = _colunas_por_posicao(linha)
+            largura = _largura(linha, colunas, False, separador)
+        try:
+            _conferir_largura(linha, largura, separador)
+            yield numero, _item_da_linha(linha, colunas)
+        except ValueError as e:
+            yield numero, ErroLinha(numero, str(e))
+
+
+def _importar(caminho: str, codificacao: str,
+            progresso: Optional[Callable[[int], None]]) -> ResultadoImportacao:
+    itens: List[Item] = []
+    erros: List[ErroLinha] = []
+    numero = processadas = 0
+    # newline="" deixa o módulo csv tratar quebras de linha dentro de aspas
+    with open(caminho, "r", encoding=codificacao, newline="") as f:
+        for numero, resultado in iterar_itens_csv(f):
+            if isinstance(resultado, ErroLinha):
+                erros.append(resultado)
+            else:
+                itens.append(resultado)
+            processadas += 1
+            if progresso is not None and processadas % AVISO_PROGRESSO == 0:
+                progresso(numero)
+    return ResultadoImportacao(itens, erros, numero)
+
+
+def importar_csv(caminho: str, progresso: Optional[Callable[[int], None]] = None) -> ResultadoImportacao:
+    """
+    Lê os itens de um CSV. `progresso` recebe o número da linha atual a cada
+    AVISO_PROGRESSO linhas (a importação roda fora da thread da janela).
+    """
+    try:
+        return _importar(caminho, "utf-8-sig", progresso)
+    except UnicodeDecodeError:
+        # Planilhas salvas pelo Excel em português costumam vir em Windows-1252
+        logging.info(f"{caminho} não está em UTF-8; lendo como Windows-1252")
+        return _importar(caminho, "cp1252", progresso)
@@ -0,0 +1,122 @@
+"""
+Geração em lote: regera os PDFs de vários orçamentos salvos, em paralelo,
+sem abrir a interface (python main.py --lote ...).
+"""
+import os
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from eurocar.arquivo import EXTENSAO, EXTENSAO_COMPACTA, e_arquivo_orcamento, ler_orcamento, nome_base
+from eurocar.config import ConfigManager, configurar_logging
+
+
+def coletar_arquivos_lote(alvos: List[str]) -> List[str]:
+    """Expande pastas e padrões glob em uma lista ordenada de orçamentos (.json / .json.gz)"""
+    import glob
+
+    arquivos = []
+    for alvo in alvos:
+        if os.path.isdir(alvo):
+            arquivos.extend(glob.glob(os.path.join(alvo, "*" + EXTENSAO)))
+            arquivos.extend(glob.glob(os.path.join(alvo, "*" + EXTENSAO_COMPACTA)))
+        else:
+            arquivos.extend(glob.glob(alvo))
+    # Remove duplicados mantendo uma ordem estável
+    return sorted(set(os.path.abspath(a) for a in arquivos if e_arquivo_orcamento(a)))
+
+
+def _renderizar_arquivo_lote(caminho_json: str, pasta_saida: str, compacto: bool = False) -> Tuple[str, bool, str]:
+    """Renderiza um único orçamento salvo (executado nos processos do pool)"""
+    from eurocar.pdf import criar_pdf
+
+    try:
+        dados, orcamento = ler_orcamento(caminho_json)
+
+        # O PDF herda o nome do JSON para não colidir entre orçamentos do mesmo dia
+        caminho_pdf = os.path.join(pasta_saida, nome_base(caminho_json) + ".pdf")
+
+        pdf = criar_pdf(dados, orcamento, compacto)
+        pdf.output(caminho_pdf)
+        return caminho_json, True, caminho_pdf
+    except Exception as e:
+        return caminho_json, False, f"{type(e).__name__}: {e}"
+
+
+def renderizar_lote(arquivos: List[str], pasta_saida: str, workers: Optional[int] = None,
+                    progresso=None, compacto: bool = False) -> List[Tuple[str, bool, str]]:
+    """
+    Renderiza vários orçamentos em paralelo usando um pool de processos.
+
+    Se um processo do pool morrer (falta de memória, sinal), os arquivos que
+    ainda não tinham terminado entram no resultado como falha; os já gerados
+    são mantidos.
+    """
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    os.makedirs(pasta_saida, exist_ok=True)
+    resultados = []
+    total = len(arquivos)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futuros = {pool.submit(_renderizar_arquivo_lote, caminho, pasta_saida, compacto): caminho
+                for caminho in arquivos}
+        for concluidos, futuro in enumerate(as_completed(futuros), 1):
+            try:
+                resultado = futuro.result()
+            except Exception as e:
+                # BrokenProcessPool inclusive: o lote continua e o resumo sai completo
+                resultado = (futuros[futuro], False, f"{type(e).__name__}: {e}")
+            resultados.append(resultado)
+            if progresso:
+                progresso(concluidos, total, resultado)
+
+    # Devolve na mesma ordem da entrada para o resumo ficar previsível
+    ordem = {caminho: idx for idx, caminho in enumerate(arquivos)}
+    resultados.sort(key=lambda r: ordem[r[0]])
+    return resultados
+
+
+def executar_lote_cli(argv: List[str]) -> int:
+    """Modo de linha de comando: python main.py --lote <pasta|glob> [...]"""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="main.py --lote",
+        description="Gera os PDFs de vários orçamentos editáveis (.json) sem abrir a interface.")
+    parser.add_argument("alvos", nargs="+", help="Pastas ou padrões glob com arquivos .json")
+    parser.add_argument("-o", "--saida", help="Pasta de destino dos PDFs (padrão: pasta de PDFs configurada)")
+    parser.add_argument("-w", "--workers", type=int, default=None,
+                        help="Número de processos (padrão: número de núcleos)")
+    parser.add_argument("-c", "--compacto", action="store_true", default=None,
+                        help="PDFs compactos (padrão: conforme a configuração do app)")
+    args = parser.parse_args(argv)
+    configurar_logging()
+
+    arquivos = coletar_arquivos_lote(args.alvos)
+    if not arquivos:
+        print("Nenhum arquivo .json encontrado.")
+        return 1
+
+    pasta_saida = args.saida or ConfigManager().get("paths", "orcamentos_pdf")
+    compacto = args.compacto if args.compacto is not None else bool(ConfigManager().get("arquivos", "pdf_compacto"))
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers deve ser maior que zero")
+
+    def progresso(concluidos, total, resultado):
+        caminho, ok, _ = resultado
+        status = "OK  " if ok else "ERRO"
+        print(f"[{concluidos}/{total}] {status} {os.path.basename(caminho)}", flush=True)
+
+    inicio = datetime.now()
+    resultados = renderizar_lote(arquivos, pasta_saida, workers=args.workers, progresso=progresso,
+                                compacto=compacto)
+    duracao = (datetime.now() - inicio).total_seconds()
+
+    falhas = [r for r in resultados if not r[1]]
+    print()
+    print(f"Concluído em {duracao:.1f}s: {len(resultados) - len(falhas)} gerado(s), {len(falhas)} com erro.")
+    print(f"PDFs em: {pasta_saida}")
+    for caminho, _, erro in falhas:
+        print(f"  ✗ {os.path.basename(caminho)}: {erro}")
+
+    return 1 if falhas else 0
@@ -0,0 +1,145 @@
+"""
+Formatação e leitura de valores em Real (R$) sem depender de `locale`.
+
+Tudo aqui é puro e sem estado compartilhado mutável (além dos caches do
+`functools.lru_cache`, que são thread-safe), então pode ser usado de threads
+de renderização e de processos do pool em lote sem afetar o resto do programa.
+"""
+import re
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from functools import lru_cache
+
+from eurocar.fixo import Dinheiro
+
+CENTAVO = Decimal("0.01")
+ZERO = Decimal("0.00")
+SIMBOLO = "R$"
+
+_RE_NUMERO = re.compile(r"^\d+(\.\d+)?$")
+
+# Valores de orçamento se repetem muito (preços de tabela, totais redesenhados
+# na tela, na pré-visualização e no PDF), então os resultados ficam em cache.
+_TAMANHO_CACHE = 4096
+
+
+def _formatar(valor) -> str:
+    if isinstance(valor, Dinheiro):
+        # Centavos inteiros: formata sem passar por Decimal
+        reais, centavos = divmod(abs(valor.centavos), 100)
+        texto = f"{'-' if valor.centavos < 0 else ''}{reais:,}.{centavos:02d}"
+    else:
+        if not isinstance(valor, Decimal):
+            valor = Decimal(valor)
+        if not valor.is_finite():
+            raise ValueError("Valor não finito")
+        texto = f"{valor.quantize(CENTAVO, rounding=ROUND_HALF_UP):,.2f}"
+    # Troca feita à mão em vez de locale.setlocale, que é global ao processo
+    return texto.replace(",", "_").replace(".", ",").replace("_", ".")
+
+
+def _formatar_seguro(valor, prefixo: str) -> str:
+    try:
+        return prefixo + _formatar(valor)
+    except (InvalidOperation, ValueError, TypeError, ArithmeticError):
+        return prefixo + "0,00"
+
+
+@lru_cache(maxsize=_TAMANHO_CACHE)
+def _formatar_valor_cacheado(valor) -> str:
+    return _formatar_seguro(valor, "")
+
+
+@lru_cache(maxsize=_TAMANHO_CACHE)
+def _formatar_brl_cacheado(valor) -> str:
+    return _formatar_seguro(valor, SIMBOLO + " ")
+
+
+def formatar_valor(valor) -> str:
+    """Formata no padrão brasileiro sem o símbolo (ex: 1.250,50); inválido vira 0,00"""
+    try:
+        return _formatar_valor_cacheado(valor)
+    except TypeError:
+        # Tipos não hasheáveis não passam pelo cache
+        return _formatar_seguro(valor, "")
+
+
+def formatar_brl(valor) -> str:
+    """Formata como moeda (ex: R$ 1.250,50); inválido vira R$ 0,00"""
+    try:
+        return _formatar_brl_cacheado(valor)
+    except TypeError:
+        return _formatar_seguro(valor, SIMBOLO + " ")
+
+
+def _milhar_valido(parte: str, separador: str) -> bool:
+    """Grupos de milhar bem formados: 1.250.000 sim, 1.2.3 ou 12.34 não"""
+    grupos = parte.split(separador)
+    return 1 <= len(grupos[0]) <= 3 and all(len(grupo) == 3 for grupo in grupos[1:])
+
+
+def _sem_milhar(parte: str, separador: str) -> str:
+    if not _milhar_valido(parte, separador):
+        raise ValueError("Separador de milhar fora de posição")
+    return parte.replace(separador, "")
+
+
+@lru_cache(maxsize=_TAMANHO_CACHE)
+def _converter_texto(texto: str) -> Decimal:
+    # Caminho rápido para o formato digitado no balcão: 1.250,50 / 150,5 / 150
+    if texto.isdecimal():
+        return Decimal(texto)
+    virgula = texto.find(",")
+    if virgula > 0 and texto.rfind(".") < virgula:
+        inteiro, fracao = texto[:virgula], texto[virgula + 1:]
+        if "." in inteiro and _milhar_valido(inteiro, "."):
+            inteiro = inteiro.replace(".", "")
+        if inteiro.isdecimal() and fracao.isdecimal():
+            return Decimal(inteiro + "." + fracao)
+
+    limpo = (texto.replace(SIMBOLO, "").replace("\xa0", "").replace(" ", "").strip())
+    if not limpo:
+        return ZERO
+
+    negativo = False
+    if limpo.startswith("(") and limpo.endswith(")"):
+        negativo, limpo = True, limpo[1:-1]
+    if limpo[:1] in "+-":
+        negativo, limpo = limpo[0] == "-", limpo[1:]
+
+    virgula, ponto = limpo.rfind(","), limpo.rfind(".")
+    if virgula >= 0 and ponto >= 0:
+        # O separador que aparece por último é o decimal: 1.250,50 ou 1,250.50
+        milhar, posicao = (".", virgula) if virgula > ponto else (",", ponto)
+        limpo = _sem_milhar(limpo[:posicao], milhar) + "." + limpo[posicao + 1:]
+    elif virgula >= 0:
+        # Só vírgula: decimal (150,5); várias vírgulas indicam milhar (1,250,000)
+        limpo = _sem_milhar(limpo, ",") if limpo.count(",") > 1 else limpo.replace(",", ".")
+    elif ponto >= 0:
+        # Só ponto: vários pontos indicam milhar (1.250.000); um só, com exatamente
+        # 3 dígitos depois e grupo válido antes, também (1.250); senão é decimal
+        if limpo.count(".") > 1:
+            limpo = _sem_milhar(limpo, ".")
+        elif _milhar_valido(limpo, ".") and len(limpo) - ponto - 1 == 3:
+            limpo = limpo.replace(".", "")
+
+    if not _RE_NUMERO.match(limpo):
+        raise ValueError("Formato de valor inválido")
+
+    resultado = Decimal(limpo)
+    return -resultado if negativo else resultado
+
+
+def converter_brl(valor) -> Decimal:
+    """
+    Converte texto digitado para Decimal aceitando os formatos usuais:
+    1.250,50 | 1250,50 | 1250.50 | 1,250.50 | R$ 1.250,50 | -10,00
+    """
+    if type(valor) is str:
+        return _converter_texto(valor)
+    if valor is None:
+        return ZERO
+    if isinstance(valor, Decimal):
+        return valor
+    if isinstance(valor, (int, float)):
+        return Decimal(str(valor))
+    return _converter_texto(str(valor))
@@ -0,0 +1,36 @@
+"""
+Núcleo do sistema, sem interface gráfica: modelo do orçamento, moeda, PDF e
+persistência, para scripts e serviços que não abrem janela.
+
+    from eurocar.nucleo import Item, Orcamento, formatar_brl, renderizar_pdf
+
+Importar este módulo não carrega FreeSimpleGUI nem Tk (nem precisa de tela);
+o fpdf só é carregado no primeiro uso de criar_pdf / renderizar_pdf / CachePDF.
+A janela (main.py) usa estes mesmos módulos.
+"""
+from eurocar.arquivo import gravar_orcamento, ler_orcamento, orcamento_de_conteudo
+from eurocar.config import ConfigManager, configurar_logging, pasta_config, pasta_logs
+from eurocar.fixo import Dinheiro, Quantidade
+from eurocar.moeda import converter_brl, formatar_brl, formatar_valor
+from eurocar.orcamento import Item, Orcamento
+from eurocar.persistencia import montar_caminho_pdf, salvar_orcamento_editavel
+
+_NOMES_PDF = ("criar_pdf", "renderizar_pdf", "CachePDF")
+
+__all__ = [
+    "Item", "Orcamento", "Dinheiro", "Quantidade",
+    "formatar_brl", "formatar_valor", "converter_brl",
+    "gravar_orcamento", "ler_orcamento", "orcamento_de_conteudo",
+    "ConfigManager", "configurar_logging", "pasta_config", "pasta_logs",
+    "montar_caminho_pdf", "salvar_orcamento_editavel",
+    *_NOMES_PDF,
+]
+
+
+def __getattr__(nome: str):
+    # O renderizador (e o fpdf junto) só é importado quando alguém o usa
+    if nome in _NOMES_PDF:
+        from eurocar import pdf
+
+        return getattr(pdf, nome)
+    raise AttributeError(f"module {__name__!r} has no attribute {nome!r}")
@@ -0,0 +1,136 @@
+"""
+Modelo do orçamento em edição.
+
+Mantém os totais (peças, mão de obra e geral) atualizados de forma
+incremental: cada inclusão, edição ou remoção ajusta o total em O(1), sem
+somar a lista inteira de novo. A interface, a pré-visualização e o PDF leem
+os mesmos valores daqui, então os três nunca divergem.
+
+Cada linha é um `Item` com `__slots__`: quantidade e valor são validados e
+convertidos uma única vez, e o total da linha fica calculado no próprio item.
+Valores e quantidades usam os tipos de ponto fixo de `eurocar.fixo`.
+"""
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+from eurocar.fixo import ZERO, Dinheiro, Quantidade
+
+
+def _dinheiro_ou_zero(valor) -> Dinheiro:
+    try:
+        return Dinheiro.de_valor(valor)
+    except (ValueError, TypeError, ArithmeticError):
+        return ZERO
+
+
+class Item:
+    """
+    Linha do orçamento. Tratada como imutável: para alterar, crie outro Item
+    (é o que Orcamento.editar faz), assim caches baseados no item continuam válidos.
+
+    Igualdade e hash são por identidade (padrão do Python): dois itens com o
+    mesmo conteúdo continuam sendo linhas diferentes, e o item pode ser chave
+    de dicionário (cache de células da tabela em main.py). Para comparar
+    conteúdo, compare (descricao, quantidade, valor).
+    """
+    __slots__ = ("descricao", "quantidade", "valor", "total")
+
+    def __init__(self, descricao: str, quantidade, valor):
+        self.descricao = str(descricao)
+        self.quantidade = Quantidade.de_valor(quantidade)
+        self.valor = Dinheiro.de_valor(valor)
+        self.total = self.valor * self.quantidade
+
+    @classmethod
+    def de_dict(cls, dados: Dict[str, Any]) -> "Item":
+        """Converte o formato {descricao, quantidade, valor} (formulário ou JSON)"""
+        return cls(dados.get("descricao", ""), dados.get("quantidade", 1), dados.get("valor", 0))
+
+    def __repr__(self) -> str:
+        return f"Item({self.descricao!r}, {self.quantidade!r}, {self.valor!r})"
+
+
+def como_item(item: Union[Item, Dict[str, Any]]) -> Item:
+    return item if isinstance(item, Item) else Item.de_dict(item)
+
+
+class Orcamento:
+    """Lista de itens com totais mantidos incrementalmente"""
+
+    def __init__(self, itens: Optional[List[Union[Item, Dict[str, Any]]]] = None, mao_obra=ZERO):
+        self._itens: List[Item] = []
+        self.total_pecas = ZERO
+        self.mao_obra = _dinheiro_ou_zero(mao_obra)
+        for item in itens or []:
+            self.adicionar(item)
+
+    @classmethod
+    def de_dados(cls, dados: Dict[str, Any]) -> "Orcamento":
+        """Monta o modelo a partir do dicionário salvo em JSON (itens inválidos são ignorados)"""
+        orcamento = cls(mao_obra=dados.get("mao_obra", 0))
+        for item in dados.get("itens", []):
+            try:
+                orcamento.adicionar(item)
+            except (ValueError, TypeError, AttributeError, ArithmeticError):
+                continue
+        return orcamento
+
+    # ---------- Leitura ----------
+    @property
+    def itens(self) -> List[Item]:
+        return self._itens
+
+    @property
+    def total_geral(self) -> Dinheiro:
+        return self.total_pecas + self.mao_obra
+
+    def total_item(self, indice: int) -> Dinheiro:
+        return self._itens[indice].total
+
+    def __len__(self) -> int:
+        return len(self._itens)
+
+    def __bool__(self) -> bool:
+        return bool(self._itens)
+
+    def __iter__(self) -> Iterator[Item]:
+        return iter(self._itens)
+
+    def __getitem__(self, indice: int) -> Item:
+        return self._itens[indice]
+
+    # ---------- Alterações ----------
+    def adicionar(self, item: Union[Item, Dict[str, Any]]) -> int:
+        """Inclui um item no final e devolve seu índice"""
+        item = como_item(item)
+        self._itens.append(item)
+        self.total_pecas += item.total
+        return len(self._itens) - 1
+
+    def editar(self, indice: int, item: Union[Item, Dict[str, Any]]):
+        item = como_item(item)
+        self.total_pecas += item.total - self._itens[indice].total
+        self._itens[indice] = item
+
+    def remover(self, indice: int) -> Item:
+        item = self._itens.pop(indice)
+        self.total_pecas -= item.total
+        return item
+
+    def trocar(self, a: int, b: int):
+        """Troca dois itens de posição (os totais não mudam)"""
+        self._itens[a], self._itens[b] = self._itens[b], self._itens[a]
+
+    def copiar(self) -> "Orcamento":
+        """Cópia independente (ex: para renderizar em outra thread enquanto a edição continua)"""
+        copia = Orcamento(mao_obra=self.mao_obra)
+        # Os itens nunca são alterados no lugar, então basta copiar a lista
+        copia._itens = list(self._itens)
+        copia.total_pecas = self.total_pecas
+        return copia
+
+    def definir_mao_obra(self, valor):
+        self.mao_obra = _dinheiro_ou_zero(valor)
+
+    def limpar(self):
+        self._itens.clear()
+        self.total_pecas = ZERO
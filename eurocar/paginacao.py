@@ -0,0 +1,116 @@
+"""
+Diagramação da tabela de itens do PDF.
+
+Duas etapas, ambas lineares no número de itens:
+
+  1. `quebrar_linhas` divide cada descrição nas linhas que cabem na coluna,
+     medindo cada palavra uma vez (quem chama passa uma medida com cache);
+  2. `planejar_paginas` percorre as alturas das linhas da tabela uma única vez
+     e decide a página e a posição vertical de cada uma, reservando o
+     cabeçalho da tabela em todas as páginas e o bloco de totais inteiro.
+
+Não depende do fpdf: as medidas (mm) vêm de quem desenha (eurocar.pdf).
+"""
+from typing import Callable, List, NamedTuple, Sequence, Tuple
+
+RETICENCIAS = "..."
+
+
+def _partir_palavra(palavra: str, largura: float, medir: Callable[[str], float]) -> List[str]:
+    """Divide, letra a letra, uma palavra mais larga que a coluna (ex: códigos de peça)"""
+    pedacos, atual, largura_atual = [], "", 0.0
+    for letra in palavra:
+        w = medir(letra)
+        if atual and largura_atual + w > largura:
+            pedacos.append(atual)
+            atual, largura_atual = "", 0.0
+        atual += letra
+        largura_atual += w
+    pedacos.append(atual)
+    return pedacos
+
+
+def _encurtar(linha: str, largura: float, medir: Callable[[str], float]) -> str:
+    while linha and medir(linha + RETICENCIAS) > largura:
+        linha = linha[:-1]
+    return linha.rstrip() + RETICENCIAS
+
+
+def quebrar_linhas(texto: str, largura: float, medir: Callable[[str], float],
+                maximo_linhas: int = 0) -> List[str]:
+    """
+    Linhas do texto que cabem em `largura`, quebrando entre palavras.
+
+    `medir(texto)` devolve a largura impressa (mm) na fonte atual. Com
+    `maximo_linhas`, o excesso é cortado e a última linha termina em "...".
+    """
+    if "\n" not in texto and medir(texto) <= largura:
+        return [texto]
+
+    palavras = texto.split()
+    if not palavras:
+        return [""]
+    espaco = medir(" ")
+    linhas: List[str] = []
+    atual: List[str] = []
+    largura_atual = 0.0
+    for palavra in palavras:
+        w = medir(palavra)
+        if w > largura:
+            if atual:
+                linhas.append(" ".join(atual))
+            *inteiros, resto = _partir_palavra(palavra, largura, medir)
+            linhas.extend(inteiros)
+            atual, largura_atual = [resto], medir(resto)
+        elif atual and largura_atual + espaco + w > largura:
+            linhas.append(" ".join(atual))
+            atual, largura_atual = [palavra], w
+        else:
+            largura_atual += w + (espaco if atual else 0.0)
+            atual.append(palavra)
+    if atual:
+        linhas.append(" ".join(atual))
+
+    if maximo_linhas and len(linhas) > maximo_linhas:
+        linhas = linhas[:maximo_linhas]
+        linhas[-1] = _encurtar(linhas[-1], largura, medir)
+    return linhas
+
+
+class Plano(NamedTuple):
+    # (página, y) de cada linha da tabela, na ordem dos itens; páginas contadas a partir de 0
+    posicoes: List[Tuple[int, float]]
+    pagina_totais: int
+    y_totais: float
+
+    @property
+    def paginas(self) -> int:
+        return self.pagina_totais + 1
+
+
+def planejar_paginas(alturas: Sequence[float], y_inicial: float, y_topo: float, y_limite: float,
+                    altura_cabecalho: float, y_totais: float) -> Plano:
+    """
+    Distribui as linhas da tabela pelas páginas.
+
+    - A primeira página começa em `y_inicial` (abaixo dos dados do cliente) e
+      as seguintes em `y_topo`; em todas, o cabeçalho da tabela vem antes.
+    - Uma linha nunca é dividida: se não cabe até `y_limite`, vai inteira para
+      a próxima página (uma linha maior que a página inteira fica sozinha nela).
+    - O bloco de totais começa em `y_totais` (rodapé da última página); se a
+      última linha passar desse ponto, ele vai inteiro para uma página nova.
+    """
+    posicoes: List[Tuple[int, float]] = []
+    inicio_pagina = y_topo + altura_cabecalho
+    pagina, y = 0, y_inicial + altura_cabecalho
+    for altura in alturas:
+        # Já no topo de uma página nova, trocar de página não ajudaria
+        if y + altura > y_limite and y > inicio_pagina:
+            pagina += 1
+            y = inicio_pagina
+        posicoes.append((pagina, y))
+        y += altura
+
+    if y > y_totais:
+        pagina += 1
+    return Plano(posicoes, pagina, y_totais)
@@ -0,0 +1,502 @@
+"""
+Renderização do orçamento em PDF (fpdf2).
+
+Separado da interface para que o fpdf só seja carregado quando um PDF for
+realmente gerado, e para poder ser usado sem Tk (ex: geração em lote).
+"""
+import copy
+import io
+import logging
+import os
+import sys
+import threading
+from collections import OrderedDict
+from datetime import date, datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Hashable, Optional, Tuple, Union
+
+from fontTools import ttLib
+from fpdf import FPDF, FPDF_VERSION, XPos, YPos
+from fpdf.fonts import SubsetMap, TTFFont
+
+from eurocar.moeda import formatar_brl
+from eurocar.orcamento import Orcamento
+from eurocar.paginacao import planejar_paginas, quebrar_linhas
+from eurocar.telemetria import medir
+
+
+# ========== CONTEXTO DE RENDERIZAÇÃO ==========
+MESES = ('Janeiro', 'Fevereiro', 'Março', 'Abril', 'Maio', 'Junho', 'Julho',
+        'Agosto', 'Setembro', 'Outubro', 'Novembro', 'Dezembro')
+DIAS_SEMANA = ('Segunda-feira', 'Terça-feira', 'Quarta-feira',
+            'Quinta-feira', 'Sexta-feira', 'Sábado', 'Domingo')
+
+# Fontes Unicode embutidas (assets/fonts). Sem elas, o PDF volta às fontes
+# padrão do formato, que só têm os caracteres do Windows-1252.
+FAMILIA_TTF = "DejaVu"
+FAMILIA_PADRAO = "Helvetica"
+ARQUIVOS_FONTES = {"": "DejaVuSans.ttf", "B": "DejaVuSans-Bold.ttf"}
+
+# Os caches entre documentos (fonte interpretada, imagem decodificada) usam
+# estruturas internas do fpdf2 conferidas na série 2.8 (ver requirements.txt).
+# Em outra versão, tudo passa pela API pública: mais lento, mas correto.
+FPDF_INTERNO_COMPATIVEL = FPDF_VERSION.split(".")[:2] == ["2", "8"]
+
+# Modo compacto (arquivos para WhatsApp): logo reduzida à resolução de impressão
+# na maior largura em que é desenhada, sem transparência e com paleta de cores
+DPI_LOGO_COMPACTO = 150
+LARGURA_LOGO_MM = 45
+CORES_LOGO_COMPACTO = 64
+
+# Depois da célula, volta à margem esquerda na linha seguinte (o antigo ln=1 do
+# fpdf, que emite um aviso de obsolescência a cada chamada)
+PROXIMA_LINHA = {"new_x": XPos.LMARGIN, "new_y": YPos.NEXT}
+
+# Bloco da empresa na primeira página: (texto, tamanho da fonte, estilo, altura da linha)
+CABECALHO_EMPRESA = (
+    ("EUROCAR", 17, 'B', 10),
+    ('CNPJ: 59.152.856/0001-25', 10, '', 6),
+    ('Vitaliano Pereira Serpa', 10, '', 6),
+    ('Rua Juíz de Fora, 12 - Qd 98 - Jardim Guanabara', 10, '', 6),
+    ('Contato: (62) 9 9415-9037', 10, '', 6),
+)
+
+# Tabela de itens (mm)
+LARGURAS_COLUNAS = (10, 100, 15, 27, 38)
+ALTURA_CABECALHO_TABELA = 10
+ALTURA_LINHA_TEXTO = 6  # cada linha da descrição
+MARGEM_ITEM = 2  # acima e abaixo do texto: item de uma linha ocupa 10 mm
+Y_CONTEUDO_DEMAIS = 25  # início do conteúdo nas páginas 2 em diante, abaixo da logo
+RECUO_TOTAIS = 60  # o bloco de totais começa a 60 mm do fim da última página
+
+
+def formatar_data_extenso(momento: datetime) -> str:
+    """Ex: Sexta-feira, 5 de Julho de 2024"""
+    return f"{DIAS_SEMANA[momento.weekday()]}, {momento.day} de {MESES[momento.month - 1]} de {momento.year}"
+
+
+class ContextoRenderizacao:
+    """
+    Recursos que não mudam entre documentos: caminho da logo (resolvido uma vez)
+    e a imagem já decodificada pelo fpdf, reaproveitada por todos os PDFs do processo.
+
+    No modo compacto a logo é reduzida uma vez (Pillow) e a versão reduzida
+    também fica guardada para todos os documentos.
+
+    O mesmo vale para as fontes TTF: as métricas (larguras, mapa de caracteres)
+    são lidas do arquivo uma vez; cada documento recebe uma cópia leve, com o
+    próprio conjunto de caracteres usados para o subconjunto embutido no PDF.
+    """
+
+    def __init__(self):
+        if getattr(sys, 'frozen', False):
+            # Se estiver rodando como executável compilado
+            base_path = sys._MEIPASS
+        else:
+            # Se estiver rodando no código fonte (desenvolvimento): raiz do projeto
+            base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+        self.logo_path = os.path.join(base_path, 'assets', 'LOGO_Preta.png')
+        self.logo_existe = os.path.exists(self.logo_path)
+        if not self.logo_existe:
+            logging.warning(f"Arquivo de logo não encontrado em {self.logo_path}")
+
+        self.caminhos_fontes = {estilo: os.path.join(base_path, 'assets', 'fonts', nome)
+                                for estilo, nome in ARQUIVOS_FONTES.items()}
+        self.fontes_existem = all(os.path.exists(c) for c in self.caminhos_fontes.values())
+        if not self.fontes_existem:
+            logging.warning(f"Fontes não encontradas em {os.path.join(base_path, 'assets', 'fonts')}; "
+                            "usando as fontes padrão do PDF")
+
+        self._logo_info = None
+        self._logo_compacta_info = None
+        self._logo_compacta_falhou = False
+        self._fontes: Dict[str, Tuple[TTFFont, bytes]] = {}
+        self._lock = threading.Lock()
+
+    def _fonte_modelo(self, pdf: FPDF, estilo: str) -> Tuple[TTFFont, bytes]:
+        """Fonte já interpretada (feito uma vez por processo) e o conteúdo do arquivo"""
+        modelo = self._fontes.get(estilo)
+        if modelo is None:
+            with self._lock:
+                modelo = self._fontes.get(estilo)
+                if modelo is None:
+                    caminho = self.caminhos_fontes[estilo]
+                    with open(caminho, "rb") as f:
+                        dados = f.read()
+                    fonte = TTFFont(pdf, Path(caminho), f"{FAMILIA_TTF.lower()}{estilo}", estilo)
+                    modelo = self._fontes[estilo] = (fonte, dados)
+        return modelo
+
+    def preparar_fontes(self, pdf: FPDF) -> str:
+        """Registra as fontes TTF no documento e devolve a família a usar"""
+        if not self.fontes_existem:
+            return FAMILIA_PADRAO
+        try:
+            for estilo, caminho in self.caminhos_fontes.items():
+                if not FPDF_INTERNO_COMPATIVEL:
+                    pdf.add_font(FAMILIA_TTF, estilo, caminho)
+                    continue
+                modelo, dados = self._fonte_modelo(pdf, estilo)
+                # Métricas compartilhadas (só leitura: cw, desc, glyph_ids, scale...).
+                # Tudo que o fpdf 2.8 altera durante o documento precisa ser novo na
+                # cópia, senão vaza entre PDFs: i (número da fonte no documento),
+                # ttfont (reduzido no output), subset (caracteres usados),
+                # missing_glyphs, biggest_size_pt e _hbfont (shaping do HarfBuzz).
+                # Ao subir a versão do fpdf2, conferir esta lista em fpdf/fonts.py.
+                fonte = copy.copy(modelo)
+                fonte.i = len(pdf.fonts) + 1
+                # O fpdf reduz a fonte aos caracteres usados na hora de gravar, alterando
+                # o objeto: cada documento abre a sua, a partir dos bytes já em memória
+                fonte.ttfont = ttLib.TTFont(io.BytesIO(dados), recalcTimestamp=False, lazy=True)
+                fonte.subset = SubsetMap(fonte)
+                fonte.missing_glyphs = []
+                fonte.biggest_size_pt = 0
+                fonte._hbfont = None
+                pdf.fonts[fonte.fontkey] = fonte
+        except Exception as e:
+            logging.error(f"Erro ao carregar as fontes TTF: {e}")
+            self.fontes_existem = False
+            return FAMILIA_PADRAO
+        return FAMILIA_TTF
+
+    def _reduzir_logo(self):
+        """Logo sobre fundo branco, na largura de DPI_LOGO_COMPACTO e com paleta de cores"""
+        from PIL import Image
+
+        with Image.open(self.logo_path) as original:
+            imagem = original.convert("RGBA")
+        # A página é branca: achatar a transparência dispensa a máscara (SMask) no PDF
+        fundo = Image.new("RGBA", imagem.size, "white")
+        fundo.alpha_composite(imagem)
+        imagem = fundo.convert("RGB")
+
+        largura = round(LARGURA_LOGO_MM / 25.4 * DPI_LOGO_COMPACTO)
+        if imagem.width > largura:
+            altura = max(1, round(imagem.height * largura / imagem.width))
+            imagem = imagem.resize((largura, altura), Image.LANCZOS)
+        # Logo tem poucas cores: paleta indexada em vez de 3 bytes por pixel
+        imagem = imagem.quantize(colors=CORES_LOGO_COMPACTO, method=Image.Quantize.MEDIANCUT)
+        if not FPDF_INTERNO_COMPATIVEL:
+            return imagem, None
+        from fpdf.image_parsing import get_img_info
+
+        return imagem, get_img_info(self.chave_logo_compacta, imagem, "FlateDecode")
+
+    @property
+    def chave_logo_compacta(self) -> str:
+        return f"{self.logo_path}#compacta"
+
+    def _logo_compacta(self):
+        """(imagem reduzida, imagem decodificada pelo fpdf ou None fora do fpdf 2.8) ou None"""
+        if self._logo_compacta_info is None and not self._logo_compacta_falhou:
+            with self._lock:
+                if self._logo_compacta_info is None and not self._logo_compacta_falhou:
+                    try:
+                        self._logo_compacta_info = self._reduzir_logo()
+                    except Exception as e:
+                        logging.error(f"Erro ao reduzir a logo para o PDF compacto: {e}")
+                        self._logo_compacta_falhou = True
+        return self._logo_compacta_info
+
+    @staticmethod
+    def _inserir_imagem(pdf: FPDF, chave: str, info) -> bool:
+        """
+        Põe uma imagem já decodificada no cache do documento (pdf.image_cache,
+        interno do fpdf 2.8: dicionário nome -> ImageInfo, com "i" sendo a
+        ordem da imagem no documento e "usages" as vezes em que foi desenhada).
+        Falso se não foi possível; aí a imagem segue pelo pdf.image() normal.
+        """
+        if info is None or not FPDF_INTERNO_COMPATIVEL:
+            return False
+        info = type(info)(info)
+        info["i"] = len(pdf.image_cache.images) + 1
+        info["usages"] = 0
+        pdf.image_cache.images[chave] = info
+        return True
+
+    def preparar_logo(self, pdf: FPDF, compacto: bool = False) -> Union[str, Any]:
+        """
+        Devolve o que passar para pdf.image(): o nome da logo, já colocada
+        decodificada no cache de imagens do documento (desenhada em todas as
+        páginas, é embutida uma vez só), ou, no modo compacto fora do fpdf 2.8,
+        a própria imagem reduzida (o fpdf a decodifica em cada documento).
+        """
+        if compacto and self.logo_existe:
+            reduzida = self._logo_compacta()
+            if reduzida is not None:
+                imagem, info = reduzida
+                if self._inserir_imagem(pdf, self.chave_logo_compacta, info):
+                    return self.chave_logo_compacta
+                return imagem
+        # Sem a logo no cache, o fpdf a lê do arquivo (e guardar_logo a guarda depois)
+        self._inserir_imagem(pdf, self.logo_path, self._logo_info)
+        return self.logo_path
+
+    def guardar_logo(self, pdf: FPDF):
+        """Após o primeiro uso, guarda a logo decodificada para os próximos documentos"""
+        if self._logo_info is not None or not FPDF_INTERNO_COMPATIVEL:
+            return
+        info = pdf.image_cache.images.get(self.logo_path)
+        if info is not None:
+            with self._lock:
+                if self._logo_info is None:
+                    self._logo_info = type(info)(info)
+
+
+_contexto: Optional[ContextoRenderizacao] = None
+_contexto_lock = threading.Lock()
+
+
+def contexto_renderizacao() -> ContextoRenderizacao:
+    """Contexto único do processo, criado no primeiro PDF"""
+    global _contexto
+    if _contexto is None:
+        with _contexto_lock:
+            if _contexto is None:
+                _contexto = ContextoRenderizacao()
+    return _contexto
+
+
+# ========== CLASSE PDF ==========
+class EurocarPDF(FPDF):
+    MARGEM_INFERIOR = 25
+
+    def __init__(self, momento: Optional[datetime] = None, compacto: bool = False):
+        super().__init__()
+        self.compacto = compacto
+        self.set_auto_page_break(auto=True, margin=self.MARGEM_INFERIOR)
+        self.alias_nb_pages()
+        # Nas fontes padrão, travessões, aspas curvas e "…" existem no Windows-1252
+        self.core_fonts_encoding = "windows-1252"
+
+        self.contexto = contexto_renderizacao()
+        # Nome da logo no cache de imagens (ou a imagem reduzida, ver preparar_logo)
+        self.logo = self.contexto.preparar_logo(self, compacto)
+        if compacto:
+            # Fluxos de conteúdo em Flate (já é o padrão do fpdf; garantido aqui)
+            self.set_compression(True)
+        self.familia = self.contexto.preparar_fontes(self)
+
+        # Um único horário por documento: todas as páginas mostram a mesma data
+        self.momento = momento or datetime.now()
+        self.data_extenso = formatar_data_extenso(self.momento)
+
+    def normalize_text(self, text: str) -> str:
+        # Sem fonte TTF, caracteres fora do Windows-1252 (ex: emoji) viram "?" em vez de erro
+        if not self.is_ttf_font:
+            text = text.encode(self.core_fonts_encoding, "replace").decode(self.core_fonts_encoding)
+        return super().normalize_text(text)
+
+    def _desenhar_logo(self, x: float, y: float, w: float):
+        if self.contexto.logo_existe:
+            self.image(self.logo, x=x, y=y, w=w)
+            self.contexto.guardar_logo(self)
+
+    def header(self):
+        if self.page_no() == 1:
+            self._desenhar_logo(x=5, y=20, w=45)
+
+            self.set_xy(51, 10)
+            for texto, tamanho, estilo, altura in CABECALHO_EMPRESA:
+                self.set_font(self.familia, estilo, tamanho)
+                self.set_x(51)
+                self.cell(0, altura, texto, 0, align='L', **PROXIMA_LINHA)
+            
+            self.line(10, 48, 200, 48)
+            self.ln(5)
+        else:
+            self.set_font(self.familia, 'B', 17)
+            self._desenhar_logo(x=10, y=10, w=30)
+            self.set_y(Y_CONTEUDO_DEMAIS)
+
+    def footer(self):
+        # Posiciona o rodapé 15mm a partir do final da página
+        self.set_y(-15)
+        self.set_font(self.familia, '', 10)
+
+        # Número de páginas (linha superior)
+        pagina_texto = f"Página {self.page_no()} de {{nb}}"
+        self.cell(0, 5, pagina_texto, 0, align='R', **PROXIMA_LINHA)  # Mesmo alinhamento da data
+
+        # Data do documento (linha inferior)
+        self.cell(0, 5, self.data_extenso, 0, align='R')
+
+
+def criar_pdf(dados: Dict[str, Any], orcamento: Optional[Orcamento] = None, compacto: bool = False) -> EurocarPDF:
+    """Cria um PDF com os dados do orçamento (totais lidos do modelo)"""
+    if orcamento is None:
+        orcamento = Orcamento.de_dados(dados)
+
+    pdf = EurocarPDF(compacto=compacto)
+    pdf.add_page()
+    momento = pdf.momento
+
+    # Dados do cliente
+    pdf.set_font(pdf.familia, "B", 12)
+    pdf.cell(20, 10, "Cliente:", 0, align='L')
+    pdf.set_font(pdf.familia, "", 12)
+    pdf.cell(60, 10, dados.get('nome', 'Não informado'), 0, align='L')
+
+    pdf.set_font(pdf.familia, "B", 12)
+    pdf.cell(70, 10, "Veículo:", 0, align='R')
+    pdf.set_font(pdf.familia, "", 12)
+    pdf.cell(0, 10, dados.get('veiculo', 'Não informado'), 0, align='C', **PROXIMA_LINHA)
+
+    pdf.set_font(pdf.familia, "B", 12)
+    pdf.cell(20, 10, "Contato:", 0, align='L')
+    pdf.set_font(pdf.familia, "", 12)
+    pdf.cell(60, 10, dados.get('telefone', 'Não informado'), 0, align='L')
+
+    pdf.set_font(pdf.familia, "B", 12)
+    pdf.cell(68, 10, "Placa:", 0, align='R')
+    pdf.set_font(pdf.familia, "", 12)
+    pdf.cell(0, 10, dados.get('placa', 'Não informado'), 0, align='C', **PROXIMA_LINHA)
+
+    pdf.line(10, pdf.get_y(), 200, pdf.get_y())
+    pdf.ln(1)
+
+    pdf.set_font(pdf.familia, "B", 12)
+    pdf.cell(100, 10, f"ORÇAMENTO Nº: {momento.strftime('%H%M%S%d%m%y')}", 0, align='L')
+    pdf.cell(0, 10, f"Criado em: {momento.strftime('%d/%m/%Y')}", 0, align='R', **PROXIMA_LINHA)
+    pdf.ln(1)
+
+    pdf.line(10, pdf.get_y(), 200, pdf.get_y())
+    pdf.ln(10)
+
+    # Tabela de itens: mede as descrições, planeja as páginas e só então desenha
+    pdf.set_font(pdf.familia, "", 12)
+    col_widths = LARGURAS_COLUNAS
+    largura_descricao = col_widths[1] - 2 * pdf.c_margin
+    y_limite = pdf.page_break_trigger
+    maximo_linhas = int((y_limite - Y_CONTEUDO_DEMAIS - ALTURA_CABECALHO_TABELA - 2 * MARGEM_ITEM)
+                        // ALTURA_LINHA_TEXTO)
+    # Descrições e palavras se repetem muito: cada texto é medido uma vez por documento
+    largura_texto = lru_cache(maxsize=None)(pdf.get_string_width)
+    descricoes = [quebrar_linhas(item.descricao, largura_descricao, largura_texto, maximo_linhas)
+                for item in orcamento]
+    plano = planejar_paginas(
+        [len(linhas) * ALTURA_LINHA_TEXTO + 2 * MARGEM_ITEM for linhas in descricoes],
+        y_inicial=pdf.get_y(), y_topo=Y_CONTEUDO_DEMAIS, y_limite=y_limite,
+        altura_cabecalho=ALTURA_CABECALHO_TABELA, y_totais=pdf.h - RECUO_TOTAIS,
+    )
+
+    def draw_table_header():
+        pdf.set_font(pdf.familia, "B", 12)
+        pdf.cell(col_widths[0], 10, "Its", "B", align="L")
+        pdf.cell(col_widths[1], 10, "Descrição", "B", align="L")
+        pdf.cell(col_widths[2], 10, "Qtd", "B", align="C")
+        pdf.cell(col_widths[3], 10, "Unitário", "B", align="C")
+        pdf.cell(col_widths[4], 10, "Total", "B", align="C", **PROXIMA_LINHA)
+        pdf.set_font(pdf.familia, "", 12)
+
+    # As quebras já foram decididas no plano; a quebra automática do fpdf fica desligada
+    pdf.set_auto_page_break(auto=False)
+    draw_table_header()
+    pagina = 0
+    x_descricao = pdf.l_margin + col_widths[0]
+    for idx, (item, linhas, (pagina_item, y)) in enumerate(zip(orcamento, descricoes, plano.posicoes)):
+        if pagina_item != pagina:
+            pdf.add_page()
+            draw_table_header()
+            pagina = pagina_item
+
+        y += MARGEM_ITEM
+        pdf.set_xy(pdf.l_margin, y)
+        pdf.cell(col_widths[0], ALTURA_LINHA_TEXTO, f"{idx+1}.", 0, align="C")
+        pdf.cell(col_widths[1], ALTURA_LINHA_TEXTO, linhas[0], 0, align="L")
+        pdf.cell(col_widths[2], ALTURA_LINHA_TEXTO, str(item.quantidade), 0, align="C")
+        pdf.cell(col_widths[3], ALTURA_LINHA_TEXTO, formatar_brl(item.valor), 0, align="C")
+        pdf.cell(col_widths[4], ALTURA_LINHA_TEXTO, formatar_brl(item.total), 0, align="C", **PROXIMA_LINHA)
+        for linha in linhas[1:]:
+            y += ALTURA_LINHA_TEXTO
+            pdf.set_xy(x_descricao, y)
+            pdf.cell(col_widths[1], ALTURA_LINHA_TEXTO, linha, 0, align="L", **PROXIMA_LINHA)
+
+    if plano.pagina_totais != pagina:
+        pdf.add_page()
+    pdf.set_auto_page_break(auto=True, margin=EurocarPDF.MARGEM_INFERIOR)
+
+    pdf.set_y(plano.y_totais)
+    pdf.line(10, pdf.get_y(), 200, pdf.get_y())
+    pdf.ln(5)
+    
+    pdf.set_font(pdf.familia, "", 10)
+    pdf.cell(150, 8, "TOTAL PEÇAS:", 0, align="L")
+    pdf.cell(30, 8, formatar_brl(orcamento.total_pecas), 0, align="R", **PROXIMA_LINHA)
+
+    pdf.cell(150, 8, "MÃO DE OBRA:", 0, align="L")
+    pdf.cell(30, 8, formatar_brl(orcamento.mao_obra), 0, align="R", **PROXIMA_LINHA)
+    
+    pdf.line(10, pdf.get_y(), 200, pdf.get_y())
+    pdf.ln(5)
+    
+    pdf.set_font(pdf.familia, "B", 10)
+    pdf.cell(150, 8, "TOTAL GERAL:", 0, align="L")
+    pdf.cell(30, 8, formatar_brl(orcamento.total_geral), 0, align="R", **PROXIMA_LINHA)
+
+    return pdf
+
+
+# ========== PDF EM MEMÓRIA ==========
+def renderizar_pdf(dados: Dict[str, Any], orcamento: Optional[Orcamento] = None, compacto: bool = False) -> bytes:
+    """Renderiza o orçamento direto para bytes, sem passar pelo disco"""
+    itens = len(orcamento) if orcamento is not None else len(dados.get("itens") or [])
+    with medir("pdf.renderizar", itens=itens, compacto=compacto):
+        return bytes(criar_pdf(dados, orcamento, compacto).output())
+
+
+class CachePDF:
+    """
+    PDFs já renderizados, indexados pelo conteúdo do orçamento.
+
+    A pré-visualização e o "Gerar PDF" pedem o mesmo orçamento pela mesma chave,
+    então o documento é renderizado uma vez só e os mesmos bytes são exibidos e
+    gravados. Pedidos simultâneos da mesma chave esperam a primeira renderização.
+
+    O PDF traz a data da renderização ("Criado em", rodapé, número do
+    orçamento), então a data do dia também faz parte da chave: com o programa
+    aberto de um dia para o outro, o orçamento é renderizado de novo.
+    """
+
+    def __init__(self, maximo: int = 8):
+        self.maximo = maximo
+        self._documentos: "OrderedDict[Hashable, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._locks_chave: Dict[Hashable, threading.Lock] = {}
+
+    def obter(self, chave: Hashable) -> Optional[bytes]:
+        with self._lock:
+            conteudo = self._documentos.get(chave)
+            if conteudo is not None:
+                self._documentos.move_to_end(chave)
+            return conteudo
+
+    def _guardar(self, chave: Hashable, conteudo: bytes):
+        with self._lock:
+            self._documentos[chave] = conteudo
+            self._documentos.move_to_end(chave)
+            while len(self._documentos) > self.maximo:
+                self._documentos.popitem(last=False)
+
+    def renderizar(self, chave: Hashable, dados: Dict[str, Any], orcamento: Optional[Orcamento] = None,
+                compacto: bool = False) -> bytes:
+        """Devolve o PDF da chave, renderizando apenas se ainda não estiver no cache"""
+        chave = (chave, compacto, date.today())
+        conteudo = self.obter(chave)
+        if conteudo is not None:
+            return conteudo
+        with self._lock:
+            lock_chave = self._locks_chave.setdefault(chave, threading.Lock())
+        try:
+            with lock_chave:
+                conteudo = self.obter(chave)
+                if conteudo is None:
+                    conteudo = renderizar_pdf(dados, orcamento, compacto)
+                    self._guardar(chave, conteudo)
+                return conteudo
+        finally:
+            with self._lock:
+                if self._locks_chave.get(chave) is lock_chave and not lock_chave.locked():
+                    del self._locks_chave[chave]
@@ -0,0 +1,59 @@
+"""
+Onde e com que nome os orçamentos são gravados: editáveis (.json / .json.gz)
+na pasta configurada e o caminho do PDF correspondente.
+"""
+import logging
+import os
+import re
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from eurocar.arquivo import EXTENSAO, EXTENSAO_COMPACTA, gravar_orcamento
+from eurocar.config import ConfigManager
+from eurocar.orcamento import Orcamento
+from eurocar.sugestoes import IndiceDescricoes
+
+
+def sanitizar_nome_arquivo(nome: str) -> str:
+    """Remove caracteres inválidos de nomes de arquivos"""
+    return re.sub(r'[\\/:*?"<>|]', '', nome)
+
+
+def salvar_orcamento_editavel(dados: Dict[str, Any], orcamento: Optional[Orcamento] = None,
+                            historico: Optional[IndiceDescricoes] = None) -> str:
+    """
+    Salva o orçamento no formato versionado (eurocar.arquivo), em .json ou .json.gz.
+    Com `historico`, os itens salvos já passam a aparecer nas sugestões.
+    """
+    config = ConfigManager()
+    try:
+        nome_cliente = sanitizar_nome_arquivo(dados['nome'].strip())
+        agora = datetime.now()
+        timestamp = agora.strftime("%Y%m%d_%H%M%S")
+        extensao = EXTENSAO_COMPACTA if config.get("arquivos", "compactar") else EXTENSAO
+        nome_arquivo = f"Orcamento_{nome_cliente}_{timestamp}{extensao}"
+        caminho_completo = os.path.join(config.get("paths", "orcamentos_editaveis"), nome_arquivo)
+        
+        os.makedirs(config.get("paths", "orcamentos_editaveis"), exist_ok=True)
+        
+        if orcamento is None:
+            orcamento = Orcamento(dados['itens'], dados.get('mao_obra', 0))
+        gravar_orcamento(caminho_completo, dados, orcamento)
+        if historico is not None:
+            # Mesmo caminho absoluto e formato de data usados pelo catálogo
+            historico.adicionar_orcamento(os.path.abspath(caminho_completo), orcamento,
+                                        agora.isoformat(sep=" ", timespec="seconds"))
+        return caminho_completo
+    except Exception as e:
+        # Só no log: um popup aqui assustaria o usuário se o PDF já deu certo
+        logging.error(f"Erro ao salvar arquivo editável: {e}")
+        return None
+
+
+def montar_caminho_pdf(config, dados: Dict[str, Any]) -> str:
+    """Caminho do PDF na pasta configurada: 'Orçamento <cliente> <veículo> <data>.pdf'"""
+    data_formatada = datetime.now().strftime("%d-%m-%Y")
+    nome_cliente = ''.join(c for c in dados['nome'].strip() if c.isalnum() or c in ' _-')
+    modelo_carro = ''.join(c for c in dados['veiculo'].strip() if c.isalnum() or c in ' _-')
+    nome_arquivo = f"Orçamento {nome_cliente} {modelo_carro} {data_formatada}.pdf"
+    return os.path.join(config.get("paths", "orcamentos_pdf"), nome_arquivo)
@@ -0,0 +1,155 @@
+"""
+Relatórios sobre todos os orçamentos salvos.
+
+Os números saem do catálogo (eurocar.catalogo), que já guarda os totais de
+cada arquivo e as linhas dos itens. Antes de cada relatório o catálogo é
+sincronizado: só arquivos novos ou alterados são lidos (em paralelo, quando
+são muitos), e o resto é uma consulta SQL agregada.
+
+Valores em centavos (Dinheiro) e quantidades em milésimos (Quantidade), como
+no restante do programa. Arquivos ilegíveis ficam de fora das somas.
+"""
+import csv
+from typing import List, NamedTuple
+
+from eurocar.catalogo import CatalogoOrcamentos
+from eurocar.fixo import ZERO, Dinheiro, Quantidade
+from eurocar.moeda import formatar_valor
+
+LIMITE_RANKING = 20
+
+
+def _media(total: Dinheiro, quantidade: int) -> Dinheiro:
+    if not quantidade:
+        return ZERO
+    # Meio centavo para cima, como no restante dos arredondamentos
+    return Dinheiro((total.centavos * 2 + quantidade) // (quantidade * 2))
+
+
+def _percentual(parte: Dinheiro, total: Dinheiro) -> float:
+    return parte.centavos / total.centavos * 100 if total.centavos else 0.0
+
+
+def formatar_percentual(valor: float) -> str:
+    return f"{valor:.1f}%".replace(".", ",")
+
+
+class LinhaMes(NamedTuple):
+    mes: str  # AAAA-MM
+    orcamentos: int
+    total: Dinheiro
+    pecas: Dinheiro
+    mao_obra: Dinheiro
+
+    @property
+    def ticket_medio(self) -> Dinheiro:
+        return _media(self.total, self.orcamentos)
+
+
+class LinhaPeca(NamedTuple):
+    descricao: str
+    quantidade: Quantidade
+    total: Dinheiro
+    orcamentos: int
+
+
+class LinhaVeiculo(NamedTuple):
+    veiculo: str
+    orcamentos: int
+    total: Dinheiro
+
+
+class Relatorio(NamedTuple):
+    orcamentos: int
+    total: Dinheiro
+    pecas: Dinheiro
+    mao_obra: Dinheiro
+    meses: List[LinhaMes]
+    pecas_mais_vendidas: List[LinhaPeca]
+    veiculos: List[LinhaVeiculo]
+    ilegiveis: int
+
+    @property
+    def ticket_medio(self) -> Dinheiro:
+        return _media(self.total, self.orcamentos)
+
+    @property
+    def percentual_pecas(self) -> float:
+        return _percentual(self.pecas, self.total)
+
+    @property
+    def percentual_mao_obra(self) -> float:
+        return _percentual(self.mao_obra, self.total)
+
+
+def gerar_relatorio(catalogo: CatalogoOrcamentos, limite: int = LIMITE_RANKING) -> Relatorio:
+    """Agrega o índice do catálogo (chame catalogo.sincronizar() antes para incluir arquivos novos)"""
+    meses = [
+        LinhaMes(row["mes"], row["qtd"], Dinheiro(row["total"]), Dinheiro(row["pecas"]), Dinheiro(row["mao_obra"]))
+        for row in catalogo.consultar(
+            """SELECT substr(data, 1, 7) AS mes, COUNT(*) AS qtd, SUM(total_geral) AS total,
+                      SUM(total_pecas) AS pecas, SUM(mao_obra) AS mao_obra
+               FROM orcamentos WHERE erro = 0
+               GROUP BY mes ORDER BY mes""")
+    ]
+    pecas = [
+        LinhaPeca(row["descricao"], Quantidade(row["quantidade"]), Dinheiro(row["total"]), row["qtd"])
+        for row in catalogo.consultar(
+            """SELECT MAX(i.descricao) AS descricao, SUM(i.quantidade) AS quantidade,
+                      SUM(i.total) AS total, COUNT(DISTINCT i.caminho) AS qtd
+               FROM itens i JOIN orcamentos o ON o.caminho = i.caminho
+               WHERE o.erro = 0
+               GROUP BY i.chave ORDER BY total DESC LIMIT ?""", (limite,))
+    ]
+    veiculos = [
+        LinhaVeiculo(row["veiculo"], row["qtd"], Dinheiro(row["total"]))
+        for row in catalogo.consultar(
+            """SELECT MAX(trim(veiculo)) AS veiculo, COUNT(*) AS qtd, SUM(total_geral) AS total
+               FROM orcamentos WHERE erro = 0 AND trim(veiculo) != ''
+               GROUP BY lower(trim(veiculo)) ORDER BY qtd DESC, total DESC LIMIT ?""", (limite,))
+    ]
+    ilegiveis = catalogo.consultar("SELECT COUNT(*) FROM orcamentos WHERE erro = 1")[0][0]
+
+    return Relatorio(
+        orcamentos=sum(m.orcamentos for m in meses),
+        total=sum((m.total for m in meses), ZERO),
+        pecas=sum((m.pecas for m in meses), ZERO),
+        mao_obra=sum((m.mao_obra for m in meses), ZERO),
+        meses=meses,
+        pecas_mais_vendidas=pecas,
+        veiculos=veiculos,
+        ilegiveis=ilegiveis,
+    )
+
+
+def exportar_csv(relatorio: Relatorio, caminho: str) -> str:
+    """
+    Grava o relatório em CSV no padrão do Excel em português: separador ";",
+    vírgula decimal e UTF-8 com BOM (para os acentos aparecerem certos).
+    """
+    with open(caminho, "w", encoding="utf-8-sig", newline="") as f:
+        escritor = csv.writer(f, delimiter=";")
+        escritor.writerow(["Resumo"])
+        escritor.writerow(["Orçamentos", relatorio.orcamentos])
+        escritor.writerow(["Total orçado", formatar_valor(relatorio.total)])
+        escritor.writerow(["Ticket médio", formatar_valor(relatorio.ticket_medio)])
+        escritor.writerow(["Peças", formatar_valor(relatorio.pecas), formatar_percentual(relatorio.percentual_pecas)])
+        escritor.writerow(["Mão de obra", formatar_valor(relatorio.mao_obra),
+                        formatar_percentual(relatorio.percentual_mao_obra)])
+        escritor.writerow([])
+
+        escritor.writerow(["Mês", "Orçamentos", "Total", "Peças", "Mão de obra", "Ticket médio"])
+        for m in relatorio.meses:
+            escritor.writerow([m.mes, m.orcamentos, formatar_valor(m.total), formatar_valor(m.pecas),
+                            formatar_valor(m.mao_obra), formatar_valor(m.ticket_medio)])
+        escritor.writerow([])
+
+        escritor.writerow(["Peça", "Quantidade", "Total", "Orçamentos"])
+        for p in relatorio.pecas_mais_vendidas:
+            escritor.writerow([p.descricao, str(p.quantidade), formatar_valor(p.total), p.orcamentos])
+        escritor.writerow([])
+
+        escritor.writerow(["Veículo", "Orçamentos", "Total"])
+        for v in relatorio.veiculos:
+            escritor.writerow([v.veiculo, v.orcamentos, formatar_valor(v.total)])
+    return caminho
@@ -0,0 +1,383 @@
+"""
+Serviço HTTP local de geração de PDFs, para outros sistemas da oficina
+(planilha de gestão, tablet do balcão) sem ninguém no Eurocar.
+
+    python main.py --servidor [--host 0.0.0.0] [--porta 8765] [--workers 2] [--fila 16]
+
+Rotas:
+  POST /pdf        corpo: orçamento em JSON, no formato dos editáveis salvos
+                   (eurocar.arquivo; o JSON antigo também é aceito).
+                   Resposta: o PDF. Com ?compacto=1, o PDF compacto.
+  GET  /saude      situação do serviço (para monitoramento)
+  GET  /metricas   contadores, fila e latências
+
+A renderização roda num pool fixo de processos. Cabem no máximo
+`workers + fila` pedidos ao mesmo tempo; acima disso a resposta é 503 com
+Retry-After, sem enfileirar mais (quem chama tenta de novo depois). Se um
+processo do pool morrer (falta de memória, kill), o pool é recriado e
+/saude responde 503 ("erro") até os processos novos estarem prontos.
+
+Só atende endereços locais ou da rede interna: por padrão escuta apenas em
+127.0.0.1, e mesmo com --host 0.0.0.0 recusa (403) clientes de fora da LAN.
+Nenhum serviço externo é usado.
+"""
+import ipaddress
+import json
+import logging
+import signal
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as TempoEsgotado
+from concurrent.futures.process import BrokenProcessPool
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlsplit
+
+HOST_PADRAO = "127.0.0.1"
+PORTA_PADRAO = 8765
+WORKERS_PADRAO = 2
+FILA_PADRAO = 16
+TAMANHO_MAXIMO_CORPO = 2_000_000
+TEMPO_MAXIMO_PDF = 60.0
+ESPERA_SUGERIDA = 2  # segundos, no Retry-After das respostas 503
+AMOSTRAS_LATENCIA = 1000
+
+
+class FilaCheia(Exception):
+    pass
+
+
+def _renderizar_conteudo(conteudo: Dict[str, Any], compacto: bool) -> bytes:
+    """Executado nos processos do pool"""
+    from eurocar.arquivo import orcamento_de_conteudo
+    from eurocar.pdf import renderizar_pdf
+
+    dados, orcamento = orcamento_de_conteudo(conteudo)
+    return renderizar_pdf(dados, orcamento, compacto)
+
+
+def _iniciar_processo():
+    # Ctrl+C chega a todo o grupo de processos; quem encerra o pool é o processo principal
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def _nada():
+    pass
+
+
+def _aquecer() -> bool:
+    """Carrega fpdf, fontes e logo no processo antes do primeiro pedido"""
+    from eurocar.pdf import contexto_renderizacao
+
+    contexto_renderizacao()
+    return True
+
+
+def _percentil(ordenados: List[float], p: float) -> float:
+    if not ordenados:
+        return 0.0
+    return ordenados[min(len(ordenados) - 1, round(p / 100 * (len(ordenados) - 1)))]
+
+
+class ServicoPDF:
+    """Pool de processos com limite de pedidos simultâneos (em execução + na fila)"""
+
+    def __init__(self, workers: int = WORKERS_PADRAO, fila: int = FILA_PADRAO,
+                tempo_maximo: float = TEMPO_MAXIMO_PDF):
+        self.workers = workers
+        self.capacidade = workers + fila
+        self.tempo_maximo = tempo_maximo
+        self._vagas = threading.BoundedSemaphore(self.capacidade)
+        self._lock = threading.Lock()
+        self._ocupadas = 0
+        self._respostas: Counter = Counter()
+        self._latencias: deque = deque(maxlen=AMOSTRAS_LATENCIA)
+        self._bytes = 0
+        self._reinicios = 0
+        # Falso entre a morte de um processo do pool e o fim do aquecimento do pool novo
+        self._pronto = True
+        # (pool, futuro) da última sonda de /saude; no máximo uma por vez no pool
+        self._sonda = None
+        self.inicio = time.time()
+        self._pool = self._novo_pool()
+
+    def _novo_pool(self) -> ProcessPoolExecutor:
+        pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_iniciar_processo)
+        for _ in range(self.workers):
+            pool.submit(_aquecer).add_done_callback(self._aquecido)
+        return pool
+
+    def _aquecido(self, futuro):
+        if not futuro.cancelled() and futuro.exception() is None:
+            self._pronto = True
+
+    def _recriar_pool(self, quebrado: ProcessPoolExecutor):
+        """Troca um pool com processo morto (BrokenProcessPool não se recupera sozinho)"""
+        with self._lock:
+            if self._pool is not quebrado:
+                return  # outro pedido já recriou
+            logging.error("Processo de renderização morreu; recriando o pool")
+            self._pronto = False
+            self._reinicios += 1
+            self._sonda = None
+            self._pool = self._novo_pool()
+        quebrado.shutdown(wait=False, cancel_futures=True)
+
+    def verificar_pool(self) -> bool:
+        """Falso se o pool estava quebrado (já recriado aqui) ou ainda aquecendo"""
+        with self._lock:
+            pool, futuro = self._sonda or (self._pool, None)
+            quebrado = (futuro is not None and futuro.done() and not futuro.cancelled()
+                        and isinstance(futuro.exception(), BrokenProcessPool))
+            # Só manda outra sonda quando a anterior terminou: um monitor consultando
+            # /saude sem parar não enfileira trabalho na frente dos PDFs
+            if not quebrado and (futuro is None or futuro.done()):
+                pool = self._pool
+                try:
+                    self._sonda = (pool, pool.submit(_nada))
+                except BrokenProcessPool:
+                    quebrado = True
+        if quebrado:
+            self._recriar_pool(pool)
+            return False
+        return self._pronto
+
+    def _liberar(self, _futuro=None):
+        with self._lock:
+            self._ocupadas -= 1
+        self._vagas.release()
+
+    def renderizar(self, conteudo: Dict[str, Any], compacto: bool = False) -> bytes:
+        """
+        PDF do orçamento; FilaCheia se já houver `capacidade` pedidos em
+        andamento, BrokenProcessPool se o processo morreu (o pool é recriado)
+        """
+        if not self._vagas.acquire(blocking=False):
+            raise FilaCheia()
+        with self._lock:
+            self._ocupadas += 1
+            pool = self._pool
+        try:
+            futuro = pool.submit(_renderizar_conteudo, conteudo, compacto)
+        except BrokenProcessPool:
+            self._liberar()
+            self._recriar_pool(pool)
+            raise
+        except Exception:
+            self._liberar()
+            raise
+        # A vaga só volta quando o processo termina, mesmo se quem pediu desistir antes
+        futuro.add_done_callback(self._liberar)
+        try:
+            return futuro.result(timeout=self.tempo_maximo)
+        except BrokenProcessPool:
+            self._recriar_pool(pool)
+            raise
+
+    def registrar(self, status: int, segundos: float, tamanho: int = 0):
+        with self._lock:
+            self._respostas[status] += 1
+            if status == 200:
+                self._latencias.append(segundos * 1000)
+                self._bytes += tamanho
+
+    def metricas(self) -> Dict[str, Any]:
+        with self._lock:
+            latencias = sorted(self._latencias)
+            respostas = dict(sorted(self._respostas.items()))
+            ocupadas = self._ocupadas
+            enviados = self._bytes
+            reinicios = self._reinicios
+        return {
+            "ativo_ha_s": round(time.time() - self.inicio, 1),
+            "workers": self.workers,
+            "pool_pronto": self._pronto,
+            "reinicios_pool": reinicios,
+            "capacidade": self.capacidade,
+            "em_andamento": min(ocupadas, self.workers),
+            "na_fila": max(0, ocupadas - self.workers),
+            "respostas": {str(status): n for status, n in respostas.items()},
+            "pdfs_gerados": respostas.get(200, 0),
+            "rejeitados_fila_cheia": respostas.get(503, 0),
+            "bytes_enviados": enviados,
+            "latencia_ms": {
+                "amostras": len(latencias),
+                "p50": round(_percentil(latencias, 50), 1),
+                "p90": round(_percentil(latencias, 90), 1),
+                "p99": round(_percentil(latencias, 99), 1),
+                "max": round(latencias[-1], 1) if latencias else 0.0,
+            },
+        }
+
+    def encerrar(self):
+        self._pool.shutdown(wait=True, cancel_futures=True)
+
+
+def cliente_permitido(endereco: str) -> bool:
+    """Só a própria máquina e redes internas (192.168.x.x, 10.x.x.x, ...)"""
+    try:
+        ip = ipaddress.ip_address(endereco)
+    except ValueError:
+        return False
+    if getattr(ip, "ipv4_mapped", None):
+        ip = ip.ipv4_mapped
+    return ip.is_loopback or ip.is_private or ip.is_link_local
+
+
+class ManipuladorPDF(BaseHTTPRequestHandler):
+    server_version = "EurocarPDF/1"
+    protocol_version = "HTTP/1.1"
+    servico: ServicoPDF  # definido por criar_servidor
+
+    def log_message(self, formato, *args):
+        logging.info(f"{self.client_address[0]} {formato % args}")
+
+    def _responder(self, status: int, corpo: bytes, tipo: str, cabecalhos: Optional[Dict[str, str]] = None):
+        self.send_response(status)
+        self.send_header("Content-Type", tipo)
+        self.send_header("Content-Length", str(len(corpo)))
+        for nome, valor in (cabecalhos or {}).items():
+            self.send_header(nome, valor)
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def _json(self, status: int, conteudo: Dict[str, Any], cabecalhos: Optional[Dict[str, str]] = None):
+        corpo = json.dumps(conteudo, ensure_ascii=False).encode("utf-8")
+        self._responder(status, corpo, "application/json; charset=utf-8", cabecalhos)
+
+    def _erro(self, status: int, mensagem: str, inicio: float, cabecalhos: Optional[Dict[str, str]] = None):
+        self.servico.registrar(status, time.perf_counter() - inicio)
+        self._json(status, {"erro": mensagem}, cabecalhos)
+
+    def _autorizado(self, inicio: float) -> bool:
+        if cliente_permitido(self.client_address[0]):
+            return True
+        # O corpo de um POST recusado não é lido: a conexão não pode ser reaproveitada
+        self.close_connection = True
+        self._erro(403, "Serviço disponível apenas na rede local", inicio)
+        return False
+
+    def do_GET(self):
+        inicio = time.perf_counter()
+        if not self._autorizado(inicio):
+            return
+        rota = urlsplit(self.path).path
+        if rota == "/saude":
+            pronto = self.servico.verificar_pool()
+            metricas = self.servico.metricas()
+            lotado = metricas["em_andamento"] + metricas["na_fila"] >= metricas["capacidade"]
+            status = "erro" if not pronto else "lotado" if lotado else "ok"
+            self._json(200 if pronto else 503,
+                    {"status": status, "workers": metricas["workers"], "na_fila": metricas["na_fila"],
+                    "capacidade": metricas["capacidade"], "reinicios_pool": metricas["reinicios_pool"]})
+        elif rota == "/metricas":
+            self._json(200, self.servico.metricas())
+        else:
+            self._erro(404, "Rota não encontrada", inicio)
+
+    def _ler_corpo(self, inicio: float) -> Optional[Any]:
+        try:
+            tamanho = int(self.headers.get("Content-Length", ""))
+        except ValueError:
+            self.close_connection = True
+            self._erro(411, "Content-Length obrigatório", inicio)
+            return None
+        if tamanho < 0:
+            # rfile.read(-1) esperaria o fim da conexão
+            self.close_connection = True
+            self._erro(400, "Content-Length inválido", inicio)
+            return None
+        if tamanho > TAMANHO_MAXIMO_CORPO:
+            self.close_connection = True
+            self._erro(413, f"Orçamento maior que {TAMANHO_MAXIMO_CORPO} bytes", inicio)
+            return None
+        try:
+            return json.loads(self.rfile.read(tamanho).decode("utf-8"))
+        except (UnicodeDecodeError, ValueError):
+            self._erro(400, "Corpo não é um JSON válido", inicio)
+            return None
+
+    def do_POST(self):
+        inicio = time.perf_counter()
+        if not self._autorizado(inicio):
+            return
+        partes = urlsplit(self.path)
+        if partes.path != "/pdf":
+            self.close_connection = True
+            self._erro(404, "Rota não encontrada", inicio)
+            return
+        conteudo = self._ler_corpo(inicio)
+        if conteudo is None:
+            return
+        compacto = parse_qs(partes.query).get("compacto", ["0"])[0].lower() in ("1", "true", "sim")
+
+        try:
+            pdf = self.servico.renderizar(conteudo, compacto)
+        except FilaCheia:
+            self._erro(503, "Fila cheia, tente de novo em instantes", inicio,
+                    {"Retry-After": str(ESPERA_SUGERIDA)})
+            return
+        except BrokenProcessPool:
+            self._erro(503, "Processo de renderização reiniciado, tente de novo em instantes", inicio,
+                    {"Retry-After": str(ESPERA_SUGERIDA)})
+            return
+        except TempoEsgotado:
+            self._erro(504, f"PDF não ficou pronto em {self.servico.tempo_maximo:.0f} s", inicio)
+            return
+        except (ValueError, TypeError, KeyError, ArithmeticError) as e:
+            self._erro(400, f"Orçamento inválido: {e}", inicio)
+            return
+        except Exception as e:
+            logging.error(f"Erro ao gerar PDF pelo serviço: {e}")
+            self._erro(500, "Erro ao gerar o PDF", inicio)
+            return
+
+        self.servico.registrar(200, time.perf_counter() - inicio, len(pdf))
+        self._responder(200, pdf, "application/pdf")
+
+
+def criar_servidor(host: str, porta: int, servico: ServicoPDF) -> ThreadingHTTPServer:
+    manipulador = type("Manipulador", (ManipuladorPDF,), {"servico": servico})
+    servidor = ThreadingHTTPServer((host, porta), manipulador)
+    servidor.daemon_threads = True
+    return servidor
+
+
+def executar_servidor_cli(argv: List[str]) -> int:
+    """python main.py --servidor [--host H] [--porta P] [--workers N] [--fila N]"""
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="main.py --servidor",
+                                    description="Serviço local que gera PDFs de orçamentos via HTTP.")
+    parser.add_argument("--host", default=HOST_PADRAO,
+                        help=f"Endereço de escuta (padrão: {HOST_PADRAO}; 0.0.0.0 para a rede local)")
+    parser.add_argument("--porta", type=int, default=PORTA_PADRAO)
+    parser.add_argument("-w", "--workers", type=int, default=WORKERS_PADRAO, help="Processos de renderização")
+    parser.add_argument("--fila", type=int, default=FILA_PADRAO,
+                        help="Pedidos aguardando além dos que estão em execução")
+    args = parser.parse_args(argv)
+    if args.workers < 1 or args.fila < 0:
+        parser.error("--workers deve ser maior que zero e --fila não pode ser negativa")
+
+    servico = ServicoPDF(args.workers, args.fila)
+    try:
+        servidor = criar_servidor(args.host, args.porta, servico)
+    except OSError as e:
+        servico.encerrar()
+        print(f"Não foi possível abrir {args.host}:{args.porta}: {e}")
+        return 1
+
+    host, porta = servidor.server_address[:2]
+    if not ipaddress.ip_address(host).is_loopback:
+        print("Atenção: aceitando pedidos da rede local; clientes de fora dela recebem 403.")
+    print(f"Serviço de PDF em http://{host}:{porta} ({args.workers} processo(s), fila de {args.fila})")
+    print("  POST /pdf   GET /saude   GET /metricas   (Ctrl+C para encerrar)", flush=True)
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        print("\nEncerrando...")
+    finally:
+        servidor.server_close()
+        servico.encerrar()
+    return 0
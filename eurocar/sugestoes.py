@@ -0,0 +1,156 @@
+"""
+Sugestões de descrição e preço a partir do histórico de orçamentos.
+
+O índice é um vetor ordenado das descrições normalizadas (sem acento, sem
+diferença de maiúsculas e espaços repetidos); a busca por prefixo é uma
+busca binária (bisect) seguida da leitura só do trecho que casa. Cada
+descrição guarda os preços unitários já cobrados, em centavos e ordenados,
+o que dá a mediana direto, e o último preço (pela data do orçamento).
+
+Para ordenar as sugestões pelas mais usadas sem chamar código Python a cada
+descrição do trecho, um vetor paralelo às chaves guarda as ocorrências
+(negativas) e serve de chave para `heapq.nsmallest`.
+
+As linhas vêm do catálogo (eurocar.catalogo), que relê só arquivos novos ou
+alterados; orçamentos salvos durante a sessão entram com `adicionar_orcamento`.
+"""
+import bisect
+import heapq
+import itertools
+import threading
+import unicodedata
+from typing import Dict, Iterable, List, NamedTuple, Set, Tuple
+
+from eurocar.fixo import Dinheiro
+from eurocar.orcamento import Orcamento
+
+LIMITE_SUGESTOES = 8
+_LOTE_CARGA = 2000
+
+
+def normalizar(texto: str) -> str:
+    """Chave de busca: minúsculas, sem acentos e com espaços simples"""
+    if texto.isascii():
+        return " ".join(texto.lower().split())
+    decomposto = unicodedata.normalize("NFKD", texto)
+    sem_acento = "".join(c for c in decomposto if not unicodedata.combining(c))
+    return " ".join(sem_acento.casefold().split())
+
+
+class Sugestao(NamedTuple):
+    descricao: str
+    ultimo: Dinheiro
+    mediana: Dinheiro
+    ocorrencias: int
+
+
+class _Entrada:
+    __slots__ = ("descricao", "precos", "ultimo", "data")
+
+    def __init__(self, descricao: str, centavos: int, data: str):
+        self.descricao = descricao
+        self.precos = [centavos]
+        self.ultimo = centavos
+        self.data = data
+
+    def registrar(self, descricao: str, centavos: int, data: str):
+        bisect.insort(self.precos, centavos)
+        if data >= self.data:
+            # A grafia e o preço mais recentes são os que aparecem na sugestão
+            self.descricao = descricao
+            self.ultimo = centavos
+            self.data = data
+
+    def mediana(self) -> int:
+        meio = len(self.precos) // 2
+        if len(self.precos) % 2:
+            return self.precos[meio]
+        # Média dos dois centrais, meio centavo para cima
+        return (self.precos[meio - 1] + self.precos[meio] + 1) // 2
+
+
+class IndiceDescricoes:
+    """Índice de prefixos das descrições já usadas, com último preço e mediana"""
+
+    def __init__(self):
+        self._entradas: Dict[str, _Entrada] = {}
+        self._chaves: List[str] = []
+        # Paralelo a _chaves depois de ordenado: -ocorrências de cada descrição
+        self._negativos: List[int] = []
+        self._ordenado = True
+        self._arquivos: Set[str] = set()
+        # Carregado numa thread e consultado pela janela: tudo passa pelo lock
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entradas)
+
+    def adicionar(self, descricao: str, valor: Dinheiro, data: str = ""):
+        with self._lock:
+            self._adicionar(descricao, valor.centavos, data)
+
+    def _adicionar(self, descricao: str, centavos: int, data: str):
+        descricao = " ".join(descricao.split())
+        chave = normalizar(descricao)
+        if not chave:
+            return
+        entrada = self._entradas.get(chave)
+        if entrada is None:
+            self._entradas[chave] = _Entrada(descricao, centavos, data)
+            # Chave nova vai para o fim; a ordenação fica para a próxima busca
+            self._chaves.append(chave)
+            self._ordenado = False
+        else:
+            entrada.registrar(descricao, centavos, data)
+            if self._ordenado:
+                self._negativos[bisect.bisect_left(self._chaves, chave)] -= 1
+
+    def carregar(self, linhas: Iterable[Tuple[str, str, int, str]]):
+        """Carga em lote de linhas (caminho, descricao, centavos, data), ex: do catálogo"""
+        with self._lock:
+            # Arquivos já incluídos por adicionar_orcamento durante a carga não contam duas vezes
+            ja_incluidos = set(self._arquivos)
+        linhas = iter(linhas)
+        while True:
+            lote = list(itertools.islice(linhas, _LOTE_CARGA))
+            if not lote:
+                break
+            # Lock por lote: a janela consegue consultar enquanto o histórico carrega
+            with self._lock:
+                for caminho, descricao, centavos, data in lote:
+                    if caminho in ja_incluidos:
+                        continue
+                    self._arquivos.add(caminho)
+                    self._adicionar(descricao, centavos, data)
+
+    def adicionar_orcamento(self, caminho: str, orcamento: Orcamento, data: str):
+        """Inclui os itens de um orçamento salvo; o mesmo arquivo não é contado duas vezes"""
+        with self._lock:
+            if caminho in self._arquivos:
+                return
+            self._arquivos.add(caminho)
+            for item in orcamento:
+                self._adicionar(item.descricao, item.valor.centavos, data)
+
+    def sugerir(self, prefixo: str, limite: int = LIMITE_SUGESTOES) -> List[Sugestao]:
+        """Descrições que começam com o prefixo, das mais usadas para as menos usadas"""
+        chave = normalizar(prefixo)
+        if not chave:
+            return []
+        with self._lock:
+            if not self._ordenado:
+                self._ordenar()
+            inicio = bisect.bisect_left(self._chaves, chave)
+            fim = bisect.bisect_left(self._chaves, chave + "\uffff", inicio)
+            # Empates ficam na ordem alfabética: nsmallest mantém a ordem original
+            posicoes = heapq.nsmallest(limite, range(inicio, fim), key=self._negativos.__getitem__)
+            entradas = [self._entradas[self._chaves[p]] for p in posicoes]
+            return [
+                Sugestao(e.descricao, Dinheiro(e.ultimo), Dinheiro(e.mediana()), len(e.precos))
+                for e in entradas
+            ]
+
+    def _ordenar(self):
+        self._chaves.sort()
+        self._negativos = [-len(self._entradas[c].precos) for c in self._chaves]
+        self._ordenado = True
@@ -0,0 +1,238 @@
+"""
+Telemetria opcional de desempenho.
+
+Desligada por padrão (seção "telemetria" do config.json). Ligada, cada
+operação medida vira uma linha JSON em logs/telemetria.jsonl, com rotação
+por tamanho:
+
+    {"ts": "2026-10-17T10:15:02.481", "op": "pdf.renderizar", "ms": 41.27, "ok": true, "itens": 12}
+
+Desligada, `medir()` devolve um objeto vazio compartilhado: o custo nos
+caminhos quentes é uma chamada de função.
+
+O resumo por operação (contagem, percentis e histograma de latência) sai de
+`resumir()` / `formatar_resumo()`, usados por `python main.py --telemetria`.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, Iterator, List
+
+NOME_ARQUIVO = "telemetria.jsonl"
+TAMANHO_MAXIMO = 1_000_000
+ARQUIVOS_ROTACAO = 5
+
+# Limites superiores (ms) das faixas do histograma; a última faixa é "acima de"
+FAIXAS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+_logger = logging.getLogger("eurocar.telemetria")
+_logger.propagate = False
+_ativa = False
+
+
+def configurar(pasta_logs: str, ativa: bool):
+    """Liga ou desliga a gravação (pode ser chamada de novo ao mudar a configuração)"""
+    global _ativa
+    for handler in list(_logger.handlers):
+        _logger.removeHandler(handler)
+        handler.close()
+    _ativa = bool(ativa)
+    if not _ativa:
+        return
+    # logging.handlers só é carregado quando a telemetria está ligada
+    from logging.handlers import RotatingFileHandler
+
+    os.makedirs(pasta_logs, exist_ok=True)
+    handler = RotatingFileHandler(os.path.join(pasta_logs, NOME_ARQUIVO), maxBytes=TAMANHO_MAXIMO,
+                                backupCount=ARQUIVOS_ROTACAO, encoding="utf-8")
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    _logger.addHandler(handler)
+    _logger.setLevel(logging.INFO)
+
+
+def ativa() -> bool:
+    return _ativa
+
+
+def registrar(operacao: str, ms: float, ok: bool = True, **atributos: Any):
+    """Grava uma medição já feita (ex: tempo de tratamento de um evento)"""
+    if not _ativa:
+        return
+    registro = {"ts": datetime.now().isoformat(timespec="milliseconds"), "op": operacao,
+                "ms": round(ms, 3), "ok": ok}
+    if threading.current_thread() is not threading.main_thread():
+        registro["thread"] = threading.current_thread().name
+    registro.update(atributos)
+    _logger.info(json.dumps(registro, ensure_ascii=False, default=str))
+
+
+class _Medicao:
+    __slots__ = ("operacao", "atributos", "inicio")
+
+    def __init__(self, operacao: str, atributos: Dict[str, Any]):
+        self.operacao = operacao
+        self.atributos = atributos
+
+    def __enter__(self):
+        self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, tipo, valor, rastro):
+        ms = (time.perf_counter() - self.inicio) * 1000
+        if tipo is not None:
+            self.atributos["erro"] = tipo.__name__
+        registrar(self.operacao, ms, ok=tipo is None, **self.atributos)
+        return False
+
+
+class _Nula:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, rastro):
+        return False
+
+
+_NULA = _Nula()
+
+
+def medir(operacao: str, **atributos: Any):
+    """Context manager que mede o bloco: `with medir("arquivo.gravar", itens=n): ...`"""
+    if not _ativa:
+        return _NULA
+    return _Medicao(operacao, atributos)
+
+
+class CronometroEventos:
+    """
+    Mede o tratamento de cada evento do laço principal: do retorno de
+    window.read() até a próxima chamada. Inclui o tempo de janelas modais
+    abertas pelo evento (ex: a digitação na janela de item).
+    """
+
+    def __init__(self):
+        self._evento = None
+        self._inicio = 0.0
+
+    def inicio(self, evento):
+        if _ativa:
+            self._evento = evento
+            self._inicio = time.perf_counter()
+
+    def fim(self):
+        if self._evento is not None:
+            registrar("evento", (time.perf_counter() - self._inicio) * 1000, evento=str(self._evento))
+            self._evento = None
+
+
+# ---------- Resumo ----------
+def arquivos_log(pasta_logs: str) -> List[str]:
+    """O arquivo atual e os rotacionados, do mais antigo ao mais novo"""
+    base = os.path.join(pasta_logs, NOME_ARQUIVO)
+    caminhos = [f"{base}.{n}" for n in range(ARQUIVOS_ROTACAO, 0, -1)] + [base]
+    return [c for c in caminhos if os.path.exists(c)]
+
+
+def ler_registros(caminhos: List[str]) -> Iterator[Dict[str, Any]]:
+    for caminho in caminhos:
+        with open(caminho, "r", encoding="utf-8") as f:
+            for linha in f:
+                try:
+                    registro = json.loads(linha)
+                except ValueError:
+                    continue  # linha cortada por queda ou rotação
+                if isinstance(registro, dict) and "op" in registro and "ms" in registro:
+                    yield registro
+
+
+def _percentil(ordenados: List[float], p: float) -> float:
+    indice = min(len(ordenados) - 1, max(0, round(p / 100 * (len(ordenados) - 1))))
+    return ordenados[indice]
+
+
+def _faixa(ms: float) -> int:
+    for indice, limite in enumerate(FAIXAS_MS):
+        if ms <= limite:
+            return indice
+    return len(FAIXAS_MS)
+
+
+def resumir(registros: Iterator[Dict[str, Any]], por_evento: bool = False) -> Dict[str, Dict[str, Any]]:
+    """
+    Estatísticas por operação: contagem, erros, p50/p90/p99/máximo e histograma
+    (contagem por faixa de FAIXAS_MS). Com `por_evento`, cada evento da janela
+    vira uma operação própria ("evento:-ADD-").
+    """
+    tempos: Dict[str, List[float]] = defaultdict(list)
+    erros: Dict[str, int] = defaultdict(int)
+    for registro in registros:
+        operacao = registro["op"]
+        if por_evento and operacao == "evento":
+            operacao = f"evento:{registro.get('evento', '?')}"
+        tempos[operacao].append(float(registro["ms"]))
+        if not registro.get("ok", True):
+            erros[operacao] += 1
+
+    resumo = {}
+    for operacao, lista in sorted(tempos.items()):
+        lista.sort()
+        histograma = [0] * (len(FAIXAS_MS) + 1)
+        for ms in lista:
+            histograma[_faixa(ms)] += 1
+        resumo[operacao] = {
+            "n": len(lista), "erros": erros[operacao], "total_ms": sum(lista),
+            "p50": _percentil(lista, 50), "p90": _percentil(lista, 90), "p99": _percentil(lista, 99),
+            "max": lista[-1], "histograma": histograma,
+        }
+    return resumo
+
+
+def _rotulo_faixa(indice: int) -> str:
+    if indice == len(FAIXAS_MS):
+        return f"> {FAIXAS_MS[-1]} ms"
+    return f"<= {FAIXAS_MS[indice]} ms"
+
+
+def formatar_resumo(resumo: Dict[str, Dict[str, Any]], histogramas: bool = True, largura: int = 40) -> str:
+    if not resumo:
+        return "Nenhuma medição registrada."
+    linhas = [f"{'operação':<28} {'n':>7} {'erros':>6} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'máx ms':>9}"]
+    for operacao, s in resumo.items():
+        linhas.append(f"{operacao:<28} {s['n']:>7} {s['erros']:>6} {s['p50']:>9.2f} {s['p90']:>9.2f} "
+                    f"{s['p99']:>9.2f} {s['max']:>9.2f}")
+    if histogramas:
+        for operacao, s in resumo.items():
+            linhas.append(f"\n{operacao}")
+            maior = max(s["histograma"])
+            for indice, contagem in enumerate(s["histograma"]):
+                if contagem:
+                    barra = "#" * max(1, round(contagem / maior * largura))
+                    linhas.append(f"  {_rotulo_faixa(indice):>11} {contagem:>7}  {barra}")
+    return "\n".join(linhas)
+
+
+def executar_resumo_cli(argv: List[str], pasta_logs: str) -> int:
+    """python main.py --telemetria [--eventos] [--sem-histograma] [arquivo ...]"""
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="main.py --telemetria",
+                                    description="Resumo das medições de desempenho gravadas pela telemetria.")
+    parser.add_argument("arquivos", nargs="*", help=f"Arquivos .jsonl (padrão: {NOME_ARQUIVO} e rotacionados)")
+    parser.add_argument("--eventos", action="store_true", help="Separa o laço principal por evento da janela")
+    parser.add_argument("--sem-histograma", action="store_true")
+    args = parser.parse_args(argv)
+
+    caminhos = args.arquivos or arquivos_log(pasta_logs)
+    if not caminhos:
+        print(f"Nenhum registro de telemetria em {pasta_logs}.")
+        print('Ative em Configurações > Desempenho (ou "telemetria": {"ativa": true} no config.json).')
+        return 1
+    print(formatar_resumo(resumir(ler_registros(caminhos), por_evento=args.eventos),
+                        histogramas=not args.sem_histograma))
+    return 0
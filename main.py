@@ -1,34 +1,30 @@
+import time
+# Marca o início da importação para o relatório de --profile-startup
+_INICIO_IMPORTS = time.perf_counter()
+
 import FreeSimpleGUI as sg
-from fpdf import FPDF
-from datetime import datetime
+from datetime import date, datetime
 import json
-from pathlib import Path
-import appdirs
 import os
 import sys
-import ctypes
-import re
-import locale
 import logging
-from typing import Dict, Any
-import shutil
-from decimal import Decimal, ROUND_HALF_UP
-import requests 
-import webbrowser 
-
-# ========== CONFIGURAÇÃO INICIAL ==========
-# Configuração de locale para formatação de moeda
-try:
-    locale.setlocale(locale.LC_ALL, 'pt_BR.UTF-8')
-except:
-    locale.setlocale(locale.LC_ALL, '')
-
-# Configuração de logging
-log_dir = os.path.join(appdirs.user_config_dir("Eurocar"), "logs")
-os.makedirs(log_dir, exist_ok=True)
-
-log_path = os.path.join(log_dir, "eurocar.log")
-logging.basicConfig(filename=log_path, level=logging.ERROR)
+from typing import Dict, Any, List, Tuple, Optional
+from decimal import Decimal
+from eurocar.fixo import Dinheiro, Quantidade
+from eurocar.orcamento import Item, Orcamento
+from eurocar.arquivo import ler_orcamento, ler_resumo
+from eurocar.config import ConfigManager, configurar_logging, pasta_config, pasta_logs
+from eurocar.persistencia import montar_caminho_pdf, salvar_orcamento_editavel
+from eurocar.diario import DiarioEdicao, restaurar as restaurar_diario
+from eurocar.sugestoes import IndiceDescricoes, Sugestao
+from eurocar import telemetria
+from eurocar.moeda import formatar_brl, formatar_valor, converter_brl
+from eurocar.atualizacao import (VERSAO_ATUAL, URL_CHECK_VERSAO, LINK_DOWNLOAD_DIRETO,
+                                INTERVALO_PADRAO_HORAS, consultar_versao, ha_atualizacao)
+# Módulos pesados (fpdf, requests, sqlite3, multiprocessing, webbrowser) são
+# importados só no primeiro uso, dentro das funções que precisam deles.
+
+_TEMPO_IMPORTS = time.perf_counter() - _INICIO_IMPORTS
 
 # ========== CONFIGURAÇÃO DO ÍCONE ==========
 if getattr(sys, 'frozen', False):
@@ -36,94 +32,25 @@ if getattr(sys, 'frozen', False):
 else:
     icon_path = os.path.join('assets', 'icone.ico')
 
-# Força o ícone na barra de tarefas (Windows apenas)
-if sys.platform == "win32":
-    myappid = 'sua.empresa.app.1.0'
-    ctypes.windll.shell32.SetCurrentProcessExplicitAppUserModelID(myappid)
-
-# ========== CLASSE DE CONFIGURAÇÕES ==========
-class ConfigManager:
-    _instance = None
-    # Usar appdirs para obter o local correto de configurações
-    _config_dir = appdirs.user_config_dir("Eurocar")
-    _config_file = os.path.join(_config_dir, "config.json")
-    
-    _default_config = {
-        "paths": {
-            "orcamentos_pdf": str(Path.home()),
-            "orcamentos_editaveis": str(Path.home()),
-        }
-    }
-
-    def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super(ConfigManager, cls).__new__(cls)
-            # Garante que o diretório de configuração existe
-            os.makedirs(cls._config_dir, exist_ok=True)
-            cls._instance._load_config()
-        return cls._instance
-
-    def _load_config(self):
-        """Carrega configurações do arquivo ou cria um novo com padrões"""
-        try:
-            if os.path.exists(self._config_file):
-                with open(self._config_file, 'r', encoding='utf-8') as f:
-                    self.config = json.load(f)
-                self._merge_defaults()
-            else:
-                self.config = self._default_config.copy()
-                self._save_config()
-                self._create_dirs()
-        except Exception as e:
-            logging.error(f"Erro ao carregar configurações: {e}")
-            self.config = self._default_config.copy()
-
-    def _merge_defaults(self):
-        """Mescla configurações padrão com as existentes"""
-        for section, values in self._default_config.items():
-            if section not in self.config:
-                self.config[section] = values.copy()
-            else:
-                for key, value in values.items():
-                    if key not in self.config[section]:
-                        self.config[section][key] = value
-
-    def _save_config(self):
-        """Salva configurações no arquivo"""
-        try:
-            with open(self._config_file, 'w', encoding='utf-8') as f:
-                json.dump(self.config, f, indent=4, ensure_ascii=False)
-        except Exception as e:
-            logging.error(f"Erro ao salvar configurações: {e}")
-
-    def _create_dirs(self):
-        """Cria diretórios padrão se não existirem"""
-        for path in self.config["paths"].values():
-            os.makedirs(path, exist_ok=True)
-
-    def get(self, section: str, key: str) -> Any:
-        """Obtém um valor de configuração"""
-        return self.config.get(section, {}).get(key)
-
-    def set(self, section: str, key: str, value: Any, save: bool = True):
-        """Define um valor de configuração"""
-        if section not in self.config:
-            self.config[section] = {}
-        self.config[section][key] = value
-        if save:
-            self._save_config()
-
-    def update_section(self, section: str, values: Dict[str, Any], save: bool = True):
-        """Atualiza uma seção inteira de configurações"""
-        self.config[section] = values
-        if save:
-            self._save_config()
-
-    def reset_to_defaults(self):
-        """Restaura configurações padrão"""
-        self.config = self._default_config.copy()
-        self._save_config()
-        self._create_dirs()
+# ========== CONFIGURAÇÃO INICIAL ==========
+def configurar_aplicacao():
+    """Ajustes globais da interface, aplicados ao iniciar (e não ao importar o módulo)"""
+    configurar_logging()
+
+    # Força o ícone na barra de tarefas (Windows apenas)
+    if sys.platform == "win32":
+        import ctypes
+        myappid = 'sua.empresa.app.1.0'
+        ctypes.windll.shell32.SetCurrentProcessExplicitAppUserModelID(myappid)
+
+    # Configuração do tema
+    sg.theme_background_color(COR_FUNDO)
+    sg.theme_text_element_background_color(COR_FUNDO)
+    sg.theme_text_color(COR_TEXTO)
+    sg.theme_input_background_color("#2d2d2d")
+    sg.theme_input_text_color(COR_TEXTO_CAIXA)
+    sg.theme_element_background_color(COR_CARTAO)
+    sg.set_options(font=("Segoe UI", 11))
 
 def escolher_pastas_iniciais(config):
     layout = [
@@ -223,309 +150,441 @@ COR_BOTAO_SAIR = "#34495e"            # Azul petróleo escuro - botão de saída
 COR_BOTAO_CARREGAR = "#9C27B0"        # Roxo - botão para carregar orçamentos
 COR_BOTAO_CONFIG = "#607D8B"          # Cinza azulado - botão de configurações
 
-# Configuração do tema
-sg.theme_background_color(COR_FUNDO)
-sg.theme_text_element_background_color(COR_FUNDO)
-sg.theme_text_color(COR_TEXTO)
-sg.theme_input_background_color("#2d2d2d")
-sg.theme_input_text_color(COR_TEXTO_CAIXA)
-sg.theme_element_background_color(COR_CARTAO)
-sg.set_options(font=("Segoe UI", 11))
-
-# ========== CLASSE PDF ==========
-class EurocarPDF(FPDF):
-    def __init__(self):
-        super().__init__()
-        self.set_auto_page_break(auto=True, margin=25)
-        self.alias_nb_pages()
-        
-        # Define o caminho da logo de forma confiável
-        if getattr(sys, 'frozen', False):
-            # Se estiver rodando como executável compilado
-            base_path = sys._MEIPASS
-        else:
-            # Se estiver rodando no código fonte (desenvolvimento)
-            base_path = os.path.dirname(os.path.abspath(__file__))
-        
-        self.logo_path = os.path.join(base_path, 'assets', 'LOGO_Preta.png')
-        
-        # DEBUG: Verifica se a logo existe (opcional)
-        if not os.path.exists(self.logo_path):
-            print(f"⚠️ Logo não encontrada em: {self.logo_path}")
-
-    def header(self):
-        self.set_font('Arial', 'B', 17)
-        
-        if self.page_no() == 1:
-            if os.path.exists(self.logo_path):
-                self.image(self.logo_path, x=5, y=20, w=45)
-            else:
-                logging.warning(f"Arquivo de logo não encontrado em {self.logo_path}")
-            
-            self.set_xy(51, 10)
-            self.cell(0, 10, "EUROCAR", 0, 1, 'L')
-            self.set_x(51)
-            self.set_font('Arial', '', 10)
-            self.cell(0, 6, 'CNPJ: 59.152.856/0001-25', 0, 1, 'L')
-            self.set_x(51)
-            self.cell(0, 6, 'Vitaliano Pereira Serpa', 0, 1, 'L')
-            self.set_x(51)
-            self.cell(0, 6, 'Rua Juíz de Fora, 12 - Qd 98 - Jardim Guanabara', 0, 1, 'L')
-            self.set_x(51)
-            self.cell(0, 6, 'Contato: (62) 9 9415-9037', 0, 1, 'L')
-            
-            self.line(10, 48, 200, 48)
-            self.ln(5)
-        else:
-            if os.path.exists(self.logo_path):
-                self.image(self.logo_path, x=10, y=10, w=30)
-            self.ln(15)
-
-    def footer(self):
-        # Posiciona o rodapé 15mm a partir do final da página
-        self.set_y(-15)
-        self.set_font('Arial', '', 10)
-        
-        # Formata a data
-        meses = {
-            1: 'Janeiro', 2: 'Fevereiro', 3: 'Março', 4: 'Abril',
-            5: 'Maio', 6: 'Junho', 7: 'Julho', 8: 'Agosto',
-            9: 'Setembro', 10: 'Outubro', 11: 'Novembro', 12: 'Dezembro'
-        }
-        dias_semana = [
-            'Segunda-feira', 'Terça-feira', 'Quarta-feira',
-            'Quinta-feira', 'Sexta-feira', 'Sábado', 'Domingo'
-        ]
-        
-        hoje = datetime.now()
-        nome_dia = dias_semana[hoje.weekday()]
-        nome_mes = meses[hoje.month]
-        
-                # Número de páginas (linha inferior)
-        pagina_texto = f"Página {self.page_no()} de {{nb}}"
-        self.cell(0, 5, pagina_texto, 0, 1, 'R')  # Mesmo alinhamento da data
-
-        # Data formatada (linha superior)
-        data_formatada = f"{nome_dia}, {hoje.day} de {nome_mes} de {hoje.year}"
-        self.cell(0, 5, data_formatada, 0, 0, 'R')  # Alinhado à direita, quebra linha após
-        
-
-
 # ========== FUNÇÕES UTILITÁRIAS ==========
 def converter_moeda_input(valor_str: str) -> Decimal:
     """
-    Converte string brasileira (ex: 1.250,50) para Decimal.
-    Resolve o problema de inputs com ponto de milhar.
+    Converte string digitada (ex: 1.250,50 ou 1250.50) para Decimal.
+    Levanta ValueError se o formato for inválido.
     """
-    try:
-        if not valor_str:
-            return Decimal("0.00")
-        # Remove pontos de milhar e troca vírgula decimal por ponto
-        limpo = valor_str.replace('.', '').replace(',', '.')
-        return Decimal(limpo)
-    except Exception:
-        raise ValueError("Formato de valor inválido")
+    return converter_brl(valor_str)
 
 def formatar_moeda(valor) -> str:
-    try:
-        valor = Decimal(valor)
-        valor = valor.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
-        return f"R$ {valor:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
-    except:
-        return "R$ 0,00"
+    """Formata valor como R$ 1.250,50 (sem usar locale; seguro entre threads)"""
+    return formatar_brl(valor)
 
 
-def atualizar_totais(window, values, itens):
-    """Atualiza os totais usando Decimal para precisão"""
+def ler_mao_obra(valor) -> Dinheiro:
+    """Converte o conteúdo do campo de mão de obra, tratando vazio/inválido como zero"""
     try:
-        # Soma usando Decimal
-        total_pecas = sum(
-            Decimal(item['quantidade']) * Decimal(item['valor'])
-            for item in itens
-        )
-        
-        try:
-            # Garante que a mão de obra seja tratada corretamente
-            mao_obra_val = values["-MAO_OBRA-"]
-            if isinstance(mao_obra_val, (int, float)):
-                mao_obra = Decimal(str(mao_obra_val))
-            else:
-                mao_obra = converter_moeda_input(mao_obra_val)
-        except ValueError:
-            mao_obra = Decimal("0.00")
-            
-        window["-TOTAL_PECAS-"].update(formatar_moeda(total_pecas))
-        window["-TOTAL_GERAL-"].update(formatar_moeda(total_pecas + mao_obra))
+        return Dinheiro.de_valor(converter_moeda_input(valor))
+    except ValueError:
+        return Dinheiro(0)
+
+def ler_quantidade(valor: str) -> Quantidade:
+    """Converte a quantidade digitada (2, 4,5 ou 4.5); vazio vale 1"""
+    quantidade = Quantidade.de_valor(valor.strip() or 1)
+    if quantidade.milesimos <= 0:
+        raise ValueError("A quantidade deve ser maior que zero")
+    return quantidade
+
+# Campo do cliente (como no arquivo salvo) -> chave do elemento na janela principal
+CAMPOS_JANELA = {"nome": "-NOME-", "telefone": "-TEL-", "veiculo": "-VEICULO-", "placa": "-PLACA-"}
+
+def preencher_orcamento(window, tabela, campos: Dict[str, str], orcamento: Orcamento):
+    """Mostra na janela um orçamento carregado de arquivo ou restaurado do diário"""
+    for campo, chave in CAMPOS_JANELA.items():
+        window[chave].update(campos.get(campo, ""))
+    window["-MAO_OBRA-"].update(formatar_valor(orcamento.mao_obra))
+
+    # Atualização da tabela (reconstrução completa só no carregamento)
+    tabela.recarregar(orcamento)
+    atualizar_totais(window, orcamento)
+
+def atualizar_totais(window, orcamento: Orcamento):
+    """Exibe os totais mantidos pelo modelo do orçamento"""
+    try:
+        window["-TOTAL_PECAS-"].update(formatar_moeda(orcamento.total_pecas))
+        window["-TOTAL_GERAL-"].update(formatar_moeda(orcamento.total_geral))
     except Exception as e:
         logging.error(f"Erro ao atualizar totais: {e}")
         # O print abaixo ajuda a debugar se der erro
         print(f"Erro detalhado: {e}")
 
-def criar_pdf(dados: Dict[str, Any]) -> EurocarPDF:
-    """Cria um PDF com os dados do orçamento"""
-    pdf = EurocarPDF()
-    pdf.add_page()
-
-    # Dados do cliente
-    pdf.set_font("Arial", "B", 12)
-    pdf.cell(20, 10, "Cliente:", 0, 0, 'L')
-    pdf.set_font("Arial", "", 12)
-    pdf.cell(60, 10, dados.get('nome', 'Não informado'), 0, 0, 'L')
-
-    pdf.set_font("Arial", "B", 12)
-    pdf.cell(70, 10, "Veículo:", 0, 0, 'R')
-    pdf.set_font("Arial", "", 12)
-    pdf.cell(0, 10, dados.get('veiculo', 'Não informado'), 0, 1, 'C')
-
-    pdf.set_font("Arial", "B", 12)
-    pdf.cell(20, 10, "Contato:", 0, 0, 'L')
-    pdf.set_font("Arial", "", 12)
-    pdf.cell(60, 10, dados.get('telefone', 'Não informado'), 0, 0, 'L')
-
-    pdf.set_font("Arial", "B", 12)
-    pdf.cell(68, 10, "Placa:", 0, 0, 'R')
-    pdf.set_font("Arial", "", 12)
-    pdf.cell(0, 10, dados.get('placa', 'Não informado'), 0, 1, 'C')
-
-    pdf.line(10, pdf.get_y(), 200, pdf.get_y())
-    pdf.ln(1)
-
-    pdf.set_font("Arial", "B", 12)
-    pdf.cell(100, 10, f"ORÇAMENTO Nº: {datetime.now().strftime('%H%M%S%d%m%y')}", 0, 0, 'L')
-    pdf.cell(0, 10, f"Criado em: {datetime.now().strftime('%d/%m/%Y')}", 0, 1, 'R')
-    pdf.ln(1)
-
-    pdf.line(10, pdf.get_y(), 200, pdf.get_y())
-    pdf.ln(10)
-
-    # Tabela de itens
-    pdf.set_font("Arial", "B", 12)
-    col_widths = [10, 100, 15, 27, 38]
-
-    def draw_table_header():
-        pdf.cell(col_widths[0], 10, "Its", "B", 0, "L")
-        pdf.cell(col_widths[1], 10, "Descrição", "B", 0, "L")
-        pdf.cell(col_widths[2], 10, "Qtd", "B", 0, "C")
-        pdf.cell(col_widths[3], 10, "Unitário", "B", 0, "C")
-        pdf.cell(col_widths[4], 10, "Total", "B", 1, "C")
-
-    draw_table_header()
-
-    pdf.set_font("Arial", "", 12)
-    
-    # --- CORREÇÃO 1: Inicializa com Decimal ---
-    total_pecas = Decimal("0.00") 
+class SugestoesItem:
+    """
+    Lista de sugestões sob a descrição nas janelas de item: a cada tecla busca
+    no histórico, e escolher uma linha preenche a descrição e o último preço.
+    """
 
-    for idx, item in enumerate(dados['itens']):
-        if pdf.get_y() > 260 - (3 * 10):
-            pdf.add_page()
-            draw_table_header()
-        
-        # --- CORREÇÃO 2: Converte tudo para Decimal antes de calcular ---
-        quantidade = Decimal(str(item.get('quantidade', 1)))
-        valor_unitario = Decimal(str(item.get('valor', 0)))
-        valor_total = quantidade * valor_unitario
-        total_pecas += valor_total
-
-        pdf.cell(col_widths[0], 10, f"{idx+1}.", 0, 0, "C")
-        pdf.cell(col_widths[1], 10, item.get('descricao', ''), 0, 0, "L")
-        pdf.cell(col_widths[2], 10, str(quantidade), 0, 0, "C")
-        pdf.cell(col_widths[3], 10, formatar_moeda(valor_unitario), 0, 0, "C")
-        pdf.cell(col_widths[4], 10, formatar_moeda(valor_total), 0, 1, "C")
-
-    if pdf.get_y() > 255:
-        pdf.add_page()
-
-    pdf.set_y(-60)
-    pdf.line(10, pdf.get_y(), 200, pdf.get_y())
-    pdf.ln(5)
-    
-    pdf.set_font("Arial", "", 10)
-    pdf.cell(150, 8, "TOTAL PEÇAS:", 0, 0, "L")
-    pdf.cell(30, 8, formatar_moeda(total_pecas), 0, 1, "R")
-    
-    # --- CORREÇÃO 3: Converte Mão de Obra para Decimal ---
-    try:
-        val_mo = dados.get('mao_obra', 0)
-        mao_obra = Decimal(str(val_mo))
-    except:
-        mao_obra = Decimal("0.00")
-        
-    pdf.cell(150, 8, "MÃO DE OBRA:", 0, 0, "L")
-    pdf.cell(30, 8, formatar_moeda(mao_obra), 0, 1, "R")
-    
-    pdf.line(10, pdf.get_y(), 200, pdf.get_y())
-    pdf.ln(5)
-    
-    # Agora a soma funciona (Decimal + Decimal)
-    total_geral = total_pecas + mao_obra
-    
-    pdf.set_font("Arial", "B", 10)
-    pdf.cell(150, 8, "TOTAL GERAL:", 0, 0, "L")
-    pdf.cell(30, 8, formatar_moeda(total_geral), 0, 1, "R")
+    def __init__(self, historico: IndiceDescricoes, chave_desc: str, chave_valor: str,
+                chave_lista: str = "-SUGESTOES-"):
+        self.historico = historico
+        self.chave_desc = chave_desc
+        self.chave_valor = chave_valor
+        self.chave_lista = chave_lista
+        self.sugestoes: List[Sugestao] = []
+
+    def elemento(self):
+        return sg.Listbox([], key=self.chave_lista, size=(60, 4), enable_events=True,
+                        no_scrollbar=True, background_color="white", text_color=COR_TEXTO_CAIXA)
+
+    @staticmethod
+    def _texto(sugestao: Sugestao) -> str:
+        return (f"{sugestao.descricao}  —  último {formatar_moeda(sugestao.ultimo)}"
+                f"  |  mediana {formatar_moeda(sugestao.mediana)} ({sugestao.ocorrencias}x)")
+
+    def tratar(self, janela, evento, valores) -> bool:
+        """Trata os eventos da descrição e da lista; devolve True se o evento era dela"""
+        if evento == self.chave_desc:
+            self.sugestoes = self.historico.sugerir(valores[self.chave_desc])
+            janela[self.chave_lista].update([self._texto(s) for s in self.sugestoes])
+            return True
+        if evento == self.chave_lista:
+            indices = janela[self.chave_lista].get_indexes()
+            if indices and indices[0] < len(self.sugestoes):
+                escolhida = self.sugestoes[indices[0]]
+                janela[self.chave_desc].update(escolhida.descricao)
+                janela[self.chave_valor].update(formatar_valor(escolhida.ultimo))
+                janela[self.chave_valor].set_focus()
+            return True
+        return False
+
+class TabelaItens:
+    """
+    Mantém a tabela -ITENS- sincronizada com o orçamento alterando só as linhas afetadas.
 
-    return pdf
-def sanitizar_nome_arquivo(nome: str) -> str:
-    """Remove caracteres inválidos de nomes de arquivos"""
-    return re.sub(r'[\\/:*?"<>|]', '', nome)
+    As células formatadas de cada item ficam em cache (chave: o próprio item, por identidade), então
+    mover ou editar uma linha não reformata a tabela inteira. As linhas do Treeview
+    usam o índice como iid/tag (igual ao sg.Table.update), o que preserva as cores
+    alternadas ao reescrever valores no lugar.
+    """
+
+    def __init__(self, elemento: sg.Table, orcamento: Orcamento):
+        self.elemento = elemento
+        self.orcamento = orcamento
+        self._cache: Dict[Item, Tuple] = {}
+
+    def _celulas(self, indice: int) -> Tuple:
+        item = self.orcamento[indice]
+        celulas = self._cache.get(item)
+        if celulas is None:
+            celulas = (item.descricao, item.quantidade,
+                    formatar_moeda(item.valor), formatar_moeda(item.total))
+            self._cache[item] = celulas
+        return celulas
+
+    def _linha(self, indice: int) -> List:
+        return [f"{indice+1}.", *self._celulas(indice)]
+
+    def _cor_fundo(self, indice: int):
+        el = self.elemento
+        if el.AlternatingRowColor is not None and indice % 2 == 0:
+            return el.AlternatingRowColor
+        return el.BackgroundColor
+
+    def _reescrever(self, indice: int):
+        linha = self._linha(indice)
+        self.elemento.Values[indice] = linha
+        self.elemento.TKTreeview.item(indice + 1, values=linha)
+
+    def recarregar(self, orcamento: Optional[Orcamento] = None):
+        """Reconstrói a tabela inteira (usado ao carregar um orçamento)"""
+        if orcamento is not None:
+            self.orcamento = orcamento
+        self._cache.clear()
+        self.elemento.update(values=[self._linha(i) for i in range(len(self.orcamento))])
+
+    def adicionado(self, indice: int):
+        """Insere a linha de um item recém-adicionado no final"""
+        el = self.elemento
+        linha = self._linha(indice)
+        iid = el.TKTreeview.insert('', 'end', iid=indice + 1, values=linha, tag=indice)
+        el.TKTreeview.tag_configure(indice, background=self._cor_fundo(indice))
+        el.tree_ids.append(iid)
+        el.Values.append(linha)
+
+    def editado(self, indice: int, item_antigo: Item):
+        self._cache.pop(item_antigo, None)
+        self._reescrever(indice)
+
+    def trocados(self, a: int, b: int):
+        self._reescrever(a)
+        self._reescrever(b)
+
+    def removido(self, indice: int, item_removido: Item):
+        """Descarta a última linha e renumera apenas as que vinham depois da removida"""
+        el = self.elemento
+        self._cache.pop(item_removido, None)
+        ultimo = len(el.Values) - 1
+        el.TKTreeview.delete(ultimo + 1)
+        el.tree_ids.pop()
+        el.Values.pop()
+        for i in range(indice, ultimo):
+            self._reescrever(i)
+        el.SelectedRows = []
 
-def salvar_orcamento_editavel(dados: Dict[str, Any]) -> str:
-    """Salva os dados do orçamento em um arquivo JSON convertendo Decimals para float"""
-    config = ConfigManager()
-    try:
-        nome_cliente = sanitizar_nome_arquivo(dados['nome'].strip())
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        nome_arquivo = f"Orcamento_{nome_cliente}_{timestamp}.json"
-        caminho_completo = os.path.join(config.get("paths", "orcamentos_editaveis"), nome_arquivo)
-        
-        os.makedirs(config.get("paths", "orcamentos_editaveis"), exist_ok=True)
-        
-        # PREPARAÇÃO DOS DADOS: Converte Decimal para float para o JSON aceitar
-        dados_json = dados.copy()
-        itens_json = []
-        for item in dados['itens']:
-            novo_item = item.copy()
-            # Converte valor e quantidade para float/int se forem Decimal
-            if isinstance(novo_item.get('valor'), Decimal):
-                novo_item['valor'] = float(novo_item['valor'])
-            if isinstance(novo_item.get('quantidade'), Decimal):
-                novo_item['quantidade'] = int(novo_item['quantidade'])
-            itens_json.append(novo_item)
-        
-        dados_json['itens'] = itens_json
-        
-        # Converte a mão de obra também
-        if isinstance(dados_json.get('mao_obra'), Decimal):
-            dados_json['mao_obra'] = float(dados_json['mao_obra'])
-            
-        with open(caminho_completo, 'w', encoding='utf-8') as f:
-            json.dump(dados_json, f, ensure_ascii=False, indent=4)
-            
-        return caminho_completo
-    except Exception as e:
-        logging.error(f"Erro ao salvar arquivo editável: {e}")
-        # Não damos popup de erro aqui para não assustar o usuário se o PDF já deu certo
-        print(f"Erro silencioso ao salvar JSON: {e}") 
-        return None
-    
 def carregar_orcamento_editavel() -> Dict[str, Any]:
     """Permite carregar um orçamento salvo anteriormente"""
     config = ConfigManager()
     caminho = sg.popup_get_file("Selecione o orçamento para editar", 
-                                file_types=(("Arquivos de Orçamento", "*.json"),),
+                                file_types=(("Arquivos de Orçamento", "*.json *.json.gz"),),
                                 default_path=config.get("paths", "orcamentos_editaveis"))
     if not caminho:
         return None
     
     try:
-        with open(caminho, 'r', encoding='utf-8') as f:
-            dados = json.load(f)
+        dados, _ = ler_orcamento(caminho)
         return dados
     except Exception as e:
         logging.error(f"Erro ao carregar arquivo: {e}")
         sg.popup_error(f"Erro ao carregar arquivo:\n{str(e)}")
         return None
 
+def abrir_catalogo(config):
+    """Abre o índice da pasta de editáveis, sincronizando apenas o que mudou"""
+    from eurocar.catalogo import CatalogoOrcamentos
+
+    catalogo = CatalogoOrcamentos(
+        config.get("paths", "orcamentos_editaveis"),
+        os.path.join(pasta_config(), "catalogo.sqlite3"))
+    catalogo.sincronizar()
+    return catalogo
+
+def carregar_historico(config, historico: IndiceDescricoes) -> int:
+    """Preenche as sugestões com os itens de todos os orçamentos salvos (roda em thread)"""
+    try:
+        catalogo = abrir_catalogo(config)
+        try:
+            historico.carregar(catalogo.historico_itens())
+        finally:
+            catalogo.fechar()
+    except Exception as e:
+        logging.error(f"Erro ao carregar histórico de itens: {e}")
+    return len(historico)
+
+def _tarefa_importar_csv(window, caminho: str) -> Tuple[Any, Optional[str]]:
+    """Lê o CSV fora da thread do Tk; devolve (ResultadoImportacao, erro)"""
+    from eurocar.importacao import importar_csv
+
+    nome = os.path.basename(caminho)
+    try:
+        resultado = importar_csv(caminho, lambda linha: window.write_event_value(
+            "-IMPORTACAO_PROGRESSO-", f"Importando {nome}: linha {linha}..."))
+        return resultado, None
+    except Exception as e:
+        logging.error(f"Erro ao importar CSV: {e}")
+        return None, str(e)
+
+def mostrar_resultado_importacao(resultado, limite_erros: int = 200):
+    """Resumo da importação com os erros linha a linha"""
+    mensagem = f"{len(resultado.itens)} item(ns) importado(s) de {resultado.linhas} linha(s)."
+    if not resultado.erros:
+        sg.popup_ok(mensagem, title="Importação de Itens")
+        return
+    linhas = [f"Linha {erro.linha}: {erro.mensagem}" for erro in resultado.erros[:limite_erros]]
+    if len(resultado.erros) > limite_erros:
+        linhas.append(f"... e mais {len(resultado.erros) - limite_erros} linha(s) com erro")
+    sg.popup_scrolled(mensagem, f"{len(resultado.erros)} linha(s) com erro (não importadas):", "",
+                    "\n".join(linhas), title="Importação de Itens", size=(80, 20))
+
+def _tarefa_relatorio(config) -> Tuple[Any, float, Optional[str]]:
+    """Sincroniza o catálogo e agrega os orçamentos salvos (roda em thread); devolve (Relatorio, segundos, erro)"""
+    from eurocar.relatorios import gerar_relatorio
+
+    inicio = time.perf_counter()
+    try:
+        catalogo = abrir_catalogo(config)
+        try:
+            relatorio = gerar_relatorio(catalogo)
+        finally:
+            catalogo.fechar()
+        return relatorio, time.perf_counter() - inicio, None
+    except Exception as e:
+        logging.error(f"Erro ao gerar relatório: {e}")
+        return None, time.perf_counter() - inicio, str(e)
+
+def janela_relatorio(relatorio, segundos: float):
+    """Resumo dos orçamentos salvos por mês, peças e veículos, com exportação para CSV"""
+    from eurocar.relatorios import exportar_csv, formatar_percentual
+
+    def tabela(valores, cabecalhos, larguras, chave):
+        return sg.Table(values=valores, headings=cabecalhos, key=chave, col_widths=larguras,
+                        auto_size_columns=False, num_rows=14, justification='left',
+                        header_background_color=COR_PRIMARIA, header_text_color=COR_TEXTO,
+                        background_color=COR_CARTAO, alternating_row_color='#222222',
+                        expand_x=True, expand_y=True)
+
+    meses = [[m.mes, m.orcamentos, formatar_moeda(m.total), formatar_moeda(m.pecas),
+            formatar_moeda(m.mao_obra), formatar_moeda(m.ticket_medio)] for m in reversed(relatorio.meses)]
+    pecas = [[p.descricao, str(p.quantidade), formatar_moeda(p.total), p.orcamentos]
+            for p in relatorio.pecas_mais_vendidas]
+    veiculos = [[v.veiculo, v.orcamentos, formatar_moeda(v.total)] for v in relatorio.veiculos]
+
+    resumo = (f"{relatorio.orcamentos} orçamento(s)   |   Total orçado: {formatar_moeda(relatorio.total)}"
+            f"   |   Ticket médio: {formatar_moeda(relatorio.ticket_medio)}")
+    divisao = (f"Peças: {formatar_moeda(relatorio.pecas)} ({formatar_percentual(relatorio.percentual_pecas)})"
+            f"   |   Mão de obra: {formatar_moeda(relatorio.mao_obra)} "
+            f"({formatar_percentual(relatorio.percentual_mao_obra)})")
+    rodape = f"Atualizado em {segundos:.1f} s"
+    if relatorio.ilegiveis:
+        rodape += f"   |   {relatorio.ilegiveis} arquivo(s) ilegível(is) fora das somas"
+
+    layout = [
+        [sg.Text(resumo, font=("Arial", 11, "bold"))],
+        [sg.Text(divisao)],
+        [sg.TabGroup([[
+            sg.Tab("Por mês", [[tabela(meses, ["Mês", "Orçamentos", "Total", "Peças", "Mão de obra", "Ticket médio"],
+                                    [9, 10, 14, 14, 14, 14], "-MESES-")]]),
+            sg.Tab("Peças", [[tabela(pecas, ["Peça", "Quantidade", "Total", "Orçamentos"],
+                                    [40, 10, 14, 10], "-PECAS-")]]),
+            sg.Tab("Veículos", [[tabela(veiculos, ["Veículo", "Orçamentos", "Total"],
+                                        [30, 10, 14], "-VEICULOS-")]]),
+        ]], expand_x=True, expand_y=True)],
+        [sg.Text(rodape, text_color=COR_AVISO)],
+        [sg.Button("Exportar CSV", key="-EXPORTAR-", button_color=(COR_TEXTO, COR_BOTAO_ADD)),
+        sg.Button("Fechar", key="-FECHAR-", button_color=(COR_TEXTO, COR_BOTAO_SAIR))]
+    ]
+
+    janela = sg.Window("Relatórios", layout, modal=True, icon=icon_path, resizable=True, finalize=True)
+    while True:
+        ev, _ = janela.read()
+        if ev in (sg.WINDOW_CLOSED, "-FECHAR-"):
+            break
+        if ev == "-EXPORTAR-":
+            caminho = sg.popup_get_file(
+                "Salvar relatório como", save_as=True, no_window=True, default_extension=".csv",
+                file_types=(("Planilhas CSV", "*.csv"),),
+                default_path=f"Relatorio_Eurocar_{datetime.now().strftime('%Y%m%d')}.csv",
+                icon=icon_path)
+            if not caminho:
+                continue
+            try:
+                exportar_csv(relatorio, caminho)
+                sg.popup_ok(f"Relatório exportado para:\n{caminho}", title="Relatórios")
+            except OSError as e:
+                logging.error(f"Erro ao exportar relatório: {e}")
+                sg.popup_error(f"Erro ao exportar relatório:\n{str(e)}", title="Erro")
+    janela.close()
+
+def janela_catalogo(config) -> Optional[Tuple[str, bool]]:
+    """
+    Lista pesquisável dos orçamentos salvos.
+    Retorna (caminho, precisa_confirmar) ou None se o usuário cancelar.
+    """
+    try:
+        catalogo = abrir_catalogo(config)
+    except Exception as e:
+        logging.error(f"Erro ao abrir catálogo: {e}")
+        sg.popup_error(f"Erro ao abrir catálogo de orçamentos:\n{str(e)}", title="Erro")
+        return None
+
+    def linhas(resultados):
+        return [[r["data"][:16], r["nome"], r["veiculo"], r["placa"], r["qtd_itens"],
+                formatar_moeda(r["total"]) if not r["erro"] else "⚠ ilegível"]
+                for r in resultados]
+
+    resultados = catalogo.buscar()
+    layout = [
+        [sg.Text("Buscar:"), sg.Input(key="-BUSCA-", size=40, enable_events=True, focus=True,
+                                    background_color="white", text_color=COR_TEXTO_CAIXA)],
+        [sg.Table(values=linhas(resultados),
+                headings=["Data", "Cliente", "Veículo", "Placa", "Itens", "Total"],
+                key="-RESULTADOS-",
+                col_widths=[15, 25, 15, 9, 5, 13],
+                auto_size_columns=False,
+                num_rows=15,
+                justification='left',
+                select_mode=sg.TABLE_SELECT_MODE_BROWSE,
+                bind_return_key=True,
+                header_background_color=COR_PRIMARIA,
+                header_text_color=COR_TEXTO,
+                background_color=COR_CARTAO,
+                alternating_row_color='#222222',
+                expand_x=True, expand_y=True)],
+        [sg.Text(f"{len(resultados)} orçamento(s)", key="-CONTAGEM-")],
+        [sg.Button("Carregar", key="-ABRIR-", button_color=(COR_TEXTO, COR_BOTAO_ADD)),
+        sg.Button("Procurar arquivo...", key="-ARQUIVO-", button_color=(COR_TEXTO, COR_BOTAO_CARREGAR)),
+        sg.Button("Cancelar", key="-CANCELAR-", button_color=(COR_TEXTO, COR_BOTAO_SAIR))]
+    ]
+
+    janela = sg.Window("Orçamentos Salvos", layout, modal=True, icon=icon_path,
+                    resizable=True, finalize=True)
+    retorno = None
+    try:
+        while True:
+            ev, vals = janela.read()
+            if ev in (sg.WINDOW_CLOSED, "-CANCELAR-"):
+                break
+            if ev == "-BUSCA-":
+                resultados = catalogo.buscar(vals["-BUSCA-"])
+                janela["-RESULTADOS-"].update(values=linhas(resultados))
+                janela["-CONTAGEM-"].update(f"{len(resultados)} orçamento(s)")
+            elif ev in ("-ABRIR-", "-RESULTADOS-"):
+                if not vals["-RESULTADOS-"]:
+                    sg.popup_error("Selecione um orçamento!", title="Erro")
+                    continue
+                retorno = (resultados[vals["-RESULTADOS-"][0]]["caminho"], False)
+                break
+            elif ev == "-ARQUIVO-":
+                caminho = sg.popup_get_file(
+                    "Selecione o orçamento (.json / .json.gz)",
+                    file_types=(("Arquivos de Orçamento", "*.json *.json.gz"), ("Todos os arquivos", "*.*")),
+                    default_path=config.get("paths", "orcamentos_editaveis"),
+                    no_window=True,
+                    icon=icon_path
+                )
+                if caminho:
+                    retorno = (caminho, True)
+                    break
+    finally:
+        janela.close()
+        catalogo.fechar()
+    return retorno
+
+def confirmar_carregamento(caminho: str) -> bool:
+    """Mostra o resumo de um arquivo escolhido fora do catálogo e pede confirmação"""
+    # Pré-visualização segura
+    try:
+        # Só o cabeçalho do arquivo é lido, sem decodificar os itens
+        resumo = ler_resumo(caminho)
+
+        preview_info = [
+            f"Arquivo: {os.path.basename(caminho)}",
+            f"Cliente: {resumo['nome'] or 'Não informado'}",
+            f"Veículo: {resumo['veiculo'] or 'Não informado'}",
+            f"Itens: {resumo['qtd_itens']}",
+            f"Total: {formatar_moeda(Dinheiro(resumo['total_pecas']))}"
+        ]
+    except Exception as e:
+        preview_info = [
+            f"Arquivo: {os.path.basename(caminho)}",
+            "⚠ Não foi possível ler o arquivo",
+            f"Erro: {str(e)}"
+        ]
+
+    # Janela de confirmação personalizada
+    layout_confirmacao = [
+        [sg.Text("Confirmar carregamento?", font=("Segoe UI", 12))],
+        [sg.Multiline(
+            "\n".join(preview_info),
+            size=(40, 6),
+            disabled=True,
+            background_color="#f0f0f0"
+        )],
+        [sg.Button("Sim", key="-CONFIRMAR-", button_color=(COR_TEXTO, COR_BOTAO_ADD)),
+        sg.Button("Não", key="-CANCELAR-", button_color=(COR_TEXTO, COR_BOTAO_SAIR))]
+    ]
+
+    janela_confirmacao = sg.Window(
+        "Confirmar",
+        layout_confirmacao,
+        modal=True,
+        icon=icon_path,
+        element_justification='c'
+    )
+
+    confirmado = False
+    while True:
+        event_confirm, _ = janela_confirmacao.read()
+        if event_confirm in (sg.WINDOW_CLOSED, "-CANCELAR-"):
+            break
+        elif event_confirm == "-CONFIRMAR-":
+            confirmado = True
+            break
+    janela_confirmacao.close()
+
+    return confirmado
+
 def create_settings_window(config):
     """Cria janela de configurações"""
     layout = [
@@ -538,8 +597,18 @@ def create_settings_window(config):
                 [sg.Text("Pasta para Orçamentos Editáveis:")],
                 [sg.Input(config.get("paths", "orcamentos_editaveis"), key="-EDIT_PATH-", background_color='white'), 
                 sg.FolderBrowse("📁", button_color=COR_PRIMARIA, size=(6, 1))],
+
+                [sg.Checkbox("PDF compacto (arquivo menor para enviar por WhatsApp)", key="-PDF_COMPACTO-",
+                            default=bool(config.get("arquivos", "pdf_compacto")))],
                 
             ]),
+            sg.Tab("Desempenho", [
+                [sg.Checkbox("Registrar o tempo das operações (telemetria)", key="-TELEMETRIA-",
+                            default=bool(config.get("telemetria", "ativa")))],
+                [sg.Text("Os tempos vão para um log local, sem envio pela internet:")],
+                [sg.Text(os.path.join(pasta_logs(), telemetria.NOME_ARQUIVO), text_color=COR_AVISO)],
+                [sg.Text("Resumo: python main.py --telemetria")],
+            ]),
         ]], expand_x=True, expand_y=True, background_color=COR_FUNDO)],
         
         [sg.HorizontalSeparator(color=COR_PRIMARIA)],
@@ -572,11 +641,11 @@ def create_main_window(config):
             [sg.Text("Dados do Cliente", font=("Segoe UI", 12, "bold"), 
                     text_color=COR_PRIMARIA, background_color=COR_CARTAO)],
             [sg.Text("Nome:", size=8, background_color=COR_CARTAO), 
-            sg.Input(key="-NOME-", size=40, border_width=1, background_color='white')],
+            sg.Input(key="-NOME-", size=40, border_width=1, background_color='white', enable_events=True)],
             [sg.Text("Telefone:", size=8, background_color=COR_CARTAO), 
             sg.Input(key="-TEL-", size=20, border_width=1, background_color='white', enable_events=True)],
             [sg.Text("Veículo:", size=8, background_color=COR_CARTAO), 
-            sg.Input(key="-VEICULO-", size=20, border_width=1, background_color='white'),
+            sg.Input(key="-VEICULO-", size=20, border_width=1, background_color='white', enable_events=True),
             sg.Text("Placa:", pad=(10, 0), background_color=COR_CARTAO), 
             sg.Input(key="-PLACA-", size=10, border_width=1, background_color='white', enable_events=True)]
         ], pad=(20, 15), background_color=COR_CARTAO, expand_x=True)],
@@ -622,7 +691,9 @@ def create_main_window(config):
                 sg.Button("↑", button_color=(COR_TEXTO, COR_BOTAO_CONFIG), 
                     pad=(2, 10), size=(4, 1), key="-UP-", tooltip="Mover item para cima"),
                 sg.Button("↓", button_color=(COR_TEXTO, COR_BOTAO_CONFIG), 
-                    pad=((2, 10), 10), size=(4, 1), key="-DOWN-", tooltip="Mover item para baixo")],
+                    pad=((2, 10), 10), size=(4, 1), key="-DOWN-", tooltip="Mover item para baixo"),
+                sg.Button("Importar CSV", button_color=(COR_TEXTO, COR_BOTAO_CARREGAR), 
+                    pad=(5, 10), size=12, key="-IMPORTAR-", tooltip="Importar itens de uma planilha CSV (Ctrl+I)")],
             ], justification='center', expand_x=True, background_color=COR_CARTAO)]
         ], pad=(20, 15), background_color=COR_CARTAO, expand_x=True, expand_y=True)],
         
@@ -633,7 +704,10 @@ def create_main_window(config):
             [sg.Button("Pré-visualizar", button_color=(COR_TEXTO, COR_BOTAO_PRE_VIZUALIZAR), pad=5, size=15),
             sg.Button("Gerar PDF", button_color=(COR_TEXTO, COR_BOTAO_GERAR_PDF), pad=5, size=15, key="-PDF-"),
             sg.Button("Carregar Orç.", button_color=(COR_TEXTO, COR_BOTAO_CARREGAR), pad=5, size=15, key="-LOAD-"),
-            sg.Button("Sair", button_color=(COR_TEXTO, COR_BOTAO_SAIR), pad=5, size=15)]
+            sg.Button("Relatórios", button_color=(COR_TEXTO, COR_BOTAO_CONFIG), pad=5, size=15, key="-RELATORIO-"),
+            sg.Button("Sair", button_color=(COR_TEXTO, COR_BOTAO_SAIR), pad=5, size=15)],
+            [sg.Text("", key="-STATUS-", text_color=COR_AVISO, background_color=COR_FUNDO,
+                    font=("Segoe UI", 9), expand_x=True, justification='center')]
         ], justification='center', expand_x=True, background_color=COR_FUNDO)]
     ]
 
@@ -655,63 +729,186 @@ def create_main_window(config):
 
     return window
 
-def checar_atualizacao():
-    """Verifica versão no Google Drive e baixa direto"""
-    
-    # --- SUAS CONFIGURAÇÕES ---
-    VERSAO_ATUAL = "1.2" 
-    
-    # 1. ID do arquivo version.txt (Mantivemos o mesmo)
-    ID_ARQUIVO_VERSAO = "1Vqrrv9H_y43cD6koq7uWF_3UbeCAvdJJ" 
-    
-    # 2. ID do App executável (NOVO ID ATUALIZADO)
-    ID_DO_APP = "10a9nUhJGASKGcFF05JxmbffPJN9igF-Z"
-    
-    # Monta o Link de Download Direto
-    LINK_DOWNLOAD_DIRETO = f"https://drive.google.com/uc?export=download&id={ID_DO_APP}"
-    # --------------------------
+# ========== GERAÇÃO DE PDF EM SEGUNDO PLANO ==========
+def chave_orcamento(dados: Dict[str, Any]) -> Tuple:
+    """Identifica o conteúdo do orçamento para barrar envios repetidos do mesmo"""
+    return (dados["nome"], dados["telefone"], dados["veiculo"], dados["placa"], str(dados["mao_obra"]),
+            tuple((i.descricao, i.quantidade, str(i.valor)) for i in dados["itens"]))
+
+def montar_dados_orcamento(values, orcamento: Orcamento) -> Tuple[Dict[str, Any], Orcamento]:
+    """Dados do cliente + cópia do orçamento: a edição pode continuar enquanto o PDF é gerado"""
+    copia = orcamento.copiar()
+    dados = {
+        "nome": values["-NOME-"],
+        "telefone": values["-TEL-"],
+        "veiculo": values["-VEICULO-"],
+        "placa": values["-PLACA-"],
+        "mao_obra": copia.mao_obra,
+        "itens": copia.itens
+    }
+    return dados, copia
+
+def abrir_arquivo(caminho: str):
+    """Abre o arquivo no programa padrão do sistema"""
+    if sys.platform == "win32":
+        os.startfile(caminho)
+    else:
+        os.system(f'xdg-open "{caminho}"')
+
+def _tarefa_gerar_pdf(window, cache, chave: Tuple, dados: Dict[str, Any], orcamento: Orcamento,
+                    caminho_pdf: str, historico: Optional[IndiceDescricoes] = None, compacto: bool = False):
+    """Renderiza e grava os arquivos fora da thread do Tk, avisando cada etapa por evento"""
+    try:
+        window.write_event_value("-PDF_PROGRESSO-", f"Gerando PDF de {dados['nome']}...")
+        # Se o orçamento acabou de ser pré-visualizado, os bytes já estão prontos
+        conteudo = cache.renderizar(chave, dados, orcamento, compacto)
+
+        window.write_event_value("-PDF_PROGRESSO-", f"Gravando {os.path.basename(caminho_pdf)}...")
+        os.makedirs(os.path.dirname(caminho_pdf), exist_ok=True)
+        with telemetria.medir("pdf.gravar", bytes=len(conteudo)):
+            with open(caminho_pdf, "wb") as f:
+                f.write(conteudo)
 
-    # Link para ler o arquivo de texto
-    URL_CHECK_VERSAO = f"https://drive.google.com/uc?export=download&id={ID_ARQUIVO_VERSAO}"
+        window.write_event_value("-PDF_PROGRESSO-", "Salvando arquivo editável...")
+        caminho_json = salvar_orcamento_editavel(dados, orcamento, historico)
+
+        window.write_event_value("-PDF_CONCLUIDO-", (chave, caminho_pdf, caminho_json, None))
+    except Exception as e:
+        logging.error(f"Erro ao gerar PDF: {e}")
+        window.write_event_value("-PDF_CONCLUIDO-", (chave, caminho_pdf, None, str(e)))
 
+def _tarefa_previsualizar(window, cache, pasta_previas: str, chave: Tuple, dados: Dict[str, Any],
+                        orcamento: Orcamento, compacto: bool = False):
+    """Renderiza (ou reaproveita) o PDF e grava uma cópia temporária para abrir no visualizador"""
     try:
-        print("Buscando atualizações...") 
-        resposta = requests.get(URL_CHECK_VERSAO, timeout=3)
-        
-        if resposta.status_code == 200:
-            versao_nuvem = resposta.text.strip()
-            
-            if versao_nuvem != VERSAO_ATUAL:
-                msg = (f"NOVA VERSÃO DISPONÍVEL!\n\n"
-                        f"Sua versão: {VERSAO_ATUAL}\n"
-                        f"Nova versão: {versao_nuvem}\n\n"
-                        f"O sistema irá abrir o navegador para iniciar o download\n"
-                        f"e fechará automaticamente para você instalar.\n\n"
-                        f"Deseja atualizar agora?")
-                
-                icon_popup = icon_path if 'icon_path' in globals() else None
-                
-                if sg.popup_yes_no(msg, title="Atualização Eurocar", icon=icon_popup) == "Yes":
-                    # Abre o link de download direto do novo arquivo
-                    webbrowser.open(LINK_DOWNLOAD_DIRETO)
-                    sys.exit() # Fecha o programa
-                    
+        import hashlib
+
+        conteudo = cache.renderizar(chave, dados, orcamento, compacto)
+        # Mesma chave do CachePDF: depois da meia-noite a data do documento muda
+        nome = hashlib.sha1(repr((chave, compacto, date.today())).encode("utf-8")).hexdigest()[:16] + ".pdf"
+        caminho = os.path.join(pasta_previas, nome)
+        # O mesmo orçamento pré-visualizado de novo (no mesmo dia) reabre o arquivo já gravado
+        if not os.path.exists(caminho):
+            with open(caminho + ".tmp", "wb") as f:
+                f.write(conteudo)
+            os.replace(caminho + ".tmp", caminho)
+        window.write_event_value("-PREVIA_PRONTA-", (caminho, None))
     except Exception as e:
-        print(f"Erro ao atualizar: {e}")
-        pass
-    
+        logging.error(f"Erro ao pré-visualizar PDF: {e}")
+        window.write_event_value("-PREVIA_PRONTA-", (None, str(e)))
+
+class GeradorPDF:
+    """
+    Fila de geração de PDFs em threads, com bloqueio de envios duplicados.
+    Pré-visualização e gravação compartilham o mesmo cache de PDFs em memória.
+    """
+
+    def __init__(self, window, historico: Optional[IndiceDescricoes] = None, max_workers: int = 2,
+                compacto: bool = False):
+        self.window = window
+        self.historico = historico
+        self.compacto = compacto
+        self.max_workers = max_workers
+        self._executor = None
+        self._cache = None
+        self._pasta_previas = None
+        # chave do orçamento -> caminho do PDF sendo gerado
+        self.em_andamento: Dict[Tuple, str] = {}
+
+    def _preparar(self):
+        if self._executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+            from eurocar.pdf import CachePDF
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="pdf")
+            self._cache = CachePDF()
+
+    def ocupado(self, chave: Tuple, caminho_pdf: str) -> bool:
+        return chave in self.em_andamento or caminho_pdf in self.em_andamento.values()
+
+    def enviar(self, chave: Tuple, dados: Dict[str, Any], orcamento: Orcamento, caminho_pdf: str):
+        self._preparar()
+        self.em_andamento[chave] = caminho_pdf
+        self._executor.submit(_tarefa_gerar_pdf, self.window, self._cache, chave, dados, orcamento, caminho_pdf,
+                            self.historico, self.compacto)
+
+    def previsualizar(self, chave: Tuple, dados: Dict[str, Any], orcamento: Orcamento):
+        self._preparar()
+        if self._pasta_previas is None:
+            import tempfile
+            self._pasta_previas = tempfile.mkdtemp(prefix="eurocar_previa_")
+        self._executor.submit(_tarefa_previsualizar, self.window, self._cache, self._pasta_previas,
+                            chave, dados, orcamento, self.compacto)
+
+    def concluir(self, chave: Tuple):
+        self.em_andamento.pop(chave, None)
+
+    def encerrar(self):
+        """Espera os arquivos em gravação terminarem antes de sair"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+        if self._pasta_previas is not None:
+            import shutil
+            # Um visualizador ainda aberto pode segurar o arquivo (Windows): sobra só a pasta temporária
+            shutil.rmtree(self._pasta_previas, ignore_errors=True)
+
+def iniciar_verificacao_atualizacao(window, config):
+    """Consulta a versão em segundo plano; o resultado chega no evento -ATUALIZACAO-"""
+    caminho_cache = os.path.join(pasta_config(), "atualizacao.json")
+    url = config.get("atualizacao", "url_versao") or URL_CHECK_VERSAO
+    intervalo = config.get("atualizacao", "intervalo_horas")
+    if intervalo is None:
+        intervalo = INTERVALO_PADRAO_HORAS
+
+    window.perform_long_operation(
+        lambda: consultar_versao(caminho_cache, url, float(intervalo)),
+        "-ATUALIZACAO-")
+
+def oferecer_atualizacao(versao_nuvem: str, config) -> bool:
+    """Pergunta se o usuário quer baixar a nova versão. Retorna True se o download foi aberto"""
+    msg = (f"NOVA VERSÃO DISPONÍVEL!\n\n"
+            f"Sua versão: {VERSAO_ATUAL}\n"
+            f"Nova versão: {versao_nuvem}\n\n"
+            f"O sistema irá abrir o navegador para iniciar o download\n"
+            f"e fechará automaticamente para você instalar.\n\n"
+            f"Deseja atualizar agora?")
+
+    if sg.popup_yes_no(msg, title="Atualização Eurocar", icon=icon_path) == "Yes":
+        import webbrowser
+
+        # Abre o link de download direto do novo arquivo
+        webbrowser.open(config.get("atualizacao", "url_download") or LINK_DOWNLOAD_DIRETO)
+        return True
     return False
 
+def imprimir_relatorio_inicializacao(medidas: List[Tuple[str, float]]):
+    """Mostra (e registra no log) quanto tempo cada etapa da abertura levou"""
+    total = sum(t for _, t in medidas)
+    linhas = ["Tempo de inicialização:"]
+    for etapa, tempo in medidas:
+        linhas.append(f"  {etapa:<24} {tempo * 1000:8.1f} ms  ({tempo / total:5.1%})")
+    linhas.append(f"  {'TOTAL':<24} {total * 1000:8.1f} ms")
+    relatorio = "\n".join(linhas)
+    print(relatorio)
+    logging.getLogger(__name__).info(relatorio)
+
 # ========== FUNÇÃO PRINCIPAL ==========
-def main():
+def main(perfil_inicializacao: bool = False):
+    medidas = [("imports", _TEMPO_IMPORTS)]
+
+    inicio = time.perf_counter()
+    configurar_aplicacao()
+    medidas.append(("tema e logging", time.perf_counter() - inicio))
+
+    inicio = time.perf_counter()
     config = ConfigManager()
-    checar_atualizacao()
+    medidas.append(("ConfigManager", time.perf_counter() - inicio))
+    telemetria.configurar(pasta_logs(), config.get("telemetria", "ativa"))
 
     # Verificação EXTRA para primeira execução
-    config_dir = appdirs.user_config_dir("Eurocar")
+    config_dir = pasta_config()
     first_run_flag = os.path.join(config_dir, ".firstrun")
     
-    if not os.path.exists(first_run_flag):
+    if not os.path.exists(first_run_flag) and not perfil_inicializacao:
         # Mostra a janela de configuração inicial
         escolher_pastas_iniciais(config)
         
@@ -719,8 +916,35 @@ def main():
         with open(first_run_flag, 'w') as f:
             f.write("1")
 
+    inicio = time.perf_counter()
     window = create_main_window(config)
-    itens = []
+    medidas.append(("create_main_window", time.perf_counter() - inicio))
+
+    if perfil_inicializacao:
+        imprimir_relatorio_inicializacao(medidas)
+        window.close()
+        return
+
+    # A verificação de versão roda depois da janela aparecer, sem atrasar a abertura
+    iniciar_verificacao_atualizacao(window, config)
+    orcamento = Orcamento()
+    tabela = TabelaItens(window["-ITENS-"], orcamento)
+    # Sugestões de descrição e preço: o histórico carrega em segundo plano
+    historico = IndiceDescricoes()
+    window.perform_long_operation(lambda: carregar_historico(config, historico), "-HISTORICO-")
+    gerador_pdf = GeradorPDF(window, historico, compacto=bool(config.get("arquivos", "pdf_compacto")))
+
+    # Diário de edição: se a última sessão terminou sem fechar o programa, oferece restaurar
+    diario = DiarioEdicao(os.path.join(config_dir, "sessao.diario"))
+    sessao = restaurar_diario(diario.caminho)
+    campos_iniciais = {}
+    if sessao and sg.popup_yes_no("O último orçamento não foi fechado corretamente.\n"
+                                "Deseja restaurar o que estava sendo editado?",
+                                title="Restaurar Orçamento", icon=icon_path) == "Yes":
+        campos_iniciais, orcamento = sessao
+        preencher_orcamento(window, tabela, campos_iniciais, orcamento)
+    diario.iniciar(campos_iniciais, orcamento)
+    importando = False
 
     window["-MAO_OBRA-"].bind("<Return>", "_ENTER")
     window["-MAO_OBRA-"].bind('<FocusOut>', '_FORMAT')
@@ -731,13 +955,19 @@ def main():
     window.bind("<F5>", "Pré-visualizar")
     window.bind("<Control-e>", "-EDIT-")
     window.bind("<Control-o>", "-LOAD-")
+    window.bind("<Control-i>", "-IMPORTAR-")
     window.bind("<Control-s>", "-CONFIG-")
 
+    # Telemetria (opcional): tempo de tratamento de cada evento da janela principal
+    cronometro = telemetria.CronometroEventos()
+
     while True:
+        cronometro.fim()
         event, values = window.read()
+        cronometro.inicio(event)
         
         if event in (sg.WINDOW_CLOSE_ATTEMPTED_EVENT, "Sair"):
-            if itens:
+            if orcamento:
                 # Se tem itens, pergunta. Se responder "No" (Não sair), apenas ignora e volta pro app
                 if sg.popup_yes_no("Existem itens no orçamento atual.\nDeseja realmente sair?", 
                                 title="Confirmar Saída", 
@@ -751,7 +981,18 @@ def main():
         if event == sg.WINDOW_CLOSED:
             break
             
-        elif event in ("-UP-", "-DOWN-") and itens:
+        elif event == "-ATUALIZACAO-":
+            versao_nuvem = values[event]
+            if ha_atualizacao(versao_nuvem) and oferecer_atualizacao(versao_nuvem, config):
+                if not orcamento:
+                    break  # Fecha o programa para a instalação
+                sg.popup("Salve o orçamento atual e feche o programa para instalar a nova versão.",
+                        title="Atualização Eurocar")
+
+        elif event == "-HISTORICO-":
+            logging.info(f"Histórico de itens carregado: {values[event]} descrições")
+
+        elif event in ("-UP-", "-DOWN-") and orcamento:
             # Verifica se tem algo selecionado
             if not values["-ITENS-"]:
                 continue
@@ -762,26 +1003,21 @@ def main():
             # Mover para CIMA
             if event == "-UP-" and index_atual > 0:
                 # Troca o item atual pelo anterior na lista
-                itens[index_atual], itens[index_atual - 1] = itens[index_atual - 1], itens[index_atual]
+                orcamento.trocar(index_atual, index_atual - 1)
+                diario.trocar(index_atual, index_atual - 1)
                 novo_index = index_atual - 1
                 
             # Mover para BAIXO
-            elif event == "-DOWN-" and index_atual < len(itens) - 1:
+            elif event == "-DOWN-" and index_atual < len(orcamento) - 1:
                 # Troca o item atual pelo próximo na lista
-                itens[index_atual], itens[index_atual + 1] = itens[index_atual + 1], itens[index_atual]
+                orcamento.trocar(index_atual, index_atual + 1)
+                diario.trocar(index_atual, index_atual + 1)
                 novo_index = index_atual + 1
             
             # Se a posição mudou, atualiza a tela
             if novo_index != index_atual:
-                # Recria a tabela visual com a nova ordem
-                window["-ITENS-"].update(values=[
-                    [f"{idx+1}.", 
-                    item["descricao"], 
-                    item["quantidade"], 
-                    formatar_moeda(item['valor']), 
-                    formatar_moeda(item['quantidade'] * item['valor'])] 
-                    for idx, item in enumerate(itens)
-                ])
+                # Reescreve só as duas linhas trocadas
+                tabela.trocados(index_atual, novo_index)
                 
                 # Mantém a seleção no item que você moveu (para poder clicar várias vezes seguidas)
                 window["-ITENS-"].update(select_rows=[novo_index])
@@ -791,31 +1027,32 @@ def main():
             placa = values["-PLACA-"].upper()
             if len(placa) > 8: placa = placa[:8]
             window["-PLACA-"].update(placa)
+            diario.definir_campo("placa", placa)
 
         elif event == "-TEL-":
             # Permite apenas números e caracteres comuns de telefone
             tel = ''.join(c for c in values["-TEL-"] if c.isdigit() or c in '()- ')
             window["-TEL-"].update(tel)
+            diario.definir_campo("telefone", tel)
+
+        elif event in ("-NOME-", "-VEICULO-"):
+            diario.definir_campo("nome" if event == "-NOME-" else "veiculo", values[event])
 
         elif event == "-MAO_OBRA-_FORMAT":
             try:
                 # 1. Converte o que foi digitado para número
                 valor_digitado = converter_moeda_input(values["-MAO_OBRA-"])
                 
-                # 2. Formata para padrão brasileiro (ex: R$ 1.500,00)
-                texto_formatado = formatar_moeda(valor_digitado)
+                # 2. Formata para padrão brasileiro sem o "R$" (ex: 1.500,00)
+                texto_limpo = formatar_valor(valor_digitado)
                 
-                # 3. Remove o "R$" e espaços extras para deixar limpo na caixa (ex: 1.500,00)
-                # O replace trata espaços normais e espaços não quebráveis (\xa0) comuns em formatação
-                texto_limpo = texto_formatado.replace("R$", "").replace("\xa0", "").strip()
-                
-                # 4. Atualiza a caixa de texto
+                # 3. Atualiza a caixa de texto
                 window["-MAO_OBRA-"].update(texto_limpo)
                 
-                # 5. Garante que os totais lá embaixo estejam certos
-                # Precisamos passar o valor novo explicitamente porque o 'values' ainda pode ter o antigo
-                values["-MAO_OBRA-"] = texto_limpo
-                atualizar_totais(window, values, itens)
+                # 4. Garante que os totais lá embaixo estejam certos
+                orcamento.definir_mao_obra(valor_digitado)
+                diario.definir_mao_obra(orcamento.mao_obra)
+                atualizar_totais(window, orcamento)
                 
             except Exception as e:
                 pass
@@ -833,7 +1070,11 @@ def main():
                     config.update_section("paths", {
                         "orcamentos_pdf": values_settings["-PDF_PATH-"],
                         "orcamentos_editaveis": values_settings["-EDIT_PATH-"],
-                    }, save=True)
+                    })
+                    config.set("arquivos", "pdf_compacto", values_settings["-PDF_COMPACTO-"], save=False)
+                    gerador_pdf.compacto = values_settings["-PDF_COMPACTO-"]
+                    config.update_section("telemetria", {"ativa": values_settings["-TELEMETRIA-"]}, save=True)
+                    telemetria.configurar(pasta_logs(), values_settings["-TELEMETRIA-"])
                                         
                     sg.popup("Configurações salvas com sucesso!\nAlgumas mudanças podem requerer reinicialização.",
                             title="Sucesso")
@@ -864,9 +1105,11 @@ def main():
             settings_window.close()
         
         elif event in ("Adicionar Item", "-ADD-"):
+            sugestoes_item = SugestoesItem(historico, "-DESC-", "-VALOR-")
             layout_item = [
                 [sg.Text("Descrição:", text_color=COR_TEXTO), 
-                sg.Input(key="-DESC-", size=40, focus=True, background_color="white", text_color=COR_TEXTO_CAIXA)],
+                sg.Input(key="-DESC-", size=40, focus=True, enable_events=True, background_color="white", text_color=COR_TEXTO_CAIXA)],
+                [sugestoes_item.elemento()],
                 [sg.Text("Quantidade:", text_color=COR_TEXTO), 
                 sg.Input(key="-QTD-", size=5, default_text="1", background_color="white", text_color=COR_TEXTO_CAIXA)],
                 [sg.Text("Valor Unitário R$:", text_color=COR_TEXTO), 
@@ -885,6 +1128,8 @@ def main():
                 ev_item, vals_item = janela_item.read()
                 if ev_item in (sg.WINDOW_CLOSED, "Cancelar"):
                     break
+                if sugestoes_item.tratar(janela_item, ev_item, vals_item):
+                    continue
                 if ev_item == "Salvar":
                     try:
                         descricao = vals_item["-DESC-"].strip()
@@ -892,30 +1137,20 @@ def main():
                             sg.popup_error("A descrição é obrigatória!", title="Erro")
                             continue
                             
-                        quantidade = int(vals_item["-QTD-"] or 1)
+                        quantidade = ler_quantidade(vals_item["-QTD-"])
                         valor = converter_moeda_input(vals_item["-VALOR-"])
                         
-                        itens.append({
-                            "descricao": descricao,
-                            "quantidade": quantidade,
-                            "valor": valor
-                        })
+                        indice = orcamento.adicionar(Item(descricao, quantidade, valor))
+                        diario.adicionar(orcamento[indice])
                         
-                        window["-ITENS-"].update(values=[
-                            [f"{idx+1}.", 
-                            item["descricao"], 
-                            item["quantidade"], 
-                            formatar_moeda(item['valor']), 
-                            formatar_moeda(item['quantidade'] * item['valor'])] 
-                            for idx, item in enumerate(itens)
-                        ])
-                        atualizar_totais(window, values, itens)
+                        tabela.adicionado(indice)
+                        atualizar_totais(window, orcamento)
                         break
                     except ValueError as e:
                         sg.popup_error(f"Valor inválido!\nUse números (ex: 150,50)\nErro: {str(e)}", title="Erro")
             janela_item.close()
         
-        elif event in ("Editar Item", "-EDIT-") and itens:
+        elif event in ("Editar Item", "-EDIT-") and orcamento:
             # Verifica se alguma linha está selecionada
             if not values["-ITENS-"]:
                 sg.popup_error("Selecione um item para editar!", title="Erro")
@@ -923,17 +1158,19 @@ def main():
                 
             # Pega o índice da linha selecionada (padrão seguro)
             selected_row = values["-ITENS-"][0]
-            item_to_edit = itens[selected_row]
+            item_to_edit = orcamento[selected_row]
             
             # --- Daqui para baixo é o layout da janela de edição (igual ao original) ---
+            sugestoes_edicao = SugestoesItem(historico, "-EDIT_DESC-", "-EDIT_VALOR-")
             layout_edicao = [
                 [sg.Text("Editar Item:", font=("Arial", 12), text_color=COR_TEXTO)],
                 [sg.Text("Descrição:", text_color=COR_TEXTO), 
-                sg.Input(item_to_edit["descricao"], key="-EDIT_DESC-", size=40, focus=True, background_color="white", text_color=COR_TEXTO_CAIXA)],
+                sg.Input(item_to_edit.descricao, key="-EDIT_DESC-", size=40, focus=True, enable_events=True, background_color="white", text_color=COR_TEXTO_CAIXA)],
+                [sugestoes_edicao.elemento()],
                 [sg.Text("Quantidade:", text_color=COR_TEXTO), 
-                sg.Input(str(item_to_edit["quantidade"]), key="-EDIT_QTD-", size=5, background_color="white", text_color=COR_TEXTO_CAIXA)],
+                sg.Input(str(item_to_edit.quantidade), key="-EDIT_QTD-", size=5, background_color="white", text_color=COR_TEXTO_CAIXA)],
                 [sg.Text("Valor Unitário R$:", text_color=COR_TEXTO), 
-                sg.Input(str(item_to_edit["valor"]), key="-EDIT_VALOR-", size=15, background_color="white", text_color=COR_TEXTO_CAIXA)],
+                sg.Input(formatar_valor(item_to_edit.valor), key="-EDIT_VALOR-", size=15, background_color="white", text_color=COR_TEXTO_CAIXA)],
                 [sg.Button("Salvar", button_color=(COR_TEXTO, COR_BOTAO_EDIT)), 
                 sg.Button("Cancelar", button_color=(COR_TEXTO, COR_BOTAO_SAIR))]
             ]
@@ -948,6 +1185,8 @@ def main():
                 ev_edit, vals_edit = janela_edicao.read()
                 if ev_edit in (sg.WINDOW_CLOSED, "Cancelar"):
                     break
+                if sugestoes_edicao.tratar(janela_edicao, ev_edit, vals_edit):
+                    continue
                 if ev_edit == "Salvar":
                     try:
                         descricao = vals_edit["-EDIT_DESC-"].strip()
@@ -955,283 +1194,196 @@ def main():
                             sg.popup_error("A descrição é obrigatória!", title="Erro")
                             continue
                             
-                        quantidade = int(vals_edit["-EDIT_QTD-"] or 1)
+                        quantidade = ler_quantidade(vals_edit["-EDIT_QTD-"])
                         valor = converter_moeda_input(vals_edit["-EDIT_VALOR-"])
                         
-                        itens[selected_row] = {
-                            "descricao": descricao,
-                            "quantidade": quantidade,
-                            "valor": valor
-                        }
+                        orcamento.editar(selected_row, Item(descricao, quantidade, valor))
+                        diario.editar(selected_row, orcamento[selected_row])
                         
-                        window["-ITENS-"].update(values=[
-                            [f"{idx+1}.", 
-                            item["descricao"], 
-                            item["quantidade"], 
-                            formatar_moeda(item['valor']), 
-                            formatar_moeda(item['quantidade'] * item['valor'])] 
-                            for idx, item in enumerate(itens)
-                        ])
-                        atualizar_totais(window, values, itens)
+                        tabela.editado(selected_row, item_to_edit)
+                        atualizar_totais(window, orcamento)
                         break
                     except ValueError as e:
                         sg.popup_error(f"Valor inválido!\nUse números (ex: 150,50)\nErro: {str(e)}", title="Erro")
             
             janela_edicao.close()
         
-        elif event in ("Remover Item", "-DEL-") and itens:
+        elif event in ("Remover Item", "-DEL-") and orcamento:
             if values["-ITENS-"]:  
                 selected_row = values["-ITENS-"][0]  
-                itens.pop(selected_row) 
-                window["-ITENS-"].update(values=[
-                    [f"{idx+1}.", 
-                    item["descricao"], 
-                    item["quantidade"], 
-                    formatar_moeda(item['valor']), 
-                    formatar_moeda(item['quantidade'] * item['valor'])] 
-                    for idx, item in enumerate(itens)
-                ])
-                atualizar_totais(window, values, itens)
+                item_removido = orcamento.remover(selected_row)
+                diario.remover(selected_row)
+                tabela.removido(selected_row, item_removido)
+                atualizar_totais(window, orcamento)
             else:
                 sg.popup_error("Selecione um item para remover!", title="Erro")
         
         elif event == "-MAO_OBRA-":
-            atualizar_totais(window, values, itens)
+            orcamento.definir_mao_obra(ler_mao_obra(values["-MAO_OBRA-"]))
+            diario.definir_mao_obra(orcamento.mao_obra)
+            atualizar_totais(window, orcamento)
         
         elif event == "Pré-visualizar":
-            if not values["-NOME-"] or not values["-VEICULO-"] or not itens:
+            if not values["-NOME-"] or not values["-VEICULO-"] or not orcamento:
                 sg.popup_error("Campos obrigatórios faltando!",
                             "Preencha Nome, Veículo e adicione itens.",
                             title="Erro")
                 continue
             
-            # --- CORREÇÃO: Converter mão de obra para Decimal ---
-            try:
-                val_mo = values["-MAO_OBRA-"]
-                if val_mo:
-                    # Remove formatação de milhar se houver e troca vírgula por ponto
-                    limpo = str(val_mo).replace('.', '').replace(',', '.')
-                    mao_obra = Decimal(limpo)
-                else:
-                    mao_obra = Decimal("0.00")
-            except:
-                mao_obra = Decimal("0.00")
-            
-            preview_text = f"""
-    {'CLIENTE:':<10} {values['-NOME-']}
-    {'TELEFONE:':<10} {values['-TEL-']}
-    {'VEÍCULO:':<10} {values['-VEICULO-']}
-    {'PLACA:':<10} {values['-PLACA-']}
-
-    {'='*50}
-    {'ITENS DO ORÇAMENTO':^50}
-    {'='*50}"""
-            
-            # Cálculo usando Decimal
-            total_itens = sum(Decimal(str(item['quantidade'])) * Decimal(str(item['valor'])) for item in itens)
-            
-            for idx, item in enumerate(itens, 1):
-                qtd = Decimal(str(item['quantidade']))
-                val = Decimal(str(item['valor']))
-                total_item = qtd * val
-                preview_text += f"\n{idx:>2}. {item['descricao'][:30]:<30} {qtd:>3}x {formatar_moeda(val):>10} = {formatar_moeda(total_item):>10}"
-            
-            total_geral = total_itens + mao_obra
-            
-            preview_text += f"\n\n{'TOTAL PEÇAS:':<15} {formatar_moeda(total_itens):>20}"
-            preview_text += f"\n{'MÃO DE OBRA:':<15} {formatar_moeda(mao_obra):>20}"
-            preview_text += f"\n{'TOTAL GERAL:':<15} {formatar_moeda(total_geral):>20}"
-            
-            layout_preview = [
-                [sg.Multiline(
-                    preview_text, 
-                    size=(80, 25), 
-                    font=("Courier New", 10),
-                    background_color='white',
-                    text_color='black',
-                    disabled=True,
-                    key='-PREVIEW-'
-                )],
-                [sg.Button("Fechar", key="-FECHAR-PREVIEW-", button_color=(COR_TEXTO, COR_BOTAO_DEL))]
-            ]
-
-            janela_preview = sg.Window(
-                "Pré-visualização do Orçamento",
-                layout_preview,
-                modal=True,
-                element_justification='C',
-                finalize=True
-            )
-
-            while True:
-                event_preview, _ = janela_preview.read()
-                if event_preview in (sg.WINDOW_CLOSED, "-FECHAR-PREVIEW-"):
-                    break
-
-            janela_preview.close()
+            orcamento.definir_mao_obra(ler_mao_obra(values["-MAO_OBRA-"]))
+
+            # Pré-visualiza o próprio PDF: o mesmo documento (em memória) é gravado depois no "Gerar PDF"
+            dados, copia = montar_dados_orcamento(values, orcamento)
+            gerador_pdf.previsualizar(chave_orcamento(dados), dados, copia)
+            window["-STATUS-"].update("Preparando pré-visualização...")
+
+        elif event == "-PREVIA_PRONTA-":
+            caminho_previa, erro = values[event]
+            restantes = len(gerador_pdf.em_andamento)
+            window["-STATUS-"].update(f"{restantes} PDF(s) em andamento..." if restantes else "")
+            if erro:
+                sg.popup_error(f"ERRO AO PRÉ-VISUALIZAR:\n{erro}", title="Erro")
+            else:
+                abrir_arquivo(caminho_previa)
         
         elif event in ("Gerar PDF", "-PDF-"):
-            if not values["-NOME-"] or not values["-VEICULO-"] or not itens:
+            if not values["-NOME-"] or not values["-VEICULO-"] or not orcamento:
                 sg.popup_error("Campos obrigatórios faltando!",
                             "Preencha Nome, Veículo e adicione itens.",
                             title="Erro")
                 continue
             
-            try:
-                os.makedirs(config.get("paths", "orcamentos_pdf"), exist_ok=True)
-                
-                try:
-                    mao_obra = converter_moeda_input(values["-MAO_OBRA-"])
-                except:
-                    mao_obra = Decimal("0.00")
-                
-                dados = {
-                    "nome": values["-NOME-"],
-                    "telefone": values["-TEL-"],
-                    "veiculo": values["-VEICULO-"],
-                    "placa": values["-PLACA-"],
-                    "mao_obra": mao_obra,
-                    "itens": itens
-                }
-                
-                pdf = criar_pdf(dados)
+            orcamento.definir_mao_obra(ler_mao_obra(values["-MAO_OBRA-"]))
 
-                data_formatada = datetime.now().strftime("%d-%m-%Y")
-                nome_cliente = ''.join(c for c in values['-NOME-'].strip() if c.isalnum() or c in ' _-')
-                modelo_carro = ''.join(c for c in values['-VEICULO-'].strip() if c.isalnum() or c in ' _-')
-                nome_arquivo = f"Orçamento {nome_cliente} {modelo_carro} {data_formatada}.pdf"
-                caminho_completo = os.path.join(config.get("paths", "orcamentos_pdf"), nome_arquivo)
+            dados, copia = montar_dados_orcamento(values, orcamento)
+            chave = chave_orcamento(dados)
+            caminho_completo = montar_caminho_pdf(config, dados)
 
-                pdf.output(caminho_completo)
-                
-                caminho_json = salvar_orcamento_editavel(dados)
-                
-                mensagem = "ORÇAMENTO GERADO COM SUCESSO!"
-                if caminho_json:
-                    mensagem += f"\n\nArquivo para edição salvo em:\n{caminho_json}"
-                
-                sg.popup_ok(mensagem,
-                        f"PDF salvo em:\n{caminho_completo}",
-                        title="Sucesso")
-                
-                if sg.popup_yes_no("Deseja abrir o orçamento agora?", title="Abrir PDF") == "Yes":
-                    if sys.platform == "win32":
-                        os.startfile(caminho_completo)
-                    else:
-                        os.system(f'xdg-open "{caminho_completo}"')
+            if gerador_pdf.ocupado(chave, caminho_completo):
+                sg.popup("Este orçamento já está sendo gerado.\nAguarde a conclusão.", title="Aguarde")
+                continue
+
+            gerador_pdf.enviar(chave, dados, copia, caminho_completo)
+            window["-STATUS-"].update(f"Gerando PDF de {dados['nome']}...")
+
+        elif event in ("-PDF_PROGRESSO-", "-IMPORTACAO_PROGRESSO-"):
+            window["-STATUS-"].update(values[event])
+
+        elif event == "-PDF_CONCLUIDO-":
+            chave, caminho_completo, caminho_json, erro = values[event]
+            gerador_pdf.concluir(chave)
+            restantes = len(gerador_pdf.em_andamento)
+            window["-STATUS-"].update(f"{restantes} PDF(s) em andamento..." if restantes else "")
+
+            if erro:
+                sg.popup_error(f"ERRO AO GERAR PDF:\n{erro}", title="Erro")
+                continue
+
+            mensagem = "ORÇAMENTO GERADO COM SUCESSO!"
+            if caminho_json:
+                mensagem += f"\n\nArquivo para edição salvo em:\n{caminho_json}"
             
-            except Exception as e:
-                sg.popup_error(f"ERRO AO GERAR PDF:\n{str(e)}", title="Erro")
+            sg.popup_ok(mensagem,
+                    f"PDF salvo em:\n{caminho_completo}",
+                    title="Sucesso")
+            
+            if sg.popup_yes_no("Deseja abrir o orçamento agora?", title="Abrir PDF") == "Yes":
+                abrir_arquivo(caminho_completo)
+
+        elif event == "-IMPORTAR-":
+            if importando:
+                sg.popup("Aguarde: uma importação já está em andamento.", title="Importação de Itens")
+                continue
+            caminho = sg.popup_get_file("Selecione a planilha de itens",
+                                        file_types=(("Planilhas CSV", "*.csv *.txt"), ("Todos os arquivos", "*.*")))
+            if not caminho:
+                continue
+            importando = True
+            window["-STATUS-"].update(f"Importando {os.path.basename(caminho)}...")
+            # A leitura roda em thread; os itens entram no orçamento de uma vez no evento abaixo
+            window.perform_long_operation(lambda caminho=caminho: _tarefa_importar_csv(window, caminho),
+                                        "-IMPORTACAO_CONCLUIDA-")
+
+        elif event == "-IMPORTACAO_CONCLUIDA-":
+            importando = False
+            resultado, erro = values[event]
+            window["-STATUS-"].update("")
+            if erro:
+                sg.popup_error(f"Erro ao importar planilha:\n{erro}", title="Erro")
+                continue
+
+            if resultado.itens:
+                for item in resultado.itens:
+                    orcamento.adicionar(item)
+                # Uma única atualização da tabela e uma base nova no diário, em vez de uma por linha
+                tabela.recarregar()
+                atualizar_totais(window, orcamento)
+                diario.compactar()
+            mostrar_resultado_importacao(resultado)
+
+        elif event == "-RELATORIO-":
+            window["-STATUS-"].update("Atualizando relatório (só arquivos novos ou alterados são lidos)...")
+            window["-RELATORIO-"].update(disabled=True)
+            window.perform_long_operation(lambda: _tarefa_relatorio(config), "-RELATORIO_PRONTO-")
+
+        elif event == "-RELATORIO_PRONTO-":
+            window["-RELATORIO-"].update(disabled=False)
+            window["-STATUS-"].update("")
+            relatorio, segundos, erro = values[event]
+            if erro:
+                sg.popup_error(f"Erro ao gerar relatório:\n{erro}", title="Erro")
+                continue
+            janela_relatorio(relatorio, segundos)
 
         elif event == "-LOAD-":
             try:
-                # 1. Diálogo para seleção do arquivo
-                caminho = sg.popup_get_file(
-                    "Selecione o orçamento (.json)",
-                    file_types=(("Arquivos JSON", "*.json"), ("Todos os arquivos", "*.*")),
-                    default_path=config.get("paths", "orcamentos_editaveis"),
-                    no_window=True,
-                    icon=icon_path
-                )
+                # 1. Seleção pelo catálogo indexado (ou diálogo de arquivo como alternativa)
+                escolha = janela_catalogo(config)
                 
-                if not caminho:  # Usuário cancelou
+                if not escolha:  # Usuário cancelou
                     continue
 
-                # 2. Pré-visualização segura
-                preview_data = {}
-                try:
-                    with open(caminho, 'r', encoding='utf-8') as f:
-                        preview_data = json.load(f)
-                        
-                    preview_info = [
-                        f"Arquivo: {os.path.basename(caminho)}",
-                        f"Cliente: {preview_data.get('nome', 'Não informado')}",
-                        f"Veículo: {preview_data.get('veiculo', 'Não informado')}",
-                        f"Itens: {len(preview_data.get('itens', []))}",
-                        f"Total: {formatar_moeda(sum(item.get('valor', 0) * item.get('quantidade', 1) for item in preview_data.get('itens', [])))}"
-                    ]
-                except Exception as e:
-                    preview_info = [
-                        f"Arquivo: {os.path.basename(caminho)}",
-                        "⚠ Não foi possível ler o arquivo",
-                        f"Erro: {str(e)}"
-                    ]
-
-                # 3. Janela de confirmação personalizada
-                layout_confirmacao = [
-                    [sg.Text("Confirmar carregamento?", font=("Segoe UI", 12))],
-                    [sg.Multiline(
-                        "\n".join(preview_info),
-                        size=(40, 6),
-                        disabled=True,
-                        background_color="#f0f0f0"
-                    )],
-                    [sg.Button("Sim", key="-CONFIRMAR-", button_color=(COR_TEXTO, COR_BOTAO_ADD)),
-                    sg.Button("Não", key="-CANCELAR-", button_color=(COR_TEXTO, COR_BOTAO_SAIR))]
-                ]
-
-                janela_confirmacao = sg.Window(
-                    "Confirmar",
-                    layout_confirmacao,
-                    modal=True,
-                    icon=icon_path,
-                    element_justification='c'
-                )
-
-                confirmado = False
-                while True:
-                    event_confirm, _ = janela_confirmacao.read()
-                    if event_confirm in (sg.WINDOW_CLOSED, "-CANCELAR-"):
-                        break
-                    elif event_confirm == "-CONFIRMAR-":
-                        confirmado = True
-                        break
-                janela_confirmacao.close()
+                caminho, precisa_confirmar = escolha
 
-                if not confirmado:
+                # 2. Arquivos vindos do diálogo ainda passam pela confirmação
+                if precisa_confirmar and not confirmar_carregamento(caminho):
                     continue
 
-                # 4. Carregamento definitivo
-                with open(caminho, 'r', encoding='utf-8') as f:
-                    dados = json.load(f)
-
-                # Preenchimento dos campos
-                campos = {
-                    "-NOME-": dados.get("nome", ""),
-                    "-TEL-": dados.get("telefone", ""),
-                    "-VEICULO-": dados.get("veiculo", ""),
-                    "-PLACA-": dados.get("placa", ""),
-                    "-MAO_OBRA-": formatar_moeda(dados.get("mao_obra", 0)).replace("R$", "").strip()
-                }
-                for key, value in campos.items():
-                    window[key].update(value)
-
-                # Processamento seguro dos itens
-                itens = []
-                for item in dados.get("itens", []):
-                    try:
-                        itens.append({
-                            'descricao': str(item.get('descricao', '')),
-                            'quantidade': int(item.get('quantidade', 1)),
-                            'valor': Decimal(str(item.get('valor', 0)))
-                        })
-                    except (ValueError, TypeError):
-                        continue
-
-                # Atualização da tabela
-                window["-ITENS-"].update(values=[
-                    [f"{idx+1}.", item["descricao"], item["quantidade"],
-                    formatar_moeda(item['valor']),
-                    formatar_moeda(item['quantidade'] * item['valor'])]
-                    for idx, item in enumerate(itens)
-                ])
-
-                atualizar_totais(window, values, itens)
+                # 3. Carregamento definitivo (formato atual ou JSON antigo; itens inválidos são ignorados)
+                dados, orcamento = ler_orcamento(caminho)
+
+                # Preenchimento dos campos e da tabela
+                preencher_orcamento(window, tabela, dados, orcamento)
+
+                # O diário recomeça a partir do orçamento carregado
+                diario.iniciar(dados, orcamento)
 
             except json.JSONDecodeError:
                 sg.popup_error("Erro: O arquivo está corrompido ou em formato inválido", title="Erro")
             except Exception as e:
                 sg.popup_error(f"Erro inesperado:\n{str(e)}", title="Erro")
 
+    # Termina de gravar os PDFs pendentes antes de fechar
+    gerador_pdf.encerrar()
+    # Saída normal (confirmada pelo usuário): não há sessão a restaurar
+    diario.descartar()
+    window.close()
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # No executável do PyInstaller, os processos filhos dos pools (--lote, catálogo,
+    # serviço) reexecutam este arquivo: freeze_support os desvia para o trabalho
+    # deles em vez de abrir outra janela. Fora do executável não faz nada.
+    import multiprocessing
+    multiprocessing.freeze_support()
+    if len(sys.argv) > 1 and sys.argv[1] == "--lote":
+        from eurocar.lote import executar_lote_cli
+
+        sys.exit(executar_lote_cli(sys.argv[2:]))
+    if len(sys.argv) > 1 and sys.argv[1] == "--telemetria":
+        sys.exit(telemetria.executar_resumo_cli(sys.argv[2:], pasta_logs()))
+    if len(sys.argv) > 1 and sys.argv[1] == "--servidor":
+        from eurocar.servidor import executar_servidor_cli
+
+        configurar_logging()
+        sys.exit(executar_servidor_cli(sys.argv[2:]))
+    main(perfil_inicializacao="--profile-startup" in sys.argv[1:])
\ No newline at end of file
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Os testes importam o pacote direto da árvore (o projeto não é instalado)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
@@ -0,0 +1,111 @@
+import gzip
+import json
+import os
+
+import pytest
+
+from eurocar import arquivo
+from eurocar.arquivo import gravar_orcamento, ler_orcamento, ler_resumo
+from eurocar.fixo import Dinheiro, Quantidade
+from eurocar.orcamento import Item, Orcamento
+
+CLIENTE = {"nome": "Maria", "telefone": "(11) 99999-0000", "veiculo": "Gol", "placa": "ABC1D23"}
+
+
+def _orcamento():
+    return Orcamento([Item("Filtro de óleo", 1, "35.90"), Item("Óleo 5W30", "4,5", "42.00"),
+                    Item("Linha 1\nLinha 2 \"aspas\"", 2, "0.05")], mao_obra="150.00")
+
+
+def _conteudo(itens):
+    return [(i.descricao, i.quantidade, i.valor) for i in itens]
+
+
+def _primeira_linha(caminho):
+    abrir = gzip.open if caminho.endswith(".gz") else open
+    with abrir(caminho, "rt", encoding="utf-8") as f:
+        return f.readline()
+
+
+@pytest.mark.parametrize("nome", ["orcamento.json", "orcamento.json.gz"])
+def test_ida_e_volta(tmp_path, nome):
+    caminho = str(tmp_path / nome)
+    orcamento = _orcamento()
+    gravar_orcamento(caminho, CLIENTE, orcamento)
+
+    dados, lido = ler_orcamento(caminho)
+    assert {campo: dados[campo] for campo in CLIENTE} == CLIENTE
+    assert _conteudo(lido) == _conteudo(orcamento)
+    assert lido.mao_obra == Dinheiro(15000)
+    assert lido.total_geral == orcamento.total_geral
+    assert dados["itens"] == lido.itens
+    assert os.listdir(tmp_path) == [nome]
+
+
+@pytest.mark.parametrize("nome", ["orcamento.json", "orcamento.json.gz"])
+def test_primeira_linha_e_o_cabecalho(tmp_path, nome):
+    caminho = str(tmp_path / nome)
+    orcamento = _orcamento()
+    gravar_orcamento(caminho, dict(CLIENTE, nome="Nome\ncom quebra"), orcamento)
+
+    linha = _primeira_linha(caminho)
+    cabecalho = json.loads(linha.rstrip()[:-1] + "}")
+    assert cabecalho["formato"] == arquivo.FORMATO and cabecalho["versao"] == arquivo.VERSAO
+    assert cabecalho["resumo"]["nome"] == "Nome\ncom quebra"
+
+    resumo = ler_resumo(caminho)
+    assert resumo["qtd_itens"] == 3
+    assert resumo["total_pecas"] == orcamento.total_pecas.centavos
+    assert resumo["total_geral"] == orcamento.total_geral.centavos
+
+
+def test_le_formato_v1(tmp_path):
+    caminho = str(tmp_path / "antigo.json")
+    with open(caminho, "w", encoding="utf-8") as f:
+        json.dump(dict(CLIENTE, mao_obra=150.0, itens=[
+            {"descricao": "Filtro", "quantidade": 2, "valor": 35.9},
+            {"descricao": "inválido", "quantidade": "x", "valor": 1},
+        ]), f)
+
+    dados, orcamento = ler_orcamento(caminho)
+    assert dados["nome"] == "Maria"
+    assert _conteudo(orcamento) == [("Filtro", Quantidade(2000), Dinheiro(3590))]
+    assert orcamento.mao_obra == Dinheiro(15000)
+
+    resumo = ler_resumo(caminho)
+    assert resumo["qtd_itens"] == 1 and resumo["total_geral"] == 7180 + 15000
+
+
+@pytest.mark.parametrize("versao", [arquivo.VERSAO + 1, "2", None])
+def test_rejeita_versao_nao_suportada(tmp_path, versao):
+    caminho = str(tmp_path / "novo.json")
+    with open(caminho, "w", encoding="utf-8") as f:
+        f.write(json.dumps({"formato": arquivo.FORMATO, "versao": versao, "resumo": {}})[:-1] + ',\n"itens":[]}\n')
+
+    with pytest.raises(ValueError):
+        ler_orcamento(caminho)
+    with pytest.raises(ValueError):
+        ler_resumo(caminho)
+
+
+def test_rejeita_outro_formato(tmp_path):
+    caminho = str(tmp_path / "outro.json")
+    with open(caminho, "w", encoding="utf-8") as f:
+        json.dump({"formato": "outro", "versao": 1}, f)
+    with pytest.raises(ValueError):
+        ler_orcamento(caminho)
+
+
+@pytest.mark.parametrize("nome", ["orcamento.json", "orcamento.json.gz"])
+def test_falha_na_gravacao_remove_temporario_e_preserva_anterior(tmp_path, monkeypatch, nome):
+    caminho = str(tmp_path / nome)
+    gravar_orcamento(caminho, CLIENTE, _orcamento())
+
+    def falhar(*args):
+        raise OSError("disco cheio")
+    monkeypatch.setattr(arquivo.os, "replace", falhar)
+    with pytest.raises(OSError):
+        gravar_orcamento(caminho, CLIENTE, Orcamento())
+
+    assert os.listdir(tmp_path) == [nome]
+    assert len(ler_orcamento(caminho)[1]) == 3
@@ -0,0 +1,119 @@
+import pytest
+
+from eurocar.diario import DiarioEdicao, restaurar
+from eurocar.fixo import Dinheiro
+from eurocar.orcamento import Item, Orcamento
+
+
+def _conteudo(orcamento):
+    return [(i.descricao, str(i.quantidade), str(i.valor)) for i in orcamento]
+
+
+@pytest.fixture
+def diario(tmp_path):
+    diario = DiarioEdicao(str(tmp_path / "sessao.diario"))
+    orcamento = Orcamento([Item("Filtro", 1, "35.90")], mao_obra="100.00")
+    diario.iniciar({"nome": "Maria", "placa": "ABC1D23"}, orcamento)
+    yield diario
+    diario.fechar()
+
+
+def _editar(diario):
+    """Sequência de edições como a janela faz: altera o modelo e registra no diário"""
+    orcamento = diario.orcamento
+    for item in (Item("Óleo", "4,5", "42.00"), Item("Vela", 4, "19.90"), Item("Correia", 1, "120.00")):
+        orcamento.adicionar(item)
+        diario.adicionar(item)
+    orcamento.editar(1, Item("Óleo 5W30", "4,5", "45.00"))
+    diario.editar(1, orcamento[1])
+    orcamento.remover(2)
+    diario.remover(2)
+    orcamento.trocar(0, 1)
+    diario.trocar(0, 1)
+    orcamento.definir_mao_obra(Dinheiro(15000))
+    diario.definir_mao_obra(orcamento.mao_obra)
+    diario.definir_campo("nome", "Maria Souza")
+    diario.definir_campo("veiculo", "Gol\n1.6")
+
+
+def test_restaura_a_sessao_apos_queda(diario):
+    _editar(diario)
+    # Queda: o arquivo fica como estava, sem descartar()
+    diario.fechar()
+
+    campos, orcamento = restaurar(diario.caminho)
+    assert campos == {"nome": "Maria Souza", "telefone": "", "veiculo": "Gol\n1.6", "placa": "ABC1D23"}
+    assert _conteudo(orcamento) == _conteudo(diario.orcamento)
+    assert orcamento.mao_obra == Dinheiro(15000)
+    assert orcamento.total_geral == diario.orcamento.total_geral
+
+
+def test_ultima_linha_cortada_e_ignorada(diario):
+    _editar(diario)
+    diario.fechar()
+    esperado = _conteudo(diario.orcamento)
+    with open(diario.caminho, "a", encoding="utf-8") as f:
+        f.write('{"op":"add","item":["Pastilha",10')
+
+    campos, orcamento = restaurar(diario.caminho)
+    assert _conteudo(orcamento) == esperado
+    assert campos["nome"] == "Maria Souza"
+
+
+@pytest.mark.parametrize("linha", ['{"op":"del","i":99}\n', "lixo\n", '{"op":"add","item":["x"]}\n'])
+def test_linha_inconsistente_interrompe_no_estado_anterior(diario, linha):
+    diario.fechar()
+    with open(diario.caminho, "a", encoding="utf-8") as f:
+        f.write(linha)
+        f.write('{"op":"add","item":["Depois",1000,100]}\n')
+
+    _, orcamento = restaurar(diario.caminho)
+    assert _conteudo(orcamento) == [("Filtro", "1", "35.90")]
+
+
+def test_diario_sem_base_nao_restaura(tmp_path):
+    caminho = tmp_path / "sessao.diario"
+    caminho.write_text('{"op":"add","item":["Filtro",1000,3590]}\n', encoding="utf-8")
+    assert restaurar(str(caminho)) is None
+
+
+def test_sem_diario_ou_sessao_vazia(tmp_path):
+    assert restaurar(str(tmp_path / "nao_existe.diario")) is None
+    diario = DiarioEdicao(str(tmp_path / "vazio.diario"))
+    diario.iniciar({}, Orcamento())
+    diario.fechar()
+    assert restaurar(diario.caminho) is None
+
+
+def test_compactacao_troca_o_diario_por_uma_base(tmp_path):
+    diario = DiarioEdicao(str(tmp_path / "sessao.diario"), limite_compactacao=3)
+    diario.iniciar({"nome": "Ana"}, Orcamento())
+    for n in range(7):
+        item = Item(f"Peça {n}", 1, n)
+        diario.orcamento.adicionar(item)
+        diario.adicionar(item)
+    diario.fechar()
+
+    with open(diario.caminho, encoding="utf-8") as f:
+        linhas = f.readlines()
+    assert len(linhas) == 2 and '"op":"base"' in linhas[0]
+    assert _conteudo(restaurar(diario.caminho)[1]) == _conteudo(diario.orcamento)
+
+
+def test_descartar_apos_salvar_remove_o_diario(diario):
+    _editar(diario)
+    diario.descartar()
+    assert restaurar(diario.caminho) is None
+    # Descartar de novo (ou sem diário) não é erro
+    diario.descartar()
+
+
+def test_iniciar_apos_carregar_recomeca_do_orcamento_carregado(diario):
+    _editar(diario)
+    carregado = Orcamento([Item("Carregado", 2, "10.00")])
+    diario.iniciar({"nome": "João"}, carregado)
+    diario.fechar()
+
+    campos, orcamento = restaurar(diario.caminho)
+    assert campos["nome"] == "João" and campos["placa"] == ""
+    assert _conteudo(orcamento) == [("Carregado", "2", "10.00")]
@@ -0,0 +1,72 @@
+from decimal import Decimal
+
+import pytest
+
+from eurocar.fixo import Dinheiro, Quantidade
+
+
+@pytest.mark.parametrize("valor, centavos", [
+    ("0.005", 1), ("-0.005", -1), ("0.004", 0), ("-0.004", 0),
+    ("0,005", 1), (0.005, 1), (-0.005, -1), (Decimal("2.675"), 268),
+    ("1250.5", 125050), ("-3", -300), (7, 700), (0.1, 10),
+])
+def test_dinheiro_arredonda_meio_centavo_para_longe_do_zero(valor, centavos):
+    assert Dinheiro.de_valor(valor).centavos == centavos
+
+
+@pytest.mark.parametrize("valor, milesimos", [
+    ("0.0005", 1), ("-0.0005", -1), ("0.0004", 0), ("4,5", 4500), (2, 2000), (0.25, 250),
+])
+def test_quantidade_arredonda_para_o_milesimo(valor, milesimos):
+    assert Quantidade.de_valor(valor).milesimos == milesimos
+
+
+@pytest.mark.parametrize("valor", ["1.2.3", "abc", "", "1,2,3", "NaN", "inf"])
+def test_dinheiro_rejeita_texto_malformado(valor):
+    with pytest.raises(ValueError):
+        Dinheiro.de_valor(valor)
+
+
+@pytest.mark.parametrize("valor", ["1.2.3", "x", "inf"])
+def test_quantidade_rejeita_texto_malformado(valor):
+    with pytest.raises(ValueError):
+        Quantidade.de_valor(valor)
+
+
+def test_tipo_nao_suportado():
+    with pytest.raises(TypeError):
+        Dinheiro.de_valor(None)
+    with pytest.raises(TypeError):
+        Dinheiro.de_valor(True)
+
+
+@pytest.mark.parametrize("centavos, milesimos, total", [
+    (1, 500, 1), (-1, 500, -1), (1, 499, 0), (3333, 1500, 5000), (1999, 3000, 5997), (10, 1, 0),
+])
+def test_total_da_linha_arredonda_uma_vez(centavos, milesimos, total):
+    assert (Dinheiro(centavos) * Quantidade(milesimos)).centavos == total
+
+
+def test_soma_exata_sem_erro_de_float():
+    assert sum([Dinheiro.de_valor("0.10")] * 3) == Dinheiro.de_valor("0.30")
+    assert Dinheiro(125050) - Dinheiro(50) == Dinheiro(125000)
+    assert -Dinheiro(5) == Dinheiro(-5)
+
+
+@pytest.mark.parametrize("centavos, texto", [(125050, "1250.50"), (-5, "-0.05"), (0, "0.00"), (-100, "-1.00")])
+def test_dinheiro_str_ida_e_volta(centavos, texto):
+    assert str(Dinheiro(centavos)) == texto
+    assert Dinheiro.de_valor(texto).centavos == centavos
+
+
+@pytest.mark.parametrize("milesimos, texto", [(2000, "2"), (4500, "4,5"), (1, "0,001"), (-250, "-0,25")])
+def test_quantidade_str_ida_e_volta(milesimos, texto):
+    assert str(Quantidade(milesimos)) == texto
+    assert Quantidade.de_valor(texto).milesimos == milesimos
+
+
+def test_comparacao_e_hash():
+    assert Dinheiro(5) < Dinheiro(6) and Quantidade(1) < Quantidade(2)
+    assert {Dinheiro(5), Dinheiro(5)} == {Dinheiro(5)}
+    assert Dinheiro(5) != Quantidade(5)
+    assert not Dinheiro(0) and Quantidade(1)
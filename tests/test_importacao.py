@@ -0,0 +1,121 @@
+import pytest
+
+from eurocar.fixo import Dinheiro, Quantidade
+from eurocar.importacao import ErroLinha, detectar_separador, importar_csv, iterar_itens_csv
+
+
+def _ler(texto):
+    """(número da linha, (descrição, quantidade, valor) ou a mensagem de erro)"""
+    resultado = []
+    for numero, item in iterar_itens_csv(texto.splitlines(keepends=True)):
+        if isinstance(item, ErroLinha):
+            assert item.linha == numero
+            resultado.append((numero, item.mensagem))
+        else:
+            resultado.append((numero, (item.descricao, str(item.quantidade), str(item.valor))))
+    return resultado
+
+
+@pytest.mark.parametrize("linha, separador", [
+    ("Filtro;1;35,90", ";"), ("Filtro\t1\t35,90", "\t"), ("Filtro,1,35.90", ","),
+    ('"Filtro; óleo",1,"35,90"', ","), ("Filtro", ";"), ("a;b,c", ";"),
+])
+def test_detectar_separador(linha, separador):
+    assert detectar_separador(linha) == separador
+
+
+@pytest.mark.parametrize("texto", [
+    "Filtro;2;1.250,50\n", "Filtro\t2\t1.250,50\n", 'Filtro,2,"1.250,50"\n', "Filtro,2,1250.50\n",
+    "Filtro;2;1250.50\n", "Filtro;2;R$ 1.250,50\n",
+])
+def test_separadores_e_formatos_de_valor(texto):
+    assert _ler(texto) == [(1, ("Filtro", "2", "1250.50"))]
+
+
+def test_sem_cabecalho_duas_colunas_quantidade_1():
+    assert _ler("Filtro;35,90\nVela;19,90\n") == [(1, ("Filtro", "1", "35.90")), (2, ("Vela", "1", "19.90"))]
+
+
+def test_cabecalho_localiza_colunas_pelo_nome():
+    texto = "Preço Unitário;Código;DESCRIÇÃO:;Qtde\n35,90;123;Filtro;4,5\n"
+    assert _ler(texto) == [(2, ("Filtro", "4,5", "35.90"))]
+
+
+def test_cabecalho_sem_valor_e_tratado_como_dados():
+    assert _ler("Descrição;Código\n") == [(1, "valor inválido: 'Código'")]
+
+
+def test_quantidade_vazia_vale_1_e_invalidas_sao_recusadas():
+    texto = "Filtro;;10,00\nVela;0;5,00\nCorreia;-1;5,00\nÓleo;x;5,00\nBico;2,5;4,00\n"
+    assert _ler(texto) == [
+        (1, ("Filtro", "1", "10.00")),
+        (2, "quantidade deve ser maior que zero: '0'"),
+        (3, "quantidade deve ser maior que zero: '-1'"),
+        (4, "quantidade inválida: 'x'"),
+        (5, ("Bico", "2,5", "4.00")),
+    ]
+
+
+def test_valor_ou_descricao_vazios_sao_erro():
+    assert _ler("Filtro;1;35,90\n;1;5,00\nVela;1;\nBico;1;1.2.3\n") == [
+        (1, ("Filtro", "1", "35.90")),
+        (2, "descrição vazia"),
+        (3, "valor unitário vazio"),
+        (4, "valor inválido: '1.2.3'"),
+    ]
+
+
+def test_virgula_sem_aspas_e_recusada():
+    resultado = _ler('Filtro,1,35.90\nÓleo,1,35,90\nVela,1,"35,90"\n')
+    assert resultado[0] == (1, ("Filtro", "1", "35.90"))
+    assert resultado[1] == (2, 'valor com vírgula precisa estar entre aspas (ex: "35,90")')
+    assert resultado[2] == (3, ("Vela", "1", "35.90"))
+
+
+def test_virgula_sem_aspas_com_cabecalho_e_recusada():
+    assert _ler("Descrição,Qtd,Valor\nFiltro,1,35,90\n") == \
+        [(2, 'valor com vírgula precisa estar entre aspas (ex: "35,90")')]
+
+
+def test_coluna_a_mais_com_outros_separadores():
+    assert _ler("Filtro;1;35,90\nVela;1;19,90;extra\n")[1] == (2, "4 colunas; o arquivo tem 3")
+    assert _ler("Descrição;Valor\nVela;19,90;extra\n") == [(2, "3 colunas; o arquivo tem 2")]
+
+
+@pytest.mark.parametrize("texto", [
+    "Filtro,1,35.90,,\n", "Filtro;1;35,90;;\n", "Filtro;1;35,90\nVela;2;1,00; ;\n",
+    "Descrição;Qtd;Valor\nVela;2;1,00;;\n",
+])
+def test_campos_vazios_no_fim_sao_aceitos(texto):
+    assert all(not isinstance(item, str) for _, item in _ler(texto))
+
+
+def test_linhas_em_branco_e_aspas_multilinha_mantem_o_numero_da_linha():
+    texto = 'Descrição;Valor\n\n"Filtro\nde óleo";35,90\n;\nVela;x\n'
+    assert _ler(texto) == [(4, ("Filtro\nde óleo", "1", "35.90")), (6, "valor inválido: 'x'")]
+
+
+def test_arquivo_vazio():
+    assert _ler("") == []
+
+
+def test_importar_csv_utf8_com_bom(tmp_path):
+    caminho = tmp_path / "pecas.csv"
+    caminho.write_bytes("﻿Descrição;Qtd;Valor\r\nFiltro;2;35,90\r\nVela;x;1\r\n".encode("utf-8"))
+    resultado = importar_csv(str(caminho))
+    assert [(i.descricao, i.quantidade, i.valor) for i in resultado.itens] == \
+        [("Filtro", Quantidade(2000), Dinheiro(3590))]
+    assert resultado.erros == [ErroLinha(3, "quantidade inválida: 'x'")]
+    assert resultado.linhas == 3
+
+
+def test_importar_csv_windows_1252_e_progresso(tmp_path, monkeypatch):
+    from eurocar import importacao
+
+    monkeypatch.setattr(importacao, "AVISO_PROGRESSO", 2)
+    caminho = tmp_path / "pecas.csv"
+    caminho.write_bytes("Peça;Preço\nJunta do cabeçote;89,90\nÓleo;30\nVálvula;12\n".encode("cp1252"))
+    avisos = []
+    resultado = importar_csv(str(caminho), progresso=avisos.append)
+    assert [i.descricao for i in resultado.itens] == ["Junta do cabeçote", "Óleo", "Válvula"]
+    assert avisos == [3]
@@ -0,0 +1,53 @@
+from decimal import Decimal
+
+import pytest
+
+from eurocar.fixo import Dinheiro
+from eurocar.moeda import converter_brl, formatar_brl, formatar_valor
+
+
+@pytest.mark.parametrize("texto, esperado", [
+    ("1.250,50", "1250.50"), ("1250,50", "1250.50"), ("1250.50", "1250.50"), ("1,250.50", "1250.50"),
+    ("R$ 1.250,50", "1250.50"), ("R$\xa01.250,50", "1250.50"), ("-10,00", "-10.00"), ("(10,00)", "-10.00"),
+    ("150,5", "150.5"), ("150", "150"), ("1.250", "1250"), ("1.250.000", "1250000"),
+    ("1,250,000", "1250000"), ("1234.567", "1234.567"), ("", "0.00"), ("  ", "0.00"),
+])
+def test_converter_formatos_aceitos(texto, esperado):
+    assert converter_brl(texto) == Decimal(esperado)
+
+
+@pytest.mark.parametrize("texto", [
+    "1.2.3", "1.2,50", "12.34.567", "1,2,3", "1,2.3", "1.250,50.3", "abc", "1,5,", "R$ ,5", "--5",
+])
+def test_converter_rejeita_malformado(texto):
+    with pytest.raises(ValueError):
+        converter_brl(texto)
+
+
+def test_converter_outros_tipos():
+    assert converter_brl(None) == Decimal("0.00")
+    assert converter_brl(7) == Decimal(7)
+    assert converter_brl(0.1) == Decimal("0.1")
+    assert converter_brl(Decimal("2.5")) == Decimal("2.5")
+
+
+@pytest.mark.parametrize("valor, texto", [
+    (Dinheiro(125050), "R$ 1.250,50"), (Dinheiro(-125050), "R$ -1.250,50"), (Dinheiro(5), "R$ 0,05"),
+    (Decimal("0.005"), "R$ 0,01"), (Decimal("-0.005"), "R$ -0,01"), (Decimal("0.004"), "R$ 0,00"),
+    (Decimal("1234567.891"), "R$ 1.234.567,89"), (10, "R$ 10,00"),
+])
+def test_formatar_brl(valor, texto):
+    assert formatar_brl(valor) == texto
+
+
+@pytest.mark.parametrize("valor", [Decimal("NaN"), Decimal("Infinity"), "abc", None, [1]])
+def test_formatar_invalido_vira_zero(valor):
+    assert formatar_brl(valor) == "R$ 0,00"
+    assert formatar_valor(valor) == "0,00"
+
+
+@pytest.mark.parametrize("centavos", [0, 1, -1, 99, 100, 125050, -125050, 100000000, 123456789])
+def test_formatar_e_converter_ida_e_volta(centavos):
+    dinheiro = Dinheiro(centavos)
+    assert Dinheiro.de_valor(converter_brl(formatar_brl(dinheiro))) == dinheiro
+    assert Dinheiro.de_valor(converter_brl(formatar_valor(dinheiro))) == dinheiro